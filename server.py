@@ -1,6 +1,8 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
+from dataclasses import asdict
+import asyncio
 import os
 import time
 import json
@@ -13,7 +15,9 @@ sys.path.append('snucse_2501_aiconvertor')
 from aiconvertor.convertor import run_conversion
 from aiconvertor.convertor import ConversionConfig
 from aiconvertor.dependency.vo_generator import run_vo_generator
-from aiconvertor.dependency.map_to_vo_converter import VOGeneratorConfig
+from aiconvertor.dependency.vo_generator import VOGeneratorConfig
+from aiconvertor.dependency.watcher import get_live_watcher, stop_live_watchers
+from aiconvertor.pipeline import PipelineConfig, default_output_dir, default_run_dir, run_pipeline
 sys.path.pop()
 
 
@@ -76,6 +80,10 @@ class FolderConversionRequest(BaseModel):
     target_language: str
     source_language: Optional[str] = None
     file_extensions: Optional[List[str]] = None
+    output_path: Optional[str] = None   # 변환 결과 저장 경로 (기본: <folder_path>/.aiconvertor/converted)
+    max_workers: Optional[int] = None   # 동시에 변환하는 파일 수
+    run_path: Optional[str] = None      # 체크포인트 매니페스트 저장 경로 (기본: <folder_path>/.aiconvertor/run)
+    resume: bool = False                # 매니페스트에서 입력/설정 해시가 같은 완료 파일·단위는 건너뛰기
     additional_instructions: Optional[str] = None
 
 class CodeConversionResponse(BaseModel):
@@ -100,7 +108,9 @@ class MakeVOResponse(BaseModel):
     message: str
 
 class FolderConversionResponse(BaseModel):
-    converted_files: List[dict]
+    converted_files: List[dict]  # 파일별 상태 (코드는 output_path 에 저장)
+    output_path: str
+    run_path: str
     total_files: int
     successful_conversions: int
     failed_conversions: int
@@ -511,12 +521,16 @@ def generate_vo(
     # TODO: get vo class
 
     config = VOGeneratorConfig(
-        project_path=project_path,
-        vo_path=vo_path,
-        vo_class_name="DataVO",
+        project_root=project_path,
+        vo_file=vo_path,
+        vo_class="DataVO",
+        dry_run=vo_path is None,
     )
 
-    results = run_vo_generator(config)
+    # 프로젝트별 상주 색인 재사용 (최초 요청만 전체 스캔, 이후에는 변경분만 반영된 상태)
+    watcher = get_live_watcher(project_path)
+    with watcher.lock:
+        results = run_vo_generator(config, analyzer=watcher.analyzer)
 
     if results is None:
         return ""
@@ -526,6 +540,10 @@ def generate_vo(
     return converted_code
 
 
+@app.on_event("shutdown")
+async def shutdown_watchers():
+    stop_live_watchers()
+
 @app.get("/")
 async def root():
     logging.info("Root endpoint accessed")
@@ -683,60 +701,45 @@ async def convert_folder(request: FolderConversionRequest):
         if not os.path.exists(request.folder_path):
             raise HTTPException(status_code=404, detail="Folder not found")
         
-        # 기본 파일 확장자 설정
-        if not request.file_extensions:
-            request.file_extensions = ['.py', '.js', '.ts', '.java', '.cpp', '.c']
+        pipeline_config = PipelineConfig(
+            input_dir=request.folder_path,
+            output_dir=request.output_path,
+            file_extensions=request.file_extensions or ['.java', '.xml'],
+            max_workers=request.max_workers or 2,
+            run_dir=request.run_path,
+            resume=request.resume
+        )
+        conversion_config = ConversionConfig(
+            use_reflextion=True,
+            use_vo_generator=True,
+            project_root=request.folder_path,
+            vo_package="com.example.vo",
+            vo_class_name="DataVO",
+            mode="module",
+            iterations=3,
+            max_line_limit_offset=1,
+            use_prefix_output=True,
+            model="devstral:24b",
+        )
         
-        converted_files = []
-        successful_conversions = 0
-        failed_conversions = 0
+        def log_progress(done, result):
+            logging.info(f"[{done}] {result.status}: {result.file_path} ({result.processing_time:.1f}s)")
+            if result.error:
+                logging.error(f"Failed to convert {result.file_path}: {result.error}")
         
-        # 폴더 내 파일들 처리
-        for root, dirs, files in os.walk(request.folder_path):
-            # 제외할 디렉토리들
-            dirs[:] = [d for d in dirs if d not in ['node_modules', '.git', '.vscode', '__pycache__', 'out', 'dist']]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_ext = os.path.splitext(file)[1]
-                
-                if file_ext in request.file_extensions:
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            source_code = f.read()
-                        
-                        # 더미 변환 수행 (전체 파일 변환)
-                        converted_code = dummy_convert_code(
-                            source_code,
-                            file_path
-                        )
-                        
-                        converted_files.append({
-                            "file_path": file_path,
-                            "original_code": source_code,
-                            "converted_code": converted_code,
-                            "success": True,
-                            "error": None
-                        })
-                        successful_conversions += 1
-                        logging.info(f"Successfully converted: {file_path}")
-                    
-                    except Exception as e:
-                        converted_files.append({
-                            "file_path": file_path,
-                            "original_code": None,
-                            "converted_code": None,
-                            "success": False,
-                            "error": str(e)
-                        })
-                        failed_conversions += 1
-                        logging.error(f"Failed to convert {file_path}: {e}")
+        # 파일 수천 개 변환은 오래 걸리므로 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+        results = await asyncio.to_thread(run_pipeline, pipeline_config, conversion_config, log_progress)
+        converted_files = [asdict(result) for result in results]
+        successful_conversions = sum(1 for result in results if result.status in ('converted', 'up_to_date'))
+        failed_conversions = sum(1 for result in results if result.status == 'failed')
         
         processing_time = time.time() - start_time
         total_files = len(converted_files)
         
         response = FolderConversionResponse(
             converted_files=converted_files,
+            output_path=request.output_path or str(default_output_dir(request.folder_path)),
+            run_path=request.run_path or str(default_run_dir(request.folder_path)),
             total_files=total_files,
             successful_conversions=successful_conversions,
             failed_conversions=failed_conversions,
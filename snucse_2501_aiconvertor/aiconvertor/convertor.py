@@ -1,7 +1,9 @@
 import argparse
+import copy
 import re
 from difflib import unified_diff
 from difflib import SequenceMatcher
+from pathlib import Path
 from typing import Optional, Union, List, Dict, Any, Tuple
 
 from pydantic import BaseModel, Field, model_validator
@@ -12,15 +14,17 @@ from aiconvertor.java_utils_tree_sitter import matches_regardless_of_spacing
 from aiconvertor.java_utils_tree_sitter import get_ast
 from aiconvertor.prompt_handler import PromptHandler
 from aiconvertor.prompt_handler import load_contexts
-from aiconvertor.rag.retriever import ApiRetriever
+from aiconvertor.rag.retriever import get_shared_api_retriever
 from aiconvertor.incontext.retriever import CaseRetriever
-from snucse_2501_aiconvertor.aiconvertor.dependency.vo_generator import VOGenerator
+from aiconvertor.run_manifest import FileCheckpoint, RunManifest, config_hash, content_hash, write_atomic
+from snucse_2501_aiconvertor.aiconvertor.dependency.vo_generator import VOGenerator, _GENERATED_VO_MARKER
+from snucse_2501_aiconvertor.aiconvertor.dependency.mybatis_indexer import convert_mapper_xml
 
 
 class ConversionConfig(BaseModel):
     """변환 설정을 위한 Pydantic 모델"""
     model: str = Field(default='qwen2.5-coder:7b', description='사용할 모델')
-    mode: str = Field(default='module', description='변환 모드: module, page, line')
+    mode: str = Field(default='module', description='변환 모드: module, page, line, xml')
     use_diff: bool = Field(default=False, description='diff 정보 포함 여부')
     use_reflextion: bool = Field(default=False, description='피드백 기반 반복 개선 사용 여부')
     use_prompt_normalization: bool = Field(default=False, description='프롬프트 정규화 사용 여부')
@@ -28,6 +32,8 @@ class ConversionConfig(BaseModel):
     use_vo_generator: bool = Field(default=False, description='VO 생성기 사용 여부')
     vo_package: Optional[str] = Field(default=None, description='VO 패키지')
     vo_class_name: Optional[str] = Field(default=None, description='VO 클래스 이름')
+    use_vo_slice: bool = Field(default=False, description='변환 단위가 사용하는 키의 필드/접근자만 담은 VO 요약을 컨텍스트에 포함')
+    multi_vo: bool = Field(default=False, description='VO 생성기 결과를 키 동시 사용 기준으로 분할 (변환 단위별 관련 VO만 컨텍스트에 포함)')
     project_root: Optional[str] = Field(default=None, description='프로젝트 루트 경로')
     vo_file: Optional[str] = Field(default=None, description='VO 파일 경로')
     use_api_rag: bool = Field(default=False, description='Proworks5 api RAG 사용 여부')
@@ -39,12 +45,20 @@ class ConversionConfig(BaseModel):
     gt: str = Field(default="data/samples/file_sample_original/SampleTaskServiceImpl_out.java", description='Ground truth Java 파일 경로')
     iterations: int = Field(default=1, description='최대 반복 횟수')
     verbose: bool = Field(default=False, description='상세 출력 모드')
+    run_dir: Optional[str] = Field(default=None, description='실행 디렉토리 (변환 단위별 결과/상태를 매니페스트에 기록)')
+    resume: bool = Field(default=False, description='실행 디렉토리의 매니페스트에서 입력/설정이 같은 완료 단위 재사용')
 
     @model_validator(mode='after')
     def validate_vo_options(self):
         """VO 관련 옵션 유효성 검사"""
         if self.use_vo_generator and self.vo_file:
             raise ValueError("use_vo_generator 와 vo_file 은 동시에 사용할 수 없습니다.")
+        if self.use_vo_slice and not self.use_vo_generator:
+            raise ValueError("use_vo_slice 는 use_vo_generator 와 함께 사용해야 합니다.")
+        if self.mode == 'xml' and not self.use_vo_generator:
+            raise ValueError("xml 모드는 use_vo_generator 와 함께 사용해야 합니다.")
+        if self.resume and not self.run_dir:
+            raise ValueError("resume 은 run_dir 와 함께 사용해야 합니다.")
         return self
 
     class Config:
@@ -53,6 +67,19 @@ class ConversionConfig(BaseModel):
         extra = 'forbid'  # 정의되지 않은 필드 금지
 
 
+# Map 사용 여부 (변환이 필요한 코드인지 판단)
+# Map 타입 선언/생성 또는 문자열 키 접근만 인정 - import 문, @RequestMapping, *Mapper 등은 제외
+_MAP_USAGE_PATTERN = re.compile(
+    r'\b(?:Hash|LinkedHash|Tree|Concurrent)?Map\s*[<(]'
+    r'|\bMap\s+\w+\s*[=;,)]'
+    r'|\.(?:get|put|remove|containsKey|getOrDefault|putIfAbsent)\(\s*"'
+)
+
+
+def has_map_usage(code: str) -> bool:
+    return bool(_MAP_USAGE_PATTERN.search(code))
+
+
 COLOR_MAP = {
     "reset": "\033[0m",
     "cyan": "\033[96m",
@@ -83,12 +110,15 @@ class AIConverter:
                  max_line_limit_offset: int = None,
                  project_root: str = None,
                  vo_package: str = None,
-                 vo_class_name: str = None):
+                 vo_class_name: str = None,
+                 multi_vo: bool = False,
+                 use_vo_slice: bool = False):
         self.agent = agent
         self.prompt_handler = PromptHandler()
         self.use_diff = use_diff
         self.use_reflextion = use_reflextion
         self.use_vo_generator = use_vo_generator
+        self.use_vo_slice = use_vo_slice and use_vo_generator
         self.vo_file = vo_file
         self.use_api_rag = use_api_rag
         self.use_case_rag = use_case_rag
@@ -98,14 +128,23 @@ class AIConverter:
         self.skip_non_map = skip_non_map
         self.max_line_limit_offset = max_line_limit_offset
 
+        # 실행 매니페스트의 파일 단위 체크포인트 (설정 시 변환 단위 결과를 기록/재사용)
+        self.checkpoint: FileCheckpoint | None = None
+
         self.vo_code: str | None = None
+        self.vo_generator: VOGenerator | None = None
+        self.vo_classes: dict[str, str] = {}
         if use_vo_generator:
-            vo_generator = VOGenerator(
+            self.vo_generator = VOGenerator(
                 project_root=project_root,
                 vo_package=vo_package,
                 vo_class_name=vo_class_name
             )
-            self.vo_code = vo_generator.generate_vo_class()
+            self.vo_generator.analyze_all_maps()
+            if multi_vo:
+                self.vo_generator.cluster_vos()
+                self.vo_classes = self.vo_generator.generate_vo_classes()
+            self.vo_code = self.vo_generator.generate_vo_class()
         elif vo_file:
             self.vo_code = load_contexts(vo_file)
         else:
@@ -115,7 +154,7 @@ class AIConverter:
         self.api_retriever = None
         if use_api_rag:
             _embedding_model_name = "microsoft/codebert-base"
-            self.api_retriever = ApiRetriever(
+            self.api_retriever = get_shared_api_retriever(
                 vectorstore_path=f"data/db/proworks5_vectorstore_{_embedding_model_name.split('/')[-1]}",
                 embedding_model_name=_embedding_model_name
             )
@@ -126,6 +165,28 @@ class AIConverter:
             self.case_retriever.load_embedding_data()
 
     
+    def vo_fingerprint(self) -> dict[str, any]:
+        """실행 매니페스트 설정 해시에 포함할 VO 내용 해시 (생성 시각 주석 제외)
+
+        VO 는 실행마다 프로젝트에서 다시 생성되므로 키/타입이 바뀌면 이전 변환 결과를 재사용하지 않도록 함
+        """
+        def vo_hash(vo_code: str) -> str:
+            return content_hash(''.join(
+                line for line in vo_code.splitlines(keepends=True) if _GENERATED_VO_MARKER not in line
+            ))
+
+        return {
+            'vo': vo_hash(self.vo_code or ""),
+            'vo_classes': {class_name: vo_hash(code) for class_name, code in self.vo_classes.items()}
+        }
+
+    def fork(self) -> 'AIConverter':
+        """VO/RAG 상태는 공유하고 Agent 대화 상태만 분리한 변환기 (스레드별 동시 변환용)"""
+        forked = copy.copy(self)
+        forked.agent = copy.copy(self.agent)
+        forked.agent.messages = list(self.agent.messages)
+        return forked
+
     def load_java_files(self, 
                        input_java_path: str,
                        context_path: str = None,
@@ -244,15 +305,41 @@ class AIConverter:
         
         return '\n'.join(parts)
 
-    def _build_contexts(self, contexts: str, code: str) -> str:
-        """컨텍스트 빌드"""
-        if self.vo_code:
+    def _prefetch_api_prompts(self, codes: list[str]) -> list[str | None]:
+        """여러 변환 단위의 API RAG 프롬프트를 한 번의 검색으로 가져옴
+
+        결과가 없는 단위는 빈 문자열 (재검색 방지)
+        """
+        if not self.use_api_rag:
+            return [None] * len(codes)
+        return [prompt or "" for prompt in self.api_retriever.get_prompts(codes)]
+
+    def _build_contexts(self, contexts: str, code: str, api_prompt: str | None = None) -> str:
+        """컨텍스트 빌드
+
+        Args:
+            api_prompt: 미리 가져온 API RAG 프롬프트 (None이면 여기서 검색)
+        """
+        if self.use_vo_slice:
+            # 이 코드가 사용하는 키의 필드/접근자 시그니처만
+            vo_context = self.vo_generator.vo_context_for(code)
+            if vo_context:
+                contexts += f"<vo_class>\n{vo_context}\n</vo_class>\n\n"
+        elif self.vo_classes:
+            # 분할된 VO 중 이 코드가 사용하는 키를 가진 VO만 포함 (키가 없으면 VO 이름/생성자 시그니처만)
+            class_names = self.vo_generator.vo_classes_for_code(code)
+            for class_name in class_names:
+                contexts += f"<vo_class>\n{self.vo_classes[class_name]}\n</vo_class>\n\n"
+            if not class_names:
+                contexts += f"<vo_class>\n{self.vo_generator.minimal_vo_context()}\n</vo_class>\n\n"
+        elif self.vo_code:
             vo_code_prompt = f"<vo_class>\n{self.vo_code}\n</vo_class>\n\n"
             contexts += vo_code_prompt
 
         if self.use_api_rag:
-            api_prompt = self.api_retriever.get_prompt(code)
-            if api_prompt is not None:
+            if api_prompt is None:
+                api_prompt = self.api_retriever.get_prompt(code)
+            if api_prompt:
                 contexts += api_prompt
 
         if self.use_case_rag:
@@ -350,12 +437,12 @@ class AIConverter:
     def convert_code(self,
                      contexts: str,
                      code: str,
-                     gt_code: str) -> dict[str, any]:
-        """단일 변환"""    
+                     gt_code: str | None) -> dict[str, any]:
+        """단일 변환 (gt_code 가 None 이면 정답 비교 없이 변환)"""    
         
         # Map 관련 코드가 없으면 원본 코드 그대로 리턴 (옵션이 활성화된 경우)
         if self.skip_non_map:
-            if not re.search(r"\bmap\.(get|put|remove)\b|Map", code):
+            if not has_map_usage(code):
                 print("ℹ️  No map operations found. Returning original code.")
                 return {
                     'original_code': code,
@@ -366,6 +453,35 @@ class AIConverter:
                     'skipped': True
                 }
         
+        if self.checkpoint is None:
+            return self._convert_with_iterations(contexts, code, gt_code)
+
+        # 이전 실행에서 입력/설정이 같은 단위를 이미 변환했으면 재사용
+        converted_code = self.checkpoint.lookup(code)
+        if converted_code is not None:
+            print("♻️  Reusing checkpointed conversion.")
+            return {
+                'original_code': code,
+                'converted_code': converted_code,
+                'is_correct': self._matches_ground_truth(converted_code, gt_code),
+                'iterations': 0,
+                'ground_truth': gt_code,
+                'resumed': True
+            }
+
+        try:
+            result = self._convert_with_iterations(contexts, code, gt_code)
+        except Exception as e:
+            self.checkpoint.record(code, None, str(e))
+            raise
+        self.checkpoint.record(code, result['converted_code'])
+        return result
+
+    def _convert_with_iterations(self, contexts: str, code: str, gt_code: str | None) -> dict[str, any]:
+        """LLM 변환 및 반복 개선
+
+        정답 코드가 있으면 정답과 일치할 때 종료, 없으면 (폴더 변환) 출력이 더 이상 바뀌지 않을 때 종료
+        """
         if self.use_prompt_normalization:
             normalize_code, indent_prefix, prefix_output, postfix_output = self.parse_code_structure(code)
             prefix_output = "\n" +  postfix_output if self.use_prefix_output else "\n"
@@ -377,6 +493,7 @@ class AIConverter:
 
         diff_text = None
         prev_output = None
+        last_output = None
         
         # 라인 수 제한 계산
         max_lines = None
@@ -399,8 +516,11 @@ class AIConverter:
                 prev_output = self.recover_original_code(prev_output, indent_prefix, prefix_output, postfix_output)
 
             # 결과 평가
-            is_correct = self._evaluate_output(prev_output, gt_code)['exact_match']
-            if is_correct:
+            if gt_code is None:
+                if prev_output == last_output:
+                    break
+                last_output = prev_output
+            elif self._evaluate_output(prev_output, gt_code)['exact_match']:
                 break
         
         # 최종 결과
@@ -409,7 +529,7 @@ class AIConverter:
         print(prev_output)
         
         # 최종 평가
-        is_correct = self._evaluate_output(prev_output, gt_code)['exact_match']
+        is_correct = self._evaluate_output(prev_output, gt_code)['exact_match'] if gt_code is not None else None
         
         return {
             'original_code': code,
@@ -444,16 +564,19 @@ class AIConverter:
 
         print(f"🚀 Converting {len(java_codes)} Modules... (Module Mode)")
 
+        # 파일 단위로 한 번만 API RAG 검색
+        api_prompts = self._prefetch_api_prompts(java_codes)
+
         for i, (java_module_code, gt_java_module_code) in enumerate(zip(java_codes, gt_java_codes)):
             print(f"\n{'='*60}")
             print(f"Converting module {i+1}/{len(java_codes)}")
             print(f"{'='*60}")
             
             try:
-                contexts = self._build_contexts(contexts, java_module_code)
+                module_contexts = self._build_contexts(contexts, java_module_code, api_prompts[i])
 
                 result = self.convert_code(
-                    contexts, java_module_code, gt_java_module_code
+                    module_contexts, java_module_code, gt_java_module_code
                 )
                 results.append(result)
 
@@ -470,6 +593,14 @@ class AIConverter:
         
         return results
 
+    def convert_units(self, codes: list[str], contexts: str = "") -> list[dict[str, any]]:
+        """정답 코드 없이 변환 단위 목록 변환 (폴더 변환 파이프라인용, 실패 시 예외 전파)"""
+        api_prompts = self._prefetch_api_prompts(codes)
+        return [
+            self.convert_code(self._build_contexts(contexts, code, api_prompt), code, None)
+            for code, api_prompt in zip(codes, api_prompts)
+        ]
+
     def convert_whole_page(self, data: dict[str, any]) -> dict[str, any]:
         """전체 페이지 변환 (Page 단위)"""
         contexts = data['contexts']
@@ -487,6 +618,29 @@ class AIConverter:
         
         return result
     
+    def convert_mapper_xml(self, data: dict[str, any]) -> dict[str, any]:
+        """MyBatis 매퍼 XML 변환 (XML 모드) - VO 생성기의 키/필드 매핑으로 치환하므로 LLM 호출 없음"""
+        if self.vo_generator is None:
+            raise ValueError("XML 모드는 VO 생성기(use_vo_generator)가 필요합니다.")
+        
+        xml_code = data['java_code']
+        gt_xml_code = data['gt_java_code']
+        
+        print(f"🗂️ Converting mapper XML... (XML Mode)")
+        print(f"   Original code length: {len(xml_code)} characters")
+        
+        converted_code = convert_mapper_xml(
+            xml_code, self.vo_generator.field_name_for, self.vo_generator.vo_class_for_keys
+        )
+        
+        return {
+            'original_code': xml_code,
+            'converted_code': converted_code,
+            'is_correct': matches_regardless_of_spacing(converted_code, gt_xml_code),
+            'iterations': 0,
+            'mode': 'xml'
+        }
+    
     def _print_prompt_response(self, prompt: str, response: str, stage: str, parsed_code: str = None):
         """프롬프트, 응답, 파싱된 코드 출력"""
         print(f"\n{stage}:")
@@ -503,6 +657,13 @@ class AIConverter:
             print_color(parsed_code, "magenta")
             print()
 
+    @staticmethod
+    def _matches_ground_truth(output: str, gt_code: str | None) -> bool | None:
+        """정답 코드가 없으면 판단하지 않음 (None)"""
+        if gt_code is None:
+            return None
+        return matches_regardless_of_spacing(output, gt_code)
+
     def _evaluate_output(self, output: str, gt_code: str) -> dict:
         """출력 결과 평가 (페이지 단위, 다중 메트릭 포함)"""
 
@@ -623,6 +784,9 @@ class AIConverter:
 
         print(f"📝 Converting {len(java_lines)} lines... (Line Mode)")
 
+        # 파일 단위로 한 번만 API RAG 검색
+        api_prompts = self._prefetch_api_prompts(java_lines)
+
         for i, (line, gt_line) in enumerate(zip(java_lines, gt_java_lines)):
             print(f"\n{'='*60}")
             print(f"Converting line {i+1}/{len(java_lines)}")
@@ -643,8 +807,8 @@ class AIConverter:
                 continue
             
             try:
-                contexts = self._build_contexts(contexts, line)
-                result = self.convert_code(contexts, line, gt_line)
+                line_contexts = self._build_contexts(contexts, line, api_prompts[i])
+                result = self.convert_code(line_contexts, line, gt_line)
                 results.append(result)
 
             except Exception as e:
@@ -703,7 +867,9 @@ def create_parser():
   %(prog)s --mode page --use-reflextion       # Page 모드 + 피드백 기반 개선
   %(prog)s --mode page --use-diff --use-reflextion    # Page 모드 + Diff + 피드백
   %(prog)s --mode page --use-api-rag    # Page 모드 + RAG 사용
+  %(prog)s --mode xml --use-vo-generator --project-root ./proj --java FundMapper.xml    # 매퍼 XML 변환
   %(prog)s --context sample_input.txt --java Sample.java --iterations 5
+  %(prog)s --mode module --run-dir runs/sample --resume    # 중단된 변환 이어서 실행
         """
     )
     
@@ -716,9 +882,9 @@ def create_parser():
     
     parser.add_argument(
         '--mode',
-        choices=['module', 'page', 'line'],
+        choices=['module', 'page', 'line', 'xml'],
         default='module',
-        help='변환 모드 선택: module (함수별 변환), page (전체 페이지 변환), 또는 line (라인별 변환) (기본: module)'
+        help='변환 모드 선택: module (함수별 변환), page (전체 페이지 변환), line (라인별 변환), 또는 xml (MyBatis 매퍼 XML 변환, --use-vo-generator 필요) (기본: module)'
     )
     
     parser.add_argument(
@@ -766,6 +932,18 @@ def create_parser():
         help='VO 클래스 이름'
     )
 
+    parser.add_argument(
+        '--multi-vo',
+        action='store_true',
+        help='VO 생성기 결과를 여러 VO로 분할하고 변환 단위별로 관련 VO만 컨텍스트에 포함'
+    )
+
+    parser.add_argument(
+        '--use-vo-slice',
+        action='store_true',
+        help='VO 전체 대신 변환 단위가 사용하는 필드/접근자만 컨텍스트에 포함 (--use-vo-generator 필요)'
+    )
+
     parser.add_argument(
         '--project-root',
         type=str,
@@ -840,10 +1018,140 @@ def create_parser():
         action='store_true',
         help='상세 출력 모드'
     )
+
+    parser.add_argument(
+        '--run-dir',
+        type=str,
+        help='실행 디렉토리 - 변환 단위가 끝날 때마다 결과와 상태(입력/설정 해시)를 매니페스트에 기록'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='--run-dir 의 매니페스트에서 입력/설정이 같은 완료 단위는 다시 변환하지 않음'
+    )
     
     return parser
 
 
+def create_converter(config: ConversionConfig) -> AIConverter:
+    """설정으로 변환기 생성"""
+    return AIConverter(
+        agent=Agent(config.model, verbose=config.verbose),
+        use_diff=config.use_diff,
+        use_reflextion=config.use_reflextion,
+        use_prompt_normalization=config.use_prompt_normalization,
+        use_prefix_output=config.use_prefix_output,
+        use_vo_generator=config.use_vo_generator,
+        vo_file=config.vo_file,
+        use_api_rag=config.use_api_rag,
+        use_case_rag=config.use_case_rag,
+        iterations=config.iterations,
+        skip_non_map=config.skip_non_map,
+        max_line_limit_offset=config.max_line_limit_offset,
+        project_root=config.project_root,
+        vo_package=config.vo_package,
+        vo_class_name=config.vo_class_name,
+        multi_vo=config.multi_vo,
+        use_vo_slice=config.use_vo_slice
+    )
+
+
+def _convert_by_mode(converter: AIConverter, config: ConversionConfig, data: dict[str, any]) -> str | None:
+    """모드에 따른 변환 실행"""
+    if config.mode == 'module':
+        print(f"🚀 Converting all Module... (Module Mode)")
+        results = converter.convert_all_modules(data)
+        
+        print(f"\n🎉 Module conversion completed!")
+        
+        # 결과 요약
+        if len(results) > 1:
+            successful = sum(1 for r in results if r.get('is_correct', False))
+            print(f"📊 Success rate: {successful}/{len(results)} ({successful/len(results)*100:.1f}%)")
+        
+        # 모든 모듈의 변환된 코드를 합치기
+        converted_codes = []
+        for result in results:
+            converted_codes.append(result.get('converted_code'))
+        
+        return '\n\n'.join(converted_codes)
+            
+    elif config.mode == 'page':
+        print(f"📄 Converting entire page... (Page Mode)")
+        result = converter.convert_whole_page(data)
+        
+        print(f"\n🎉 Page conversion completed!")
+        
+        # 결과 요약
+        converter._print_page_summary(result)
+        
+        return result.get('converted_code')
+    
+    elif config.mode == 'line':
+        print(f"📝 Converting line by line... (Line Mode)")
+        results = converter.convert_line_by_line(data)
+        
+        print(f"\n🎉 Line-by-line conversion completed!")
+        
+        # 결과 요약
+        if len(results) > 1:
+            successful = sum(1 for r in results if r.get('is_correct', False))
+            print(f"📊 Success rate: {successful}/{len(results)} ({successful/len(results)*100:.1f}%)")
+        
+        # 모든 라인의 변환된 코드를 합치기
+        converted_lines = []
+        for result in results:
+            converted_lines.append(result.get('converted_code'))
+        
+        return '\n'.join(converted_lines)
+    
+    elif config.mode == 'xml':
+        result = converter.convert_mapper_xml(data)
+        
+        print(f"\n🎉 Mapper XML conversion completed!")
+        
+        # 결과 요약
+        converter._print_page_summary(result)
+        
+        return result.get('converted_code')
+
+
+def _convert_with_manifest(converter: AIConverter, config: ConversionConfig, data: dict[str, any]) -> str | None:
+    """실행 매니페스트에 기록하며 변환
+
+    변환 단위가 끝날 때마다 결과가 기록되므로 중단 후 --resume 으로 다시 실행하면
+    입력/설정 해시가 같은 단위(파일 전체가 같으면 파일)는 LLM 호출 없이 재사용
+    """
+    file_key = str(Path(config.java).resolve())
+    input_hash = content_hash(data['java_code'])
+    with RunManifest(config.run_dir,
+                     config_hash(config, contexts=content_hash(data['contexts']), **converter.vo_fingerprint()),
+                     resume=config.resume) as manifest:
+        record = manifest.completed_file(file_key, input_hash) if config.resume else None
+        if record is not None and record.output_path:
+            print(f"♻️  Already converted with the same input and config: {record.output_path}")
+            return Path(record.output_path).read_text(encoding='utf-8')
+
+        converter.checkpoint = manifest.file_checkpoint(file_key, data['java_code'])
+        try:
+            converted_code = _convert_by_mode(converter, config, data)
+        except Exception as e:
+            manifest.record_file(file_key, 'failed', input_hash, error=str(e))
+            raise
+        finally:
+            converter.checkpoint = None
+
+        if converted_code is None:
+            manifest.record_file(file_key, 'failed', input_hash, error=f"unsupported mode: {config.mode}")
+            return None
+        output_path = Path(config.run_dir) / "output" / Path(config.java).name
+        write_atomic(output_path, converted_code)
+        manifest.record_file(file_key, 'converted', input_hash, str(output_path))
+        print(f"💾 Saved converted code: {output_path}")
+        return converted_code
+
+
 def run_conversion(config: ConversionConfig) -> str | None:
     """변환 실행 함수
     
@@ -857,23 +1165,7 @@ def run_conversion(config: ConversionConfig) -> str | None:
         gt_java_path = config.gt or input_java_path  # gt가 없으면 입력 파일 사용
 
         # 변환기 초기화
-        converter = AIConverter(
-            agent=Agent(config.model, verbose=config.verbose),
-            use_diff=config.use_diff,
-            use_reflextion=config.use_reflextion,
-            use_prompt_normalization=config.use_prompt_normalization,
-            use_prefix_output=config.use_prefix_output,
-            use_vo_generator=config.use_vo_generator,
-            vo_file=config.vo_file,
-            use_api_rag=config.use_api_rag,
-            use_case_rag=config.use_case_rag,
-            iterations=config.iterations,
-            skip_non_map=config.skip_non_map,
-            max_line_limit_offset=config.max_line_limit_offset,
-            project_root=config.project_root,
-            vo_package=config.vo_package,
-            vo_class_name=config.vo_class_name
-        )
+        converter = create_converter(config)
         
         # 파일 로드
         if config.verbose:
@@ -885,53 +1177,9 @@ def run_conversion(config: ConversionConfig) -> str | None:
         
         data = converter.load_java_files(input_java_path, context_path, gt_java_path)
         
-        # 모드에 따른 변환 실행
-        if config.mode == 'module':
-            print(f"🚀 Converting all Module... (Module Mode)")
-            results = converter.convert_all_modules(data)
-            
-            print(f"\n🎉 Module conversion completed!")
-            
-            # 결과 요약
-            if len(results) > 1:
-                successful = sum(1 for r in results if r.get('is_correct', False))
-                print(f"📊 Success rate: {successful}/{len(results)} ({successful/len(results)*100:.1f}%)")
-            
-            # 모든 모듈의 변환된 코드를 합치기
-            converted_codes = []
-            for result in results:
-                converted_codes.append(result.get('converted_code'))
-            
-            return '\n\n'.join(converted_codes)
-                
-        elif config.mode == 'page':
-            print(f"📄 Converting entire page... (Page Mode)")
-            result = converter.convert_whole_page(data)
-            
-            print(f"\n🎉 Page conversion completed!")
-            
-            # 결과 요약
-            converter._print_page_summary(result)
-            
-            return result.get('converted_code')
-        
-        elif config.mode == 'line':
-            print(f"📝 Converting line by line... (Line Mode)")
-            results = converter.convert_line_by_line(data)
-            
-            print(f"\n🎉 Line-by-line conversion completed!")
-            
-            # 결과 요약
-            if len(results) > 1:
-                successful = sum(1 for r in results if r.get('is_correct', False))
-                print(f"📊 Success rate: {successful}/{len(results)} ({successful/len(results)*100:.1f}%)")
-            
-            # 모든 라인의 변환된 코드를 합치기
-            converted_lines = []
-            for result in results:
-                converted_lines.append(result.get('converted_code'))
-            
-            return '\n'.join(converted_lines)
+        if config.run_dir:
+            return _convert_with_manifest(converter, config, data)
+        return _convert_by_mode(converter, config, data)
         
     except FileNotFoundError as e:
         print(f"❌ File not found: {e}")
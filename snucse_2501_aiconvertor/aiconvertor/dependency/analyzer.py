@@ -1,56 +1,554 @@
+import os
+import sys
 import argparse
+import hashlib
+import heapq
 import tree_sitter_java
 import json
 
+from array import array
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from collections import defaultdict
 from typing import Any
 from tree_sitter import Language, Parser
 from dataclasses import dataclass, asdict
 
+from aiconvertor.dependency.index_store import CodeIndexStore
+from aiconvertor.dependency.source_cache import get_source_cache
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class CodeElement:
-    """코드 요소 정보"""
+    """코드 요소 정보 (불변, 문자열은 intern하여 요소 간 공유)"""
     name: str
     type: str  # 'class', 'method', 'field', 'constructor', 'enum', 'interface'
     line_start: int
     line_end: int
     parent: str | None = None  # 부모 클래스/메서드명
-    modifiers: list[str] | None = None
+    modifiers: tuple[str, ...] = ()
     return_type: str | None = None  # 메서드의 경우
-    parameters: list[dict] | None = None  # 메서드의 경우
+    parameters: tuple[dict, ...] = ()  # 메서드의 경우
     
     def __post_init__(self):
-        if self.modifiers is None:
-            self.modifiers = []
-        if self.parameters is None:
-            self.parameters = []
+        setattr_ = object.__setattr__
+        setattr_(self, 'name', sys.intern(self.name))
+        setattr_(self, 'type', sys.intern(self.type))
+        if self.parent is not None:
+            setattr_(self, 'parent', sys.intern(self.parent))
+        if self.return_type is not None:
+            setattr_(self, 'return_type', sys.intern(self.return_type))
+        setattr_(self, 'modifiers', tuple(sys.intern(m) for m in self.modifiers or ()))
+        setattr_(self, 'parameters', tuple(self.parameters or ()))
+    
+    def to_row(self) -> list:
+        return [self.name, self.type, self.line_start, self.line_end, self.parent,
+                list(self.modifiers), self.return_type, list(self.parameters)]
+
+
+@dataclass(frozen=True, slots=True)
+class DeclaredType:
+    """선언된 이름의 타입 - 지역 변수/매개변수/필드/메서드 반환 타입 (기본 타입, 내장 클래스 포함)"""
+    name: str
+    type: str
+    kind: str  # 'local', 'parameter', 'field', 'method'
+    line: int
+    scope_start: int  # 지역 변수/매개변수는 소속 메서드 범위, 필드/메서드는 소속 클래스 범위
+    scope_end: int
+    owner: str  # 소속 클래스명
+
+
+DEPENDENCY_TYPES = (
+    'imports', 'class_references', 'method_calls', 'field_access', 'inheritance',
+    'annotations', 'generics', 'exceptions', 'lambda_references', 'local_variables'
+)
+_DEPENDENCY_KIND = {dep_type: kind for kind, dep_type in enumerate(DEPENDENCY_TYPES)}
+
+# 위치 정보의 부가 필드 (의존성 타입별로 하나씩만 존재)
+_LOCATION_EXTRA_KEYS = {
+    'local_variables': 'type',
+    'method_calls': 'target',
+    'field_access': 'target_class'
+}
+
 
-@dataclass 
 class ElementDependency:
-    """요소별 의존성 정보"""
-    element: CodeElement
-    dependencies: dict[str, list[str]]  # 의존성 타입별 리스트
-    referenced_elements: list[str]  # 참조하는 다른 요소들
-    location_info: dict[str, list[dict]]  # 각 의존성이 사용된 위치 정보
+    """요소별 의존성 정보
+    
+    심볼 문자열은 요소별 심볼 테이블(intern된 문자열)에 한 번만 저장하고
+    의존성/위치/참조는 (타입 번호, 심볼 번호, 라인 ...) 정수 배열로 보관한다.
+    dependencies / location_info / referenced_elements 는 기존 dict/list 형태를 조회 시 생성한다.
+    """
+    
+    __slots__ = ('element', 'symbols', 'dep_kinds', 'dep_symbols',
+                 'loc_kinds', 'loc_symbols', 'loc_lines', 'loc_contexts', 'loc_extras', 'reference_ids')
+    
+    def __init__(self, element: CodeElement, dependencies: dict[str, list[str]],
+                 referenced_elements: list[str], location_info: dict[str, list[dict]]):
+        self.element = element
+        symbols: list[str] = []
+        symbol_ids: dict[str, int] = {}
+        
+        def symbol_id(text: str | None) -> int:
+            if text is None:
+                return -1
+            sid = symbol_ids.get(text)
+            if sid is None:
+                sid = symbol_ids[text] = len(symbols)
+                symbols.append(sys.intern(text))
+            return sid
+        
+        self.dep_kinds = array('b')
+        self.dep_symbols = array('i')
+        for dep_type, deps in dependencies.items():
+            kind = _DEPENDENCY_KIND[dep_type]
+            for dep in deps:
+                self.dep_kinds.append(kind)
+                self.dep_symbols.append(symbol_id(dep))
+        
+        self.loc_kinds = array('b')
+        self.loc_symbols = array('i')
+        self.loc_lines = array('i')
+        self.loc_contexts = array('i')
+        self.loc_extras = array('i')
+        for dep_type, locations in location_info.items():
+            kind = _DEPENDENCY_KIND[dep_type]
+            extra_key = _LOCATION_EXTRA_KEYS.get(dep_type)
+            for location in locations:
+                self.loc_kinds.append(kind)
+                self.loc_symbols.append(symbol_id(location.get('name')))
+                self.loc_lines.append(location.get('line') or 0)
+                self.loc_contexts.append(symbol_id(location.get('context')))
+                self.loc_extras.append(symbol_id(location.get(extra_key)) if extra_key else -1)
+        
+        self.reference_ids = array('i', [symbol_id(ref) for ref in referenced_elements])
+        self.symbols = tuple(symbols)
+    
+    @property
+    def dependencies(self) -> dict[str, list[str]]:
+        """의존성 타입별 심볼 목록"""
+        result = {dep_type: [] for dep_type in DEPENDENCY_TYPES}
+        symbols = self.symbols
+        for kind, sid in zip(self.dep_kinds, self.dep_symbols):
+            result[DEPENDENCY_TYPES[kind]].append(symbols[sid])
+        return result
+    
+    @property
+    def referenced_elements(self) -> list[str]:
+        return [self.symbols[sid] for sid in self.reference_ids]
+    
+    @property
+    def location_info(self) -> dict[str, list[dict]]:
+        """의존성 타입별 위치 정보 ({'name', 'line', 'context', ...})"""
+        result: dict[str, list[dict]] = {}
+        for index in range(len(self.loc_kinds)):
+            dep_type = DEPENDENCY_TYPES[self.loc_kinds[index]]
+            result.setdefault(dep_type, []).append(self._location(index))
+        return result
+    
+    @property
+    def dependency_count(self) -> int:
+        return len(self.dep_kinds)
+    
+    def symbols_of(self, dep_type: str) -> list[str]:
+        """특정 타입의 의존성 심볼 목록"""
+        kind = _DEPENDENCY_KIND[dep_type]
+        symbols = self.symbols
+        return [symbols[sid] for k, sid in zip(self.dep_kinds, self.dep_symbols) if k == kind]
+    
+    def locations_of(self, dep_type: str) -> list[dict]:
+        """특정 타입의 위치 정보 목록"""
+        kind = _DEPENDENCY_KIND[dep_type]
+        return [self._location(index) for index, k in enumerate(self.loc_kinds) if k == kind]
+    
+    def _location(self, index: int) -> dict:
+        symbols = self.symbols
+        sid = self.loc_symbols[index]
+        context = self.loc_contexts[index]
+        location = {
+            'name': symbols[sid] if sid >= 0 else None,
+            'line': self.loc_lines[index] or None,
+            'context': symbols[context] if context >= 0 else None
+        }
+        extra = self.loc_extras[index]
+        if extra >= 0:
+            location[_LOCATION_EXTRA_KEYS[DEPENDENCY_TYPES[self.loc_kinds[index]]]] = symbols[extra]
+        return location
+    
+    def iter_occurrences(self):
+        """(의존성 타입, 심볼, 라인, 문맥) 발생 목록 - 정리된 의존성 기준, 위치가 없으면 라인 없이 한 번"""
+        symbols = self.symbols
+        
+        # (타입, 심볼) -> [(라인, 문맥)]
+        occurrences: dict[tuple[int, str], list] = {}
+        for index, kind in enumerate(self.loc_kinds):
+            sid = self.loc_symbols[index]
+            name = symbols[sid] if sid >= 0 else ''
+            if kind == _DEPENDENCY_KIND['local_variables']:
+                extra = self.loc_extras[index]
+                name = f"{name}:{symbols[extra] if extra >= 0 else ''}"
+            context = self.loc_contexts[index]
+            occurrences.setdefault((kind, name), []).append(
+                (self.loc_lines[index] or None, symbols[context] if context >= 0 else None)
+            )
+        
+        for kind, sid in zip(self.dep_kinds, self.dep_symbols):
+            dep_type = DEPENDENCY_TYPES[kind]
+            symbol = symbols[sid]
+            found = occurrences.get((kind, symbol))
+            if not found:
+                yield dep_type, symbol, None, None
+                continue
+            for line, context in found:
+                yield dep_type, symbol, line, context
+    
+    def to_dict(self) -> dict:
+        return {
+            'element': asdict(self.element),
+            'dependencies': self.dependencies,
+            'referenced_elements': self.referenced_elements,
+            'location_info': self.location_info
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "ElementDependency":
+        if 'symbols' in data:
+            return cls.from_compact(data)
+        return cls(
+            element=CodeElement(**data['element']),
+            dependencies=data['dependencies'],
+            referenced_elements=data['referenced_elements'],
+            location_info=data['location_info']
+        )
+    
+    def to_compact(self) -> dict:
+        """캐시용 압축 직렬화 (심볼 테이블 + 정수 목록)"""
+        return {
+            'element': self.element.to_row(),
+            'symbols': self.symbols,
+            'deps': [self.dep_kinds.tolist(), self.dep_symbols.tolist()],
+            'locations': [self.loc_kinds.tolist(), self.loc_symbols.tolist(), self.loc_lines.tolist(),
+                          self.loc_contexts.tolist(), self.loc_extras.tolist()],
+            'references': self.reference_ids.tolist()
+        }
+    
+    @classmethod
+    def from_compact(cls, data: dict) -> "ElementDependency":
+        self = cls.__new__(cls)
+        self.element = CodeElement(*data['element'])
+        self.symbols = tuple(sys.intern(symbol) for symbol in data['symbols'])
+        self.dep_kinds = array('b', data['deps'][0])
+        self.dep_symbols = array('i', data['deps'][1])
+        self.loc_kinds = array('b', data['locations'][0])
+        self.loc_symbols = array('i', data['locations'][1])
+        self.loc_lines = array('i', data['locations'][2])
+        self.loc_contexts = array('i', data['locations'][3])
+        self.loc_extras = array('i', data['locations'][4])
+        self.reference_ids = array('i', data['references'])
+        return self
+    
+    def __getstate__(self):
+        return self.to_compact()
+    
+    def __setstate__(self, state):
+        restored = self.from_compact(state)
+        for name in self.__slots__:
+            setattr(self, name, getattr(restored, name))
+    
+    def __repr__(self) -> str:
+        return (f"ElementDependency(element={self.element!r}, dependencies={self.dependency_count}, "
+                f"references={len(self.reference_ids)})")
+
+
+CACHE_VERSION = 4
+
+# 이 개수 미만의 파일은 프로세스 풀 생성 비용이 더 크므로 직렬로 스캔
+PARALLEL_SCAN_MIN_FILES = 64
+
+# 요소로 수집하는 선언 노드 타입
+_TYPE_DECLARATIONS = ('class_declaration', 'interface_declaration', 'enum_declaration')
+_MEMBER_DECLARATIONS = ('method_declaration', 'constructor_declaration', 'field_declaration')
+
+# catch 절을 가진 try 문 노드 타입 (예외 의존성 위치 기준)
+_TRY_STATEMENTS = ('try_statement', 'try_with_resources_statement')
+
+# 의존성 추출용 tree-sitter 쿼리 (노드 매칭은 C에서 수행, 캡처 이름별로 기록)
+DEPENDENCY_QUERY = """
+(object_creation_expression type: (type_identifier) @object_creation)
+(method_invocation) @method_invocation
+(field_access) @field_access
+(type_identifier) @type_usage
+(annotation name: (identifier) @annotation)
+(local_variable_declaration) @local_variable
+(cast_expression type: (type_identifier) @cast)
+(catch_formal_parameter (catch_type (type_identifier) @exception))
+"""
+
+# 워커 프로세스마다 하나씩 생성되는 분석기 (파서 재사용)
+_worker_analyzer = None
+
+
+def _get_worker_analyzer() -> "ElementLevelDependencyAnalyzer":
+    """프로젝트 스캔 없이 파서만 초기화된 워커용 분석기 반환"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = ElementLevelDependencyAnalyzer.parser_only()
+        # 워커는 파일을 한 번씩만 읽으므로 내용을 캐시에 보관하지 않음
+        get_source_cache().set_max_bytes(0)
+    return _worker_analyzer
+
+
+def _compute_edit(old_source: bytes, new_source: bytes) -> dict | None:
+    """두 소스의 공통 접두/접미를 제외한 변경 구간을 tree.edit() 인자로 계산 (변경 없으면 None)"""
+    if old_source == new_source:
+        return None
+    
+    # 공통 접두 길이 (슬라이스 비교로 이진 탐색)
+    low, high = 0, min(len(old_source), len(new_source))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old_source[:mid] == new_source[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = low
+    
+    # 공통 접미 길이 (접두와 겹치지 않도록 제한)
+    low, high = 0, min(len(old_source), len(new_source)) - prefix
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old_source[len(old_source) - mid:] == new_source[len(new_source) - mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    suffix = low
+    
+    def point(source: bytes, offset: int) -> tuple[int, int]:
+        row = source.count(b'\n', 0, offset)
+        return row, offset - (source.rfind(b'\n', 0, offset) + 1)
+    
+    old_end = len(old_source) - suffix
+    new_end = len(new_source) - suffix
+    return {
+        'start_byte': prefix,
+        'old_end_byte': old_end,
+        'new_end_byte': new_end,
+        'start_point': point(old_source, prefix),
+        'old_end_point': point(old_source, old_end),
+        'new_end_point': point(new_source, new_end)
+    }
+
+
+def _content_hash(source_code: bytes) -> str:
+    return hashlib.sha1(source_code).hexdigest()
+
+
+def _scan_file_worker(task: tuple[str, str | None]) -> tuple[str, str, str | None, list[tuple[str, bool]]]:
+    """프로세스 풀 워커: (파일 경로, 내용 해시, 패키지명, [(클래스명, 중첩 여부)]) 반환
+
+    캐시된 해시와 내용이 같으면 파싱을 생략하고 패키지명을 None으로 반환
+    """
+    file_path, known_hash = task
+    try:
+        return _get_worker_analyzer()._scan_file(Path(file_path), known_hash)
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return file_path, "", "", []
+
+
+def _element_dependencies_worker(file_path: str) -> tuple[str, dict[str, dict] | None]:
+    """프로세스 풀 워커: 파일의 요소 의존성을 직렬화하여 반환"""
+    try:
+        element_deps = _get_worker_analyzer().extract_element_level_dependencies(Path(file_path))
+        return file_path, {
+            element_id.partition('::')[2]: elem_dep.to_compact()
+            for element_id, elem_dep in element_deps.items()
+        }
+    except Exception as e:
+        print(f"Error analyzing {file_path}: {e}")
+        return file_path, None
+
+
+class DependencyReportStats:
+    """요소 의존성 보고서 통계 - 요소를 하나씩 추가하며 증분 계산 (상위 N개는 최소 힙으로 유지)"""
+    
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.total_elements = 0
+        self.elements_by_type: dict[str, int] = defaultdict(int)
+        self.dependency_stats: dict[str, int] = defaultdict(int)
+        self.dependency_patterns: dict[str, int] = defaultdict(int)
+        self.fields_with_dependencies = 0
+        self.annotation_heavy = 0
+        self._top_elements: list[tuple[int, int, dict]] = []
+    
+    def add(self, elem_dep: ElementDependency):
+        element = elem_dep.element
+        total_deps = elem_dep.dependency_count
+        
+        self.elements_by_type[element.type] += 1
+        self.dependency_stats[element.type] += total_deps
+        for kind in elem_dep.dep_kinds:
+            self.dependency_patterns[DEPENDENCY_TYPES[kind]] += 1
+        if element.type == 'field' and total_deps:
+            self.fields_with_dependencies += 1
+        if elem_dep.dep_kinds.count(_DEPENDENCY_KIND['annotations']) > 5:
+            self.annotation_heavy += 1
+        
+        element_info = {
+            'element': f"{element.type}:{element.name}",
+            'total_dependencies': total_deps,
+            'line': f"{element.line_start}-{element.line_end}",
+            'element_type': element.type
+        }
+        item = (total_deps, self.total_elements, element_info)
+        self.total_elements += 1
+        
+        # top_n이 0 이하면 모든 요소 포함
+        if self.top_n <= 0 or len(self._top_elements) < self.top_n:
+            heapq.heappush(self._top_elements, item)
+        # 현재 요소가 힙의 최소값보다 크면 교체
+        elif total_deps > self._top_elements[0][0]:
+            heapq.heapreplace(self._top_elements, item)
+    
+    @property
+    def most_dependent_elements(self) -> list[dict]:
+        return [info for _, _, info in sorted(self._top_elements, key=lambda x: x[0], reverse=True)]
+    
+    def statistics(self) -> dict:
+        return {
+            'total_elements': self.total_elements,
+            'elements_by_type': dict(self.elements_by_type),
+            'dependency_stats': dict(self.dependency_stats),
+            'most_dependent_elements': self.most_dependent_elements,
+            'circular_references': [],
+            'top_n_limit': self.top_n  # 설정된 제한값 기록
+        }
+    
+    def summary(self) -> dict:
+        """분석 요약"""
+        high_complexity_elements = [e for e in self.most_dependent_elements if e['total_dependencies'] > 10]
+        
+        return {
+            'total_elements_analyzed': self.total_elements,
+            'elements_by_type': dict(self.elements_by_type),
+            'high_complexity_elements_count': len(high_complexity_elements),
+            'most_common_dependency_types': dict(sorted(self.dependency_patterns.items(), key=lambda x: x[1], reverse=True)[:5]),
+            'average_dependencies_per_element': sum(self.dependency_patterns.values()) / max(self.total_elements, 1),
+            'complexity_indicators': {
+                'methods_with_high_dependencies': len([e for e in high_complexity_elements if 'method:' in e['element']]),
+                'classes_with_high_dependencies': len([e for e in high_complexity_elements if 'class:' in e['element']]),
+                'fields_with_dependencies': self.fields_with_dependencies
+            }
+        }
+    
+    def recommendations(self) -> list[str]:
+        """개선 권장사항"""
+        recommendations = []
+        most_dependent = self.most_dependent_elements
+        
+        # 복잡도 기반 권장사항
+        high_complexity = [e for e in most_dependent if e['total_dependencies'] > 15]
+        if high_complexity:
+            recommendations.append(f"High complexity detected: {len(high_complexity)} elements have >15 dependencies. Consider refactoring.")
+        
+        # 메서드 복잡도
+        method_complexity = [e for e in most_dependent if 'method:' in e['element'] and e['total_dependencies'] > 10]
+        if method_complexity:
+            recommendations.append(f"{len(method_complexity)} methods have high dependency count. Consider breaking them into smaller methods.")
+        
+        # 클래스 복잡도
+        class_complexity = [e for e in most_dependent if 'class:' in e['element'] and e['total_dependencies'] > 20]
+        if class_complexity:
+            recommendations.append(f"{len(class_complexity)} classes have very high dependency count. Consider applying Single Responsibility Principle.")
+        
+        # 의존성 패턴 기반 권장사항
+        if self.annotation_heavy > 0:
+            recommendations.append(f"{self.annotation_heavy} elements are annotation-heavy. Review if all annotations are necessary.")
+        
+        return recommendations
+
+
+def _dependency_matrix_row(dependencies: dict[str, list[str]]) -> dict:
+    """의존성 매트릭스의 요소 한 행 (타입별 개수와 처음 10개)"""
+    row = {}
+    for dep_type, deps in dependencies.items():
+        if deps:
+            row[dep_type] = {
+                'count': len(deps),
+                'dependencies': deps[:10] if len(deps) > 10 else deps,  # 처음 10개만 표시
+                'truncated': len(deps) > 10
+            }
+    return row
+
+
+# 스트리밍 보고서에서 한 번에 분석하는 파일 수 (병렬 분석 단위)
+STREAM_REPORT_CHUNK = 256
+
 
 class ElementLevelDependencyAnalyzer:
     """요소 단위 의존성 분석기"""
     
-    def __init__(self, project_root: str, use_cache: bool = True):
+    def __init__(self, project_root: str, use_cache: bool = True, max_workers: int | None = None,
+                 use_content_hash: bool = True, index_path: str | None = None,
+                 incremental_parse: bool = False, source_cache_bytes: int | None = None):
         self.project_root = Path(project_root)
         self.class_to_file: dict[str, Path] = {}
         self.package_to_files: dict[str, list[Path]] = defaultdict(list)
         self.element_dependencies: dict[str, ElementDependency] = {}  # element_id -> ElementDependency
         self.use_cache = use_cache
         self.cache_file = self.project_root / ".element_deps_cache.json"
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_content_hash = use_content_hash
+        
+        # 파일별 캐시 엔트리 (프로젝트 루트 기준 상대 경로 -> mtime/size/hash/package/classes/elements)
+        self.file_entries: dict[str, dict] = {}
+        self._file_element_deps: dict[str, dict[str, ElementDependency]] = {}  # 복원된 요소 의존성
+        self._cache_dirty = False
+        
+        # 역참조 색인 (심볼 -> [(파일 키, 요소 id, 라인, 의존성 타입)]) - 최초 사용 시 구축 후 증분 갱신
+        self.usage_index: dict[str, list[tuple[str, str, int | None, str]]] = defaultdict(list)
+        self._usage_index_symbols: dict[str, set[str]] = {}  # 파일 키 -> 색인된 심볼
+        self._usage_index_built = False
+        
+        # 감시 모드용 파일별 (구문 트리, 소스) - 변경 시 tree-sitter 증분 파싱에 사용
+        self._trees: dict[str, tuple[Any, bytes]] | None = {} if incremental_parse else None
+        
+        # SQLite 색인 (지정 시 파일/요소/의존성을 디스크에 색인하여 인덱스 조회 지원)
+        self.index: CodeIndexStore | None = CodeIndexStore(index_path) if index_path else None
+        
+        # 공유 소스 캐시 상주 크기 상한 (지정 시, 0이면 상주하지 않음)
+        if source_cache_bytes is not None:
+            get_source_cache().set_max_bytes(source_cache_bytes)
         
+        self._init_language()
+        self._load_cache_or_scan()
+        self._sync_index()
+    
+    @classmethod
+    def parser_only(cls, project_root: str | Path = '.') -> "ElementLevelDependencyAnalyzer":
+        """프로젝트 스캔 없이 파서만 초기화된 분석기 (파일 단위 추출 전용)"""
+        analyzer = cls.__new__(cls)
+        analyzer.project_root = Path(project_root)
+        analyzer._trees = None
+        analyzer._init_language()
+        return analyzer
+    
+    def _init_language(self):
+        """Tree-sitter 파서 및 Java 기본 타입 정의 초기화"""
         # Tree-sitter 설정
         self.java_language = Language(tree_sitter_java.language(), "java")
         self.parser = Parser()
         self.parser.set_language(self.java_language)
         
+        try:
+            self.dependency_query = self.java_language.query(DEPENDENCY_QUERY)
+        except Exception as e:
+            # 문법 버전이 달라 쿼리를 컴파일할 수 없으면 반복 순회 방식으로 분석
+            print(f"의존성 쿼리 컴파일 실패, 순회 방식 사용: {e}")
+            self.dependency_query = None
+        
         # Java 기본 타입 및 내장 클래스 정의
         self.java_primitives = {
             'int', 'boolean', 'float', 'double', 'long', 'short', 'byte', 'char', 'void'
@@ -66,8 +564,6 @@ class ElementLevelDependencyAnalyzer:
             'Matcher', 'StringBuilder', 'StringBuffer', 'Number', 'Enum',
             'Comparable', 'Serializable', 'Cloneable', 'Iterable', 'Iterator'
         }
-        
-        self._load_cache_or_scan()
     
     def _get_node_text(self, node, source_code: bytes) -> str:
         """노드의 텍스트 내용을 반환"""
@@ -77,72 +573,450 @@ class ElementLevelDependencyAnalyzer:
         """노드의 시작/끝 라인 번호 반환"""
         return node.start_point[0] + 1, node.end_point[0] + 1
     
+    def _file_key(self, file_path: Path) -> str | None:
+        """캐시 키 (프로젝트 루트 기준 상대 경로), 프로젝트 밖의 파일이면 None"""
+        relative = os.path.relpath(file_path, self.project_root)
+        if relative.startswith('..'):
+            return None
+        return Path(relative).as_posix()
+    
     def _load_cache_or_scan(self):
-        """캐시를 로드하거나 프로젝트를 새로 스캔"""
-        if self.use_cache and self.cache_file.exists():
+        """캐시를 로드한 뒤 추가/변경/삭제된 파일만 다시 스캔"""
+        self.file_entries = self._load_cache_entries() if self.use_cache else {}
+        self._file_element_deps = {}
+        
+        if self._sync_file_entries():
+            self._save_cache()
+        else:
+            print(f"캐시에서 {len(self.file_entries)}개 파일 정보 로드 (변경 없음)")
+    
+    def _sync_file_entries(self) -> bool:
+        """디스크 상태와 파일 엔트리를 동기화하고 변경 여부 반환"""
+        java_files = {self._file_key(p): p for p in self.project_root.rglob("*.java")}
+        removed = [key for key in self.file_entries if key not in java_files]
+        for key in removed:
+            self._drop_file(key)
+        
+        # mtime/size가 캐시와 다른 파일만 재스캔 대상
+        stale = {}
+        for key, file_path in java_files.items():
+            entry = self.file_entries.get(key)
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    # Path 객체로 복원
-                    self.class_to_file = {k: Path(v) for k, v in cache_data.get('class_to_file', {}).items()}
-                    self.package_to_files = {
-                        k: [Path(p) for p in v] 
-                        for k, v in cache_data.get('package_to_files', {}).items()
-                    }
-                print(f"캐시에서 {len(self.class_to_file)}개 클래스 정보 로드")
-                return
+                stat = file_path.stat()
+            except OSError:
+                continue
+            if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                continue
+            stale[key] = (file_path, stat)
+        
+        if stale:
+            print(f"스캔 중: {len(stale)}/{len(java_files)}개 Java 파일 (변경분)")
+        
+        for file_path, content_hash, package_name, class_info in self._scan_files([p for p, _ in stale.values()]):
+            key = self._file_key(Path(file_path))
+            self._update_file_entry(key, stale[key][1], content_hash, package_name, class_info)
+        
+        if stale or removed:
+            self._rebuild_class_maps()
+            self._cache_dirty = True
+            return True
+        
+        if not self.class_to_file:
+            self._rebuild_class_maps()
+        return False
+    
+    def _drop_file(self, key: str):
+        """삭제된 파일을 모든 색인에서 제거"""
+        self.file_entries.pop(key, None)
+        self._file_element_deps.pop(key, None)
+        self._remove_file_usages(key)
+        if self._trees is not None:
+            self._trees.pop(key, None)
+        if self.index:
+            self.index.delete_file(key)
+    
+    def sync(self) -> bool:
+        """디스크와 동기화 (폴링 감시용) - 변경된 파일은 요소 의존성까지 다시 분석"""
+        hashes = {key: entry['hash'] for key, entry in self.file_entries.items()}
+        changed = self._sync_file_entries()
+        if changed:
+            stale = [key for key, entry in self.file_entries.items() if hashes.get(key) != entry['hash']]
+            if self._usage_index_built or self.index:
+                self.ensure_element_dependencies(stale)
+            self._save_cache()
+        return changed
+    
+    def refresh_file(self, file_path: Path) -> bool:
+        """파일 하나를 다시 분석하여 모든 색인에 반영 (감시 모드 이벤트용), 내용이 바뀌었으면 True"""
+        file_path = Path(file_path)
+        key = self._file_key(file_path)
+        if key is None:
+            return False
+        
+        try:
+            stat = file_path.stat()
+            source_code = get_source_cache().read_bytes(file_path)
+        except OSError:
+            return self.remove_file(file_path)
+        
+        content_hash = _content_hash(source_code)
+        entry = self.file_entries.get(key)
+        if entry is not None and entry['hash'] == content_hash:
+            entry['mtime'] = stat.st_mtime
+            entry['size'] = stat.st_size
+            return False
+        
+        tree = self._parse_source(key, source_code)
+        package_name, class_info = self._parse_package_and_classes(source_code, tree)
+        self._update_file_entry(key, stat, content_hash, package_name, class_info)
+        self._rebuild_class_maps()
+        self._store_element_dependencies(key, self._extract_dependencies(file_path, tree.root_node, source_code))
+        return True
+    
+    def remove_file(self, file_path: Path) -> bool:
+        """삭제된 파일 반영 (감시 모드 이벤트용), 색인에 있던 파일이면 True"""
+        key = self._file_key(Path(file_path))
+        if key not in self.file_entries:
+            return False
+        self._drop_file(key)
+        self._rebuild_class_maps()
+        self._cache_dirty = True
+        return True
+    
+    def _parse_source(self, key: str | None, source_code: bytes):
+        """소스 파싱 - 감시 모드에서는 이전 트리를 편집하여 증분 파싱"""
+        if self._trees is None or key is None:
+            return self.parser.parse(source_code)
+        
+        previous = self._trees.get(key)
+        if previous is None:
+            tree = self.parser.parse(source_code)
+        else:
+            old_tree, old_source = previous
+            edit = _compute_edit(old_source, source_code)
+            if edit is None:
+                tree = old_tree
+            else:
+                old_tree.edit(**edit)
+                tree = self.parser.parse(source_code, old_tree)
+        
+        self._trees[key] = (tree, source_code)
+        return tree
+    
+    def _load_cache_entries(self) -> dict[str, dict]:
+        """캐시 파일에서 파일별 엔트리 로드 (버전이 다르면 무시)"""
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            if cache_data.get('version') != CACHE_VERSION:
+                print("캐시 형식이 달라 새로 스캔합니다.")
+                return {}
+            return cache_data.get('files', {})
+        except Exception as e:
+            print(f"캐시 로드 실패: {e}, 새로 스캔합니다.")
+            return {}
+    
+    def _update_file_entry(self, key: str, stat: os.stat_result, content_hash: str,
+                           package_name: str | None, class_info: list[tuple[str, bool]]):
+        """스캔 결과로 캐시 엔트리 갱신 (내용 해시가 같으면 기존 분석 결과 유지)"""
+        entry = self.file_entries.get(key)
+        if entry is not None and package_name is None:
+            # 내용 동일 (touch, checkout 등) - stat만 갱신
+            entry['mtime'] = stat.st_mtime
+            entry['size'] = stat.st_size
+            return
+        
+        self.file_entries[key] = {
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'hash': content_hash,
+            'package': package_name or "",
+            'classes': [list(info) for info in class_info],
+            'elements': None
+        }
+        self._file_element_deps.pop(key, None)
+        self._remove_file_usages(key)
+        self._cache_dirty = True
+        if self.index:
+            self.index.upsert_file(key, package_name or "", class_info, content_hash)
+    
+    def _sync_index(self):
+        """SQLite 색인을 파일 엔트리와 동기화 (해시가 다른 파일만 갱신)"""
+        if not self.index:
+            return
+        
+        indexed = self.index.file_hashes()
+        for key in indexed.keys() - self.file_entries.keys():
+            self.index.delete_file(key)
+        for key, entry in self.file_entries.items():
+            if indexed.get(key) != entry['hash']:
+                self.index.upsert_file(key, entry['package'], entry['classes'], entry['hash'])
+        self.index.commit()
+    
+    def build_index(self) -> dict[str, int]:
+        """아직 색인되지 않은 모든 파일의 요소 의존성을 분석하여 색인"""
+        if not self.index:
+            raise ValueError("index_path가 지정되지 않았습니다.")
+        
+        pending = [key for key in self.index.unindexed_files() if key in self.file_entries]
+        print(f"색인 중: {len(pending)}개 파일")
+        self.ensure_element_dependencies(pending)
+        for i, key in enumerate(pending, 1):
+            try:
+                self.index.replace_elements(key, self.get_element_dependencies(self.project_root / key))
             except Exception as e:
-                print(f"캐시 로드 실패: {e}, 새로 스캔합니다.")
+                print(f"Error indexing {key}: {e}")
+            if i % 500 == 0:
+                self.index.commit()
         
-        self._scan_project()
         self._save_cache()
+        return self.index.statistics()
+    
+    def _rebuild_class_maps(self):
+        """파일 엔트리로부터 클래스/패키지 매핑 재구성"""
+        self.class_to_file = {}
+        self.package_to_files = defaultdict(list)
+        for key in sorted(self.file_entries):
+            entry = self.file_entries[key]
+            self._register_file_classes(self.project_root / key, entry['package'], entry['classes'])
     
     def _save_cache(self):
-        """클래스 매핑 정보를 캐시에 저장"""
-        if not self.use_cache:
+        """파일별 캐시 엔트리 저장 (변경이 있을 때만)"""
+        if self.index:
+            self.index.commit()
+        
+        if not self.use_cache or not self._cache_dirty:
             return
             
         try:
+            # 메모리에 복원된 요소 의존성을 직렬화하여 엔트리에 반영
+            for key, element_deps in self._file_element_deps.items():
+                entry = self.file_entries.get(key)
+                if entry is not None:
+                    entry['elements'] = self._serialize_element_dependencies(key, element_deps)
+            
             cache_data = {
-                'class_to_file': {k: str(v) for k, v in self.class_to_file.items()},
-                'package_to_files': {
-                    k: [str(p) for p in v] 
-                    for k, v in self.package_to_files.items()
-                }
+                'version': CACHE_VERSION,
+                'files': self.file_entries
             }
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            tmp_file = self.cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+            self._cache_dirty = False
         except Exception as e:
             print(f"캐시 저장 실패: {e}")
     
     def _scan_project(self):
-        """프로젝트 전체를 스캔하여 클래스-파일 매핑을 생성"""
-        java_files = list(self.project_root.rglob("*.java"))
-        print(f"스캔 중: {len(java_files)}개 Java 파일")
+        """캐시를 무시하고 프로젝트 전체를 다시 스캔"""
+        self.file_entries = {}
+        self._file_element_deps = {}
+        self._sync_file_entries()
+        self._save_cache()
+    
+    def _scan_file(self, file_path: Path, known_hash: str | None = None) -> tuple[str, str, str | None, list[tuple[str, bool]]]:
+        """파일 하나를 읽어 (경로, 내용 해시, 패키지명, 클래스 정보) 반환"""
+        source_code = get_source_cache().read_bytes(file_path)
+        
+        content_hash = _content_hash(source_code)
+        if known_hash and content_hash == known_hash:
+            return str(file_path), content_hash, None, []
         
+        package_name, class_info = self._parse_package_and_classes(source_code)
+        return str(file_path), content_hash, package_name, class_info
+    
+    def _scan_files(self, java_files: list[Path]):
+        """파일별 (경로, 해시, 패키지명, 클래스 정보) 생성 - 파일이 많으면 프로세스 풀로 병렬 파싱"""
+        tasks = []
         for file_path in java_files:
+            entry = self.file_entries.get(self._file_key(file_path))
+            known_hash = entry['hash'] if entry and self.use_content_hash else None
+            tasks.append((str(file_path), known_hash))
+        
+        if self.max_workers <= 1 or len(tasks) < PARALLEL_SCAN_MIN_FILES:
+            for file_path, known_hash in tasks:
+                try:
+                    yield self._scan_file(Path(file_path), known_hash)
+                except Exception as e:
+                    print(f"Error processing {file_path}: {e}")
+            return
+        
+        # 여러 파일씩 묶어 워커에 전달하여 IPC 오버헤드 최소화
+        chunksize = max(1, len(tasks) // (self.max_workers * 8))
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(_scan_file_worker, tasks, chunksize=chunksize)
+    
+    def _register_file_classes(self, file_path: Path, package_name: str, class_info: list[tuple[str, bool]]):
+        """스캔 결과를 클래스/패키지 매핑에 병합"""
+        # 패키지별 파일 매핑
+        if package_name:
+            self.package_to_files[package_name].append(file_path)
+        
+        # 클래스별 파일 매핑
+        for class_name, is_nested in class_info:
+            full_class_name = f"{package_name}.{class_name}" if package_name else class_name
+            self.class_to_file[full_class_name] = file_path
+            self.class_to_file[class_name] = file_path
+    
+    def _serialize_element_dependencies(self, key: str, element_deps: dict[str, ElementDependency]) -> dict[str, dict]:
+        """요소 id의 파일 경로 접두어를 제거하여 직렬화 (경로 표기와 무관하게 재사용)"""
+        serialized = {}
+        for element_id, elem_dep in element_deps.items():
+            _, _, suffix = element_id.partition('::')
+            serialized[suffix] = elem_dep.to_compact()
+        return serialized
+    
+    def get_element_dependencies(self, file_path: Path) -> dict[str, ElementDependency]:
+        """캐시를 활용한 파일별 요소 의존성 조회 (변경된 파일만 재분석)"""
+        file_path = Path(file_path)
+        key = self._file_key(file_path)
+        entry = self.file_entries.get(key) if key else None
+        
+        if entry is not None:
             try:
-                package_name, class_info = self._extract_package_and_classes(file_path)
-                
-                # 패키지별 파일 매핑
-                if package_name:
-                    self.package_to_files[package_name].append(file_path)
-                
-                # 클래스별 파일 매핑
-                for class_name, is_nested in class_info:
-                    full_class_name = f"{package_name}.{class_name}" if package_name else class_name
-                    self.class_to_file[full_class_name] = file_path
-                    self.class_to_file[class_name] = file_path
-                    
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
+                stat = file_path.stat()
+            except OSError:
+                stat = None
+            
+            if stat and (entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size):
+                # 시작 이후 변경된 파일 - 클래스 정보부터 갱신
+                known_hash = entry['hash'] if self.use_content_hash else None
+                _, content_hash, package_name, class_info = self._scan_file(file_path, known_hash)
+                self._update_file_entry(key, stat, content_hash, package_name, class_info)
+                if package_name is not None:
+                    self._rebuild_class_maps()
+            
+            cached = self._restore_element_dependencies(key)
+            if cached is not None:
+                return cached
+        
+        element_deps = self.extract_element_level_dependencies(file_path)
+        if key in self.file_entries:
+            self._store_element_dependencies(key, element_deps)
+        return element_deps
+    
+    def _restore_element_dependencies(self, key: str) -> dict[str, ElementDependency] | None:
+        """메모리 또는 캐시 엔트리에 저장된 요소 의존성 반환 (없으면 None)"""
+        if key in self._file_element_deps:
+            return self._file_element_deps[key]
+        
+        entry = self.file_entries[key]
+        if entry.get('elements') is None:
+            return None
+        
+        file_path = self.project_root / key
+        element_deps = {
+            f"{file_path}::{suffix}": ElementDependency.from_compact(data)
+            for suffix, data in entry.pop('elements').items()
+        }
+        self._file_element_deps[key] = element_deps
+        if self._usage_index_built:
+            self._index_file_usages(key, element_deps)
+        return element_deps
+    
+    def _evict_element_dependencies(self, key: str):
+        """메모리에 복원된 요소 의존성을 캐시 엔트리(직렬화 형태)로 되돌리고 해제"""
+        element_deps = self._file_element_deps.pop(key, None)
+        entry = self.file_entries.get(key)
+        if element_deps is not None and entry is not None and self.use_cache:
+            entry['elements'] = self._serialize_element_dependencies(key, element_deps)
+    
+    def _store_element_dependencies(self, key: str, element_deps: dict[str, ElementDependency]):
+        """새로 분석한 요소 의존성을 캐시/SQLite 색인/역참조 색인에 반영"""
+        self._file_element_deps[key] = element_deps
+        self._cache_dirty = True
+        if self.index:
+            self.index.replace_elements(key, element_deps)
+        if self._usage_index_built:
+            self._index_file_usages(key, element_deps)
+    
+    def ensure_element_dependencies(self, keys: list[str] | None = None,
+                                    executor: ProcessPoolExecutor | None = None):
+        """아직 분석되지 않은 파일들의 요소 의존성을 (파일이 많으면 병렬로) 분석
+        
+        executor를 넘기면 그 프로세스 풀을 사용 (여러 번 나눠 호출할 때 풀 재사용)
+        """
+        keys = list(self.file_entries) if keys is None else keys
+        missing = [
+            key for key in keys
+            if key in self.file_entries and self._restore_element_dependencies(key) is None
+        ]
+        if not missing:
+            return
+        
+        print(f"요소 의존성 분석 중: {len(missing)}개 파일")
+        if executor is None and (self.max_workers <= 1 or len(missing) < PARALLEL_SCAN_MIN_FILES):
+            for key in missing:
+                try:
+                    self._store_element_dependencies(
+                        key, self.extract_element_level_dependencies(self.project_root / key)
+                    )
+                except Exception as e:
+                    print(f"Error analyzing {key}: {e}")
+            return
+        
+        paths = [str(self.project_root / key) for key in missing]
+        chunksize = max(1, len(paths) // (self.max_workers * 8))
+        with nullcontext(executor) if executor is not None else ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for file_path, serialized in executor.map(_element_dependencies_worker, paths, chunksize=chunksize):
+                if serialized is None:
+                    continue
+                element_deps = {
+                    f"{file_path}::{suffix}": ElementDependency.from_compact(data)
+                    for suffix, data in serialized.items()
+                }
+                self._store_element_dependencies(self._file_key(Path(file_path)), element_deps)
+    
+    def _iter_usage_postings(self, key: str, element_deps: dict[str, ElementDependency]):
+        """역참조 색인 항목 (심볼, (파일 키, 요소 id, 라인, 의존성 타입)) 생성"""
+        for element_id, elem_dep in element_deps.items():
+            line_start = elem_dep.element.line_start
+            for dep_type, symbol, line, _ in elem_dep.iter_occurrences():
+                yield symbol, (key, element_id, line or line_start, dep_type)
+            for target in elem_dep.referenced_elements:
+                yield target, (key, element_id, line_start, 'referenced_element')
+            yield elem_dep.element.name, (key, element_id, line_start, 'element_definition')
+    
+    def _index_file_usages(self, key: str, element_deps: dict[str, ElementDependency]):
+        """파일 하나의 역참조 색인 항목 교체"""
+        self._remove_file_usages(key)
+        symbols = set()
+        for symbol, posting in self._iter_usage_postings(key, element_deps):
+            self.usage_index[symbol].append(posting)
+            symbols.add(symbol)
+        self._usage_index_symbols[key] = symbols
+    
+    def _remove_file_usages(self, key: str):
+        """파일 하나의 역참조 색인 항목 제거"""
+        for symbol in self._usage_index_symbols.pop(key, ()):
+            postings = [posting for posting in self.usage_index[symbol] if posting[0] != key]
+            if postings:
+                self.usage_index[symbol] = postings
+            else:
+                del self.usage_index[symbol]
+    
+    def build_usage_index(self):
+        """프로젝트 전체 역참조 색인 구축 (이후 파일 변경 시 증분 갱신)"""
+        self.ensure_element_dependencies()
+        self.usage_index = defaultdict(list)
+        self._usage_index_symbols = {}
+        for key, element_deps in self._file_element_deps.items():
+            self._index_file_usages(key, element_deps)
+        self._usage_index_built = True
+        self._save_cache()
     
     def _extract_package_and_classes(self, file_path: Path) -> tuple[str, list[tuple[str, bool]]]:
         """패키지명과 클래스명 추출"""
-        with open(file_path, 'rb') as f:
-            source_code = f.read()
+        source_code = get_source_cache().read_bytes(file_path)
         
-        tree = self.parser.parse(source_code)
+        return self._parse_package_and_classes(source_code)
+    
+    def _parse_package_and_classes(self, source_code: bytes, tree=None) -> tuple[str, list[tuple[str, bool]]]:
+        """소스 코드에서 패키지명과 클래스명 추출"""
+        if tree is None:
+            tree = self.parser.parse(source_code)
         root_node = tree.root_node
         
         package_name = ""
@@ -165,109 +1039,276 @@ class ElementLevelDependencyAnalyzer:
                 for child in node.children:
                     extract_classes_from_node(child, parent_class, depth)
         
-        def traverse_node(node):
-            nonlocal package_name
-            
+        # package 선언은 최상위에만 올 수 있으므로 루트의 자식만 확인
+        for node in root_node.children:
             if node.type == 'package_declaration':
                 for child in node.children:
                     if child.type in ['scoped_identifier', 'identifier']:
                         package_name = self._get_node_text(child, source_code)
                         break
-            
-            for child in node.children:
-                traverse_node(child)
+                break
         
-        traverse_node(root_node)
         extract_classes_from_node(root_node)
         
         return package_name, class_info
     
     def extract_element_level_dependencies(self, file_path: Path) -> dict[str, ElementDependency]:
         """파일에서 요소별 의존성을 추출"""
-        with open(file_path, 'rb') as f:
-            source_code = f.read()
+        source_code = get_source_cache().read_bytes(file_path)
         
-        tree = self.parser.parse(source_code)
-        root_node = tree.root_node
+        tree = self._parse_source(self._file_key(Path(file_path)) if self._trees is not None else None, source_code)
+        return self._extract_dependencies(file_path, tree.root_node, source_code)
+    
+    def _extract_dependencies(self, file_path: Path, root_node, source_code: bytes) -> dict[str, ElementDependency]:
+        if self.dependency_query is not None:
+            return self._extract_with_query(file_path, root_node, source_code)
+        return self._extract_from_tree(file_path, root_node, source_code)
+    
+    def _extract_with_query(self, file_path: Path, root_node, source_code: bytes) -> dict[str, ElementDependency]:
+        """선언 노드만 순회해 요소를 수집하고, 쿼리 캡처를 가장 안쪽 요소에 귀속"""
+        collected: dict[str, tuple[CodeElement, dict, dict, list]] = {}
+        spans: list[tuple[int, int, tuple[str, ...]]] = []  # (시작 바이트, 끝 바이트, 요소 id들)
+        
+        # 멤버 선언 내부로는 내려가지 않으므로 클래스 본문 수준의 노드만 방문
+        stack = [(root_node, "", "")]
+        while stack:
+            node, parent_name, class_context = stack.pop()
+            
+            if node.type in _TYPE_DECLARATIONS or node.type in _MEMBER_DECLARATIONS:
+                owners = []
+                for element in self._extract_declared_elements(node, source_code, parent_name, class_context):
+                    if element.type in ('class', 'interface', 'enum'):
+                        element_id = f"{file_path}::{element.name}"
+                        parent_name = class_context = element.name
+                    else:
+                        element_id = f"{file_path}::{class_context}::{element.name}"
+                    collected[element_id] = (element, defaultdict(list), defaultdict(list), [])
+                    owners.append(element_id)
+                
+                if owners:
+                    spans.append((node.start_byte, node.end_byte, tuple(owners)))
+                if node.type in _MEMBER_DECLARATIONS:
+                    continue
+            
+            for child in reversed(node.children):
+                stack.append((child, parent_name, class_context))
+        
+        # 같은 id(오버로딩 등)는 나중 선언이 대체 - 대체된 선언의 범위는 제외
+        live = {}
+        for start, end, owners in spans:
+            for owner in owners:
+                live[owner] = start
+        spans = [
+            (start, end, tuple(owner for owner in owners if live[owner] == start))
+            for start, end, owners in spans
+        ]
+        spans.sort(key=lambda span: (span[0], -span[1]))
+        
+        # 캡처는 시작 위치 순으로 반환되므로 요소 범위 스택을 함께 전진시키며 귀속
+        active = []
+        next_span = 0
+        for node, capture in self.dependency_query.captures(root_node):
+            position = node.start_byte
+            while next_span < len(spans) and spans[next_span][0] <= position:
+                while active and active[-1][1] <= spans[next_span][0]:
+                    active.pop()
+                active.append(spans[next_span])
+                next_span += 1
+            while active and active[-1][1] <= position:
+                active.pop()
+            if not active:
+                continue
+            
+            for owner in active[-1][2]:
+                _, dependencies, location_info, referenced_elements = collected[owner]
+                self._record_capture(capture, node, source_code, dependencies, location_info, referenced_elements)
         
-        # 파일의 모든 요소들을 먼저 추출
-        elements = self._extract_all_elements(root_node, source_code, file_path)
+        return {
+            element_id: self._build_element_dependency(element, dependencies, location_info, referenced_elements)
+            for element_id, (element, dependencies, location_info, referenced_elements) in collected.items()
+        }
+    
+    def _record_capture(self, capture: str, node, source_code: bytes, dependencies: dict, location_info: dict, referenced_elements: list):
+        """쿼리 캡처 하나를 의존성으로 기록"""
+        if capture == 'method_invocation':
+            self._extract_method_invocation_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1, referenced_elements)
+            return
+        if capture == 'field_access':
+            self._extract_field_access_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1, referenced_elements)
+            return
+        if capture == 'local_variable':
+            self._extract_local_variable_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1)
+            return
         
-        # 각 요소별로 의존성 분석
-        element_dependencies = {}
+        name = self._get_node_text(node, source_code)
         
-        for element_id, element in elements.items():
-            dependencies = self._analyze_element_dependencies(element, root_node, source_code, elements)
-            element_dependencies[element_id] = ElementDependency(
-                element=element,
-                dependencies=dependencies['dependencies'],
-                referenced_elements=dependencies['referenced_elements'],
-                location_info=dependencies['location_info']
-            )
+        if capture == 'type_usage':
+            # 부모 노드가 메서드 호출이나 필드 접근이 아닌 경우에만 추가
+            if node.parent and node.parent.type in ('method_invocation', 'field_access'):
+                return
+            dep_type, context, line_node = 'class_references', 'type_usage', node
+        elif capture == 'object_creation':
+            dep_type, context, line_node = 'class_references', 'object_creation', node.parent
+        elif capture == 'cast':
+            dep_type, context, line_node = 'class_references', 'cast_expression', node.parent
+        elif capture == 'annotation':
+            dependencies['annotations'].append(name)
+            location_info['annotations'].append({
+                'name': name,
+                'line': node.parent.start_point[0] + 1,
+                'context': 'annotation'
+            })
+            return
+        elif capture == 'exception':
+            # 예외 위치는 try 문 기준
+            line_node = node.parent
+            while line_node.parent and line_node.type not in _TRY_STATEMENTS:
+                line_node = line_node.parent
+            dep_type, context = 'exceptions', 'exception_handling'
+        else:
+            return
         
-        return element_dependencies
+        if self._is_java_builtin_or_primitive(name):
+            return
+        dependencies[dep_type].append(name)
+        location_info[dep_type].append({
+            'name': name,
+            'line': line_node.start_point[0] + 1,
+            'context': context
+        })
     
-    def _extract_all_elements(self, root_node, source_code: bytes, file_path: Path) -> dict[str, CodeElement]:
-        """파일의 모든 코드 요소들을 추출"""
-        elements = {}
-        
-        def extract_elements_from_node(node, parent_name="", class_context=""):
-            if node.type == 'class_declaration':
-                class_element = self._extract_class_element(node, source_code, parent_name)
-                if class_element:
-                    element_id = f"{file_path}::{class_element.name}"
-                    elements[element_id] = class_element
-                    
-                    # 클래스 내부 요소들 추출
-                    for child in node.children:
-                        if child.type == 'class_body':
-                            extract_elements_from_node(child, class_element.name, class_element.name)
-            
-            elif node.type == 'interface_declaration':
-                interface_element = self._extract_interface_element(node, source_code, parent_name)
-                if interface_element:
-                    element_id = f"{file_path}::{interface_element.name}"
-                    elements[element_id] = interface_element
-                    
-                    for child in node.children:
-                        if child.type == 'interface_body':
-                            extract_elements_from_node(child, interface_element.name, interface_element.name)
+    def _extract_from_tree(self, file_path: Path, root_node, source_code: bytes) -> dict[str, ElementDependency]:
+        """AST를 한 번만 순회하며 요소를 수집하고, 각 의존성을 가장 안쪽의 요소에 귀속 (쿼리 미사용 시)"""
+        collected: dict[str, tuple[CodeElement, dict, dict, list]] = {}
+        
+        # (노드, 의존성을 귀속할 요소 id들, 부모명, 클래스 문맥, 멤버 선언 내부 여부)
+        stack = [(root_node, (), "", "", False)]
+        while stack:
+            node, owners, parent_name, class_context, in_member = stack.pop()
             
-            elif node.type == 'enum_declaration':
-                enum_element = self._extract_enum_element(node, source_code, parent_name)
-                if enum_element:
-                    element_id = f"{file_path}::{enum_element.name}"
-                    elements[element_id] = enum_element
-                    
-                    for child in node.children:
-                        if child.type == 'enum_body':
-                            extract_elements_from_node(child, enum_element.name, enum_element.name)
-            
-            elif node.type == 'method_declaration':
-                method_element = self._extract_method_element(node, source_code, class_context)
-                if method_element:
-                    element_id = f"{file_path}::{class_context}::{method_element.name}"
-                    elements[element_id] = method_element
+            # 멤버(메서드/생성자/필드) 내부의 로컬/익명 클래스는 별도 요소로 수집하지 않음
+            if not in_member and (node.type in _TYPE_DECLARATIONS or node.type in _MEMBER_DECLARATIONS):
+                declared = self._extract_declared_elements(node, source_code, parent_name, class_context)
+                if declared:
+                    owners = []
+                    for element in declared:
+                        if element.type in ('class', 'interface', 'enum'):
+                            element_id = f"{file_path}::{element.name}"
+                            parent_name = class_context = element.name
+                        else:
+                            element_id = f"{file_path}::{class_context}::{element.name}"
+                            in_member = True
+                        # 같은 id(오버로딩 등)는 나중 선언이 대체
+                        collected[element_id] = (element, defaultdict(list), defaultdict(list), [])
+                        owners.append(element_id)
+                    owners = tuple(owners)
             
-            elif node.type == 'constructor_declaration':
-                constructor_element = self._extract_constructor_element(node, source_code, class_context)
-                if constructor_element:
-                    element_id = f"{file_path}::{class_context}::{constructor_element.name}"
-                    elements[element_id] = constructor_element
+            for owner in owners:
+                _, dependencies, location_info, referenced_elements = collected[owner]
+                self._analyze_node_dependencies(node, source_code, dependencies, location_info, referenced_elements)
             
-            elif node.type == 'field_declaration':
-                field_elements = self._extract_field_elements(node, source_code, class_context)
-                for field_element in field_elements:
-                    element_id = f"{file_path}::{class_context}::{field_element.name}"
-                    elements[element_id] = field_element
+            for child in reversed(node.children):
+                stack.append((child, owners, parent_name, class_context, in_member))
+        
+        return {
+            element_id: self._build_element_dependency(element, dependencies, location_info, referenced_elements)
+            for element_id, (element, dependencies, location_info, referenced_elements) in collected.items()
+        }
+    
+    def extract_declared_types(self, file_path: Path) -> list[DeclaredType]:
+        """파일 내 모든 선언의 타입 목록 (의존성 추출과 달리 String/int 등 내장 타입도 포함)"""
+        file_path = Path(file_path)
+        source_code = get_source_cache().read_bytes(file_path)
+        tree = self._parse_source(self._file_key(file_path), source_code)
+        
+        declared = []
+        
+        def add(type_node, name_node, kind: str, line: int, scope: tuple[int, int, str]):
+            if type_node is not None and name_node is not None:
+                declared.append(DeclaredType(
+                    self._get_node_text(name_node, source_code), self._get_node_text(type_node, source_code),
+                    kind, line, *scope
+                ))
+        
+        # (노드, (범위 시작, 범위 끝, 소속 클래스)) - 메서드 밖은 클래스 범위
+        stack = [(tree.root_node, (0, 0, ""))]
+        while stack:
+            node, scope = stack.pop()
+            node_type = node.type
+            line = node.start_point[0] + 1
             
-            else:
-                # 다른 노드들에서도 재귀적으로 요소 찾기
+            if node_type in _TYPE_DECLARATIONS:
+                name_node = node.child_by_field_name('name')
+                owner = self._get_node_text(name_node, source_code) if name_node is not None else scope[2]
+                scope = (*self._get_line_number(node), owner)
+            elif node_type in ('method_declaration', 'constructor_declaration'):
+                if node_type == 'method_declaration':
+                    add(node.child_by_field_name('type'), node.child_by_field_name('name'), 'method', line, scope)
+                scope = (*self._get_line_number(node), scope[2])
+            elif node_type in ('local_variable_declaration', 'field_declaration'):
+                kind = 'field' if node_type == 'field_declaration' else 'local'
+                type_node = node.child_by_field_name('type')
                 for child in node.children:
-                    extract_elements_from_node(child, parent_name, class_context)
+                    if child.type == 'variable_declarator':
+                        add(type_node, child.child_by_field_name('name'), kind, line, scope)
+            elif node_type == 'formal_parameter':
+                add(node.child_by_field_name('type'), node.child_by_field_name('name'), 'parameter', line, scope)
+            elif node_type in ('enhanced_for_statement', 'resource'):
+                add(node.child_by_field_name('type'), node.child_by_field_name('name'), 'local', line, scope)
+            
+            for child in reversed(node.children):
+                stack.append((child, scope))
         
-        extract_elements_from_node(root_node)
-        return elements
+        return declared
+
+    def extract_supertypes(self, file_path: Path) -> dict[str, list[str]]:
+        """파일 내 클래스/인터페이스/enum별 상위 타입 (extends/implements, 제네릭 인자와 패키지 제외한 단순 이름)"""
+        file_path = Path(file_path)
+        source_code = get_source_cache().read_bytes(file_path)
+        tree = self._parse_source(self._file_key(file_path), source_code)
+
+        supertypes = {}
+        stack = [tree.root_node]
+        while stack:
+            node = stack.pop()
+            if node.type in _TYPE_DECLARATIONS:
+                name_node = node.child_by_field_name('name')
+                if name_node is not None:
+                    names = []
+                    for child in node.children:
+                        if child.type == 'superclass':
+                            type_nodes = child.children[1:]
+                        elif child.type in ('super_interfaces', 'extends_interfaces'):
+                            type_nodes = [
+                                type_node
+                                for type_list in child.children if type_list.type == 'type_list'
+                                for type_node in type_list.named_children
+                            ]
+                        else:
+                            continue
+                        for type_node in type_nodes:
+                            type_name = self._get_node_text(type_node, source_code).partition('<')[0]
+                            names.append(type_name.strip().rpartition('.')[2])
+                    supertypes[self._get_node_text(name_node, source_code)] = names
+            stack.extend(reversed(node.children))
+
+        return supertypes
+
+    def _extract_declared_elements(self, node, source_code: bytes, parent_name: str, class_context: str) -> list[CodeElement]:
+        """선언 노드에서 코드 요소 추출 (필드 선언은 여러 요소일 수 있음)"""
+        if node.type == 'class_declaration':
+            element = self._extract_class_element(node, source_code, parent_name)
+        elif node.type == 'interface_declaration':
+            element = self._extract_interface_element(node, source_code, parent_name)
+        elif node.type == 'enum_declaration':
+            element = self._extract_enum_element(node, source_code, parent_name)
+        elif node.type == 'method_declaration':
+            element = self._extract_method_element(node, source_code, class_context)
+        elif node.type == 'constructor_declaration':
+            element = self._extract_constructor_element(node, source_code, class_context)
+        else:
+            return self._extract_field_elements(node, source_code, class_context)
+        return [element] if element else []
     
     def _extract_class_element(self, node, source_code: bytes, parent_name: str) -> CodeElement | None:
         """클래스 요소 추출"""
@@ -459,117 +1500,44 @@ class ElementLevelDependencyAnalyzer:
         
         return parameters
     
-    def _analyze_element_dependencies(self, element: CodeElement, root_node, source_code: bytes, all_elements: dict[str, CodeElement]) -> dict:
-        """특정 요소의 의존성 분석"""
-        dependencies = {
-            'imports': [],
-            'class_references': [],
-            'method_calls': [],
-            'field_access': [],
-            'inheritance': [],
-            'annotations': [],
-            'generics': [],
-            'exceptions': [],
-            'lambda_references': [],
-            'local_variables': []
-        }
-        
-        referenced_elements = []
-        location_info = defaultdict(list)
-        
-        # 요소의 위치에 해당하는 AST 노드를 찾기
-        element_node = self._find_element_node(root_node, element, source_code)
-        
-        if element_node:
-            # 해당 요소 내부에서만 의존성 분석
-            self._analyze_node_dependencies(element_node, source_code, dependencies, location_info, referenced_elements, all_elements)
-        
+    def _build_element_dependency(self, element: CodeElement, dependencies: dict, location_info: dict,
+                                  referenced_elements: list) -> ElementDependency:
+        """수집된 의존성을 정리하여 ElementDependency 생성"""
         # 중복 제거 및 정리 - 순서 보존하면서 중복 제거
-        for key in dependencies:
+        cleaned = {}
+        for key in DEPENDENCY_TYPES:
             unique_deps = []
             seen = set()
-            for dep in dependencies[key]:
+            for dep in dependencies.get(key, ()):
                 if dep and not self._is_java_builtin_or_primitive(dep) and dep not in seen:
                     unique_deps.append(dep)
                     seen.add(dep)
-            dependencies[key] = unique_deps
+            cleaned[key] = unique_deps
         
         # referenced_elements도 중복 제거
-        unique_refs = []
-        seen_refs = set()
-        for ref in referenced_elements:
-            if ref and ref not in seen_refs:
-                unique_refs.append(ref)
-                seen_refs.add(ref)
+        unique_refs = list(dict.fromkeys(ref for ref in referenced_elements if ref))
         
-        return {
-            'dependencies': dependencies,
-            'referenced_elements': unique_refs,
-            'location_info': dict(location_info)
-        }
-    
-    def _find_element_node(self, root_node, element: CodeElement, source_code: bytes):
-        """요소에 해당하는 AST 노드 찾기"""
-        def find_node_by_position(node):
-            node_start, node_end = self._get_line_number(node)
-            
-            # 라인 번호와 요소 타입이 일치하는지 확인
-            if (node_start == element.line_start and 
-                node_end >= element.line_end and
-                self._node_matches_element_type(node, element)):
-                
-                # 이름도 확인
-                if self._node_name_matches(node, element, source_code):
-                    return node
-            
-            # 자식 노드들에서 재귀적으로 찾기
-            for child in node.children:
-                result = find_node_by_position(child)
-                if result:
-                    return result
-            
-            return None
-        
-        return find_node_by_position(root_node)
-    
-    def _node_matches_element_type(self, node, element: CodeElement) -> bool:
-        """노드 타입이 요소 타입과 일치하는지 확인"""
-        type_mapping = {
-            'class': ['class_declaration'],
-            'interface': ['interface_declaration'],
-            'enum': ['enum_declaration'],
-            'method': ['method_declaration'],
-            'constructor': ['constructor_declaration'],
-            'field': ['field_declaration']
-        }
-        
-        return node.type in type_mapping.get(element.type, [])
-    
-    def _node_name_matches(self, node, element: CodeElement, source_code: bytes) -> bool:
-        """노드 이름이 요소 이름과 일치하는지 확인"""
-        for child in node.children:
-            if child.type == 'identifier':
-                node_name = self._get_node_text(child, source_code)
-                if element.type == 'constructor':
-                    return node_name in element.name
-                else:
-                    return node_name == element.name
-        return False
+        return ElementDependency(
+            element=element,
+            dependencies=cleaned,
+            referenced_elements=unique_refs,
+            location_info=dict(location_info)
+        )
     
-    def _analyze_node_dependencies(self, node, source_code: bytes, dependencies: dict, location_info: dict, referenced_elements: list, all_elements: dict):
-        """노드에서 의존성 분석"""
-        line_start, line_end = self._get_line_number(node)
+    def _analyze_node_dependencies(self, node, source_code: bytes, dependencies: dict, location_info: dict, referenced_elements: list):
+        """단일 노드의 의존성 분석 (자식 순회는 호출자가 담당)"""
+        node_type = node.type
         
-        if node.type == 'object_creation_expression':
-            self._extract_object_creation_dependency(node, source_code, dependencies, location_info, line_start)
+        if node_type == 'object_creation_expression':
+            self._extract_object_creation_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1)
         
-        elif node.type == 'method_invocation':
-            self._extract_method_invocation_dependency(node, source_code, dependencies, location_info, line_start, referenced_elements)
+        elif node_type == 'method_invocation':
+            self._extract_method_invocation_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1, referenced_elements)
         
-        elif node.type == 'field_access':
-            self._extract_field_access_dependency(node, source_code, dependencies, location_info, line_start, referenced_elements)
+        elif node_type == 'field_access':
+            self._extract_field_access_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1, referenced_elements)
         
-        elif node.type == 'type_identifier':
+        elif node_type == 'type_identifier':
             type_name = self._get_node_text(node, source_code)
             if not self._is_java_builtin_or_primitive(type_name):
                 # 부모 노드가 메서드 호출이나 필드 접근이 아닌 경우에만 추가
@@ -578,25 +1546,21 @@ class ElementLevelDependencyAnalyzer:
                     dependencies['class_references'].append(type_name)
                     location_info['class_references'].append({
                         'name': type_name,
-                        'line': line_start,
+                        'line': node.start_point[0] + 1,
                         'context': 'type_usage'
                     })
         
-        elif node.type == 'annotation':
-            self._extract_annotation_dependency(node, source_code, dependencies, location_info, line_start)
-        
-        elif node.type == 'local_variable_declaration':
-            self._extract_local_variable_dependency(node, source_code, dependencies, location_info, line_start)
+        elif node_type == 'annotation':
+            self._extract_annotation_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1)
         
-        elif node.type == 'cast_expression':
-            self._extract_cast_dependency(node, source_code, dependencies, location_info, line_start)
+        elif node_type == 'local_variable_declaration':
+            self._extract_local_variable_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1)
         
-        elif node.type == 'try_statement':
-            self._extract_exception_dependency(node, source_code, dependencies, location_info, line_start)
+        elif node_type == 'cast_expression':
+            self._extract_cast_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1)
         
-        # 자식 노드들을 재귀적으로 분석
-        for child in node.children:
-            self._analyze_node_dependencies(child, source_code, dependencies, location_info, referenced_elements, all_elements)
+        elif node_type in _TRY_STATEMENTS:
+            self._extract_exception_dependency(node, source_code, dependencies, location_info, node.start_point[0] + 1)
     
     def _extract_object_creation_dependency(self, node, source_code: bytes, dependencies: dict, location_info: dict, line: int):
         """객체 생성 의존성 추출"""
@@ -617,6 +1581,11 @@ class ElementLevelDependencyAnalyzer:
         # 노드의 전체 텍스트로 디버깅
         method_text = self._get_node_text(node, source_code).strip()
         
+        # 수신 객체 (obj.method() 의 obj) - 호출 그래프에서 호출 대상 클래스 판단에 사용
+        name_node = node.child_by_field_name('name')
+        object_node = node.child_by_field_name('object')
+        receiver = self._get_node_text(object_node, source_code).strip() if object_node is not None else None
+        
         # 직접적인 메서드 이름 찾기
         for child in node.children:
             if child.type == 'identifier':
@@ -624,11 +1593,14 @@ class ElementLevelDependencyAnalyzer:
                 # 메서드 호출 기록 (Java 키워드나 내장 메서드 제외)
                 if method_name and not self._is_java_builtin_or_primitive(method_name) and not method_name in ['for', 'if', 'while', 'try', 'catch']:
                     dependencies['method_calls'].append(method_name)
-                    location_info['method_calls'].append({
+                    call_location = {
                         'name': method_name,
                         'line': line,
                         'context': 'direct_method_call'
-                    })
+                    }
+                    if receiver and child == name_node:
+                        call_location['target'] = receiver
+                    location_info['method_calls'].append(call_location)
                     referenced_elements.append(f"method:{method_name}")
             
             elif child.type == 'field_access':
@@ -758,7 +1730,14 @@ class ElementLevelDependencyAnalyzer:
             if child.type == 'catch_clause':
                 for grandchild in child.children:
                     if grandchild.type == 'catch_formal_parameter':
+                        # 예외 타입은 catch_type 아래에 위치 (multi-catch 포함)
+                        type_nodes = []
                         for ggchild in grandchild.children:
+                            if ggchild.type == 'catch_type':
+                                type_nodes.extend(ggchild.children)
+                            else:
+                                type_nodes.append(ggchild)
+                        for ggchild in type_nodes:
                             if ggchild.type == 'type_identifier':
                                 exception_type = self._get_node_text(ggchild, source_code)
                                 if not self._is_java_builtin_or_primitive(exception_type):
@@ -783,78 +1762,27 @@ class ElementLevelDependencyAnalyzer:
     
     def analyze_file_elements(self, file_path: Path, top_n: int = 10) -> dict[str, Any]:
         """파일의 모든 요소별 의존성 분석"""
+        return self._analyze_file_elements(file_path, top_n)[0]
+    
+    def _analyze_file_elements(self, file_path: Path, top_n: int) -> tuple[dict[str, Any], DependencyReportStats]:
         print(f"Analyzing elements in: {file_path}")
         
-        element_dependencies = self.extract_element_level_dependencies(file_path)
+        element_dependencies = self.get_element_dependencies(file_path)
+        self._save_cache()
         
         # 통계 계산
-        stats = {
-            'total_elements': len(element_dependencies),
-            'elements_by_type': defaultdict(int),
-            'dependency_stats': defaultdict(int),
-            'most_dependent_elements': [],
-            'circular_references': [],
-            'top_n_limit': top_n  # 설정된 제한값 기록
-        }
-        
-        # 의존性이 많은 요소들을 효율적으로 찾기 (heapq 사용)
-        import heapq
-        
-        # 상위 N개만 유지하는 최소 힙 사용
-        top_elements = []
-        element_counter = 0  # 고유 식별자로 사용
-        
-        for element_id, elem_dep in element_dependencies.items():
-            stats['elements_by_type'][elem_dep.element.type] += 1
-            
-            total_deps = sum(len(deps) for deps in elem_dep.dependencies.values())
-            stats['dependency_stats'][elem_dep.element.type] += total_deps
-            
-            element_info = {
-                'element': f"{elem_dep.element.type}:{elem_dep.element.name}",
-                'total_dependencies': total_deps,
-                'line': f"{elem_dep.element.line_start}-{elem_dep.element.line_end}",
-                'element_type': elem_dep.element.type
-            }
-            
-            # top_n이 0 이하면 모든 요소 포함
-            if top_n <= 0:
-                top_elements.append((total_deps, element_counter, element_info))
-            else:
-                # 힙 크기가 top_n 미만이면 그냥 추가
-                if len(top_elements) < top_n:
-                    heapq.heappush(top_elements, (total_deps, element_counter, element_info))
-                # 현재 요소가 힙의 최소값보다 크면 교체
-                elif total_deps > top_elements[0][0]:
-                    heapq.heapreplace(top_elements, (total_deps, element_counter, element_info))
-            
-            element_counter += 1
-        
-        # 힙에서 꺼내서 내림차순으로 정렬
-        if top_n <= 0:
-            # 모든 요소를 포함하는 경우 정렬
-            stats['most_dependent_elements'] = [
-                elem_info for _, _, elem_info in sorted(top_elements, key=lambda x: x[0], reverse=True)
-            ]
-        else:
-            # 상위 N개만 포함
-            stats['most_dependent_elements'] = [
-                elem_info for _, _, elem_info in sorted(top_elements, key=lambda x: x[0], reverse=True)
-            ]
+        stats = DependencyReportStats(top_n)
+        for elem_dep in element_dependencies.values():
+            stats.add(elem_dep)
         
         return {
             'file_path': str(file_path),
             'element_dependencies': {
-                element_id: {
-                    'element': asdict(elem_dep.element),
-                    'dependencies': elem_dep.dependencies,
-                    'referenced_elements': elem_dep.referenced_elements,
-                    'location_info': elem_dep.location_info
-                }
+                element_id: elem_dep.to_dict()
                 for element_id, elem_dep in element_dependencies.items()
             },
-            'statistics': dict(stats)
-        }
+            'statistics': stats.statistics()
+        }, stats
 
     def generate_element_dependency_report(self, target_file: str, top_n: int = 10) -> dict[str, Any]:
         """요소 단위 의존성 분석 보고서 생성"""
@@ -865,7 +1793,7 @@ class ElementLevelDependencyAnalyzer:
             else:
                 raise FileNotFoundError(f"Target file not found: {target_file}")
         
-        analysis_result = self.analyze_file_elements(target_path, top_n)
+        analysis_result, stats = self._analyze_file_elements(target_path, top_n)
         
         # 추가 분석
         report = {
@@ -873,94 +1801,84 @@ class ElementLevelDependencyAnalyzer:
             'target_file': str(target_path),
             'top_n_limit': top_n,
             'timestamp': json.dumps(None),  # 현재 시간으로 대체 가능
-            'summary': self._generate_analysis_summary(analysis_result),
+            'summary': stats.summary(),
             'detailed_analysis': analysis_result,
-            'recommendations': self._generate_recommendations(analysis_result),
+            'recommendations': stats.recommendations(),
             'dependency_matrix': self._build_dependency_matrix(analysis_result)
         }
         
         return report
     
-    def _generate_analysis_summary(self, analysis_result: dict) -> dict:
-        """분석 요약 생성"""
-        stats = analysis_result['statistics']
-        element_deps = analysis_result['element_dependencies']
-        
-        # 복잡도 분석
-        high_complexity_elements = [
-            elem for elem in stats['most_dependent_elements'] 
-            if elem['total_dependencies'] > 10
-        ]
-        
-        # 의존성 패턴 분석
-        dependency_patterns = defaultdict(int)
-        for elem_id, elem_data in element_deps.items():
-            for dep_type, deps in elem_data['dependencies'].items():
-                if deps:
-                    dependency_patterns[dep_type] += len(deps)
-        
+    def _build_dependency_matrix(self, analysis_result: dict) -> dict:
+        """의존성 매트릭스 구성"""
         return {
-            'total_elements_analyzed': stats['total_elements'],
-            'elements_by_type': dict(stats['elements_by_type']),
-            'high_complexity_elements_count': len(high_complexity_elements),
-            'most_common_dependency_types': dict(sorted(dependency_patterns.items(), key=lambda x: x[1], reverse=True)[:5]),
-            'average_dependencies_per_element': sum(dependency_patterns.values()) / max(stats['total_elements'], 1),
-            'complexity_indicators': {
-                'methods_with_high_dependencies': len([e for e in high_complexity_elements if 'method:' in e['element']]),
-                'classes_with_high_dependencies': len([e for e in high_complexity_elements if 'class:' in e['element']]),
-                'fields_with_dependencies': sum(1 for elem_data in element_deps.values() if elem_data['element']['type'] == 'field' and any(elem_data['dependencies'].values()))
-            }
+            f"{elem_data['element']['type']}:{elem_data['element']['name']}": _dependency_matrix_row(elem_data['dependencies'])
+            for elem_data in analysis_result['element_dependencies'].values()
         }
     
-    def _generate_recommendations(self, analysis_result: dict) -> list[str]:
-        """개선 권장사항 생성"""
-        recommendations = []
-        stats = analysis_result['statistics']
-        
-        # 복잡도 기반 권장사항
-        high_complexity = [e for e in stats['most_dependent_elements'] if e['total_dependencies'] > 15]
-        if high_complexity:
-            recommendations.append(f"High complexity detected: {len(high_complexity)} elements have >15 dependencies. Consider refactoring.")
-        
-        # 메서드 복잡도
-        method_complexity = [e for e in stats['most_dependent_elements'] if 'method:' in e['element'] and e['total_dependencies'] > 10]
-        if method_complexity:
-            recommendations.append(f"{len(method_complexity)} methods have high dependency count. Consider breaking them into smaller methods.")
-        
-        # 클래스 복잡도
-        class_complexity = [e for e in stats['most_dependent_elements'] if 'class:' in e['element'] and e['total_dependencies'] > 20]
-        if class_complexity:
-            recommendations.append(f"{len(class_complexity)} classes have very high dependency count. Consider applying Single Responsibility Principle.")
-        
-        # 의존성 패턴 기반 권장사항
-        element_deps = analysis_result['element_dependencies']
-        annotation_heavy = sum(1 for elem_data in element_deps.values() if len(elem_data['dependencies'].get('annotations', [])) > 5)
-        if annotation_heavy > 0:
-            recommendations.append(f"{annotation_heavy} elements are annotation-heavy. Review if all annotations are necessary.")
-        
-        return recommendations
-    
-    def _build_dependency_matrix(self, analysis_result: dict) -> dict:
-        """의존성 매트릭스 구성"""
-        matrix = {}
-        element_deps = analysis_result['element_dependencies']
-        
-        for elem_id, elem_data in element_deps.items():
-            element_name = f"{elem_data['element']['type']}:{elem_data['element']['name']}"
-            matrix[element_name] = {}
+    def stream_element_report(self, output_file: str, targets: list[str] | None = None, top_n: int = 10) -> dict:
+        """요소 의존성 보고서를 NDJSON으로 스트리밍 저장
+        
+        한 줄에 레코드 하나: header → 요소별 element 레코드 → 마지막 summary 레코드.
+        요소 레코드는 파일 단위로 분석되는 즉시 기록되고, 통계는 증분 계산되므로
+        보고서 전체를 메모리에 만들지 않는다. targets를 생략하면 프로젝트 전체가 대상.
+        """
+        if targets is None:
+            keys = sorted(self.file_entries)
+        else:
+            keys = []
+            for target in targets:
+                target_path = Path(target)
+                if not target_path.exists() and target in self.class_to_file:
+                    target_path = self.class_to_file[target]
+                key = self._file_key(target_path)
+                if key not in self.file_entries:
+                    raise FileNotFoundError(f"Target file not found: {target}")
+                keys.append(key)
+        
+        stats = DependencyReportStats(top_n)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'record': 'header',
+                'analysis_type': 'element-level-dependency',
+                'project_root': str(self.project_root),
+                'files': len(keys),
+                'top_n_limit': top_n
+            }, ensure_ascii=False) + '\n')
             
-            for dep_type, deps in elem_data['dependencies'].items():
-                if deps:
-                    matrix[element_name][dep_type] = {
-                        'count': len(deps),
-                        'dependencies': deps[:10] if len(deps) > 10 else deps,  # 처음 10개만 표시
-                        'truncated': len(deps) > 10
-                    }
+            # 프로세스 풀은 청크 간에 재사용, 보고서 작성 전부터 메모리에 있던 파일 외에는 기록 후 해제
+            # (역참조 색인이 있으면 조회에 필요하므로 유지)
+            resident = set(self._file_element_deps)
+            parallel = self.max_workers > 1 and len(keys) >= PARALLEL_SCAN_MIN_FILES
+            with ProcessPoolExecutor(max_workers=self.max_workers) if parallel else nullcontext() as executor:
+                for offset in range(0, len(keys), STREAM_REPORT_CHUNK):
+                    chunk = keys[offset:offset + STREAM_REPORT_CHUNK]
+                    self.ensure_element_dependencies(chunk, executor)
+                    for key in chunk:
+                        for element_id, elem_dep in self.get_element_dependencies(self.project_root / key).items():
+                            stats.add(elem_dep)
+                            record = elem_dep.to_dict()
+                            record['record'] = 'element'
+                            record['id'] = element_id
+                            record['file'] = key
+                            record['matrix'] = _dependency_matrix_row(record['dependencies'])
+                            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        if key not in resident and not self._usage_index_built:
+                            self._evict_element_dependencies(key)
+            
+            summary = {
+                'record': 'summary',
+                'summary': stats.summary(),
+                'statistics': stats.statistics(),
+                'recommendations': stats.recommendations()
+            }
+            f.write(json.dumps(summary, ensure_ascii=False) + '\n')
         
-        return matrix
+        self._save_cache()
+        return summary
     
     def find_element_usage(self, target_element: str, search_in_file: str = None) -> dict:
-        """특정 요소가 어디서 사용되는지 찾기"""
+        """특정 요소가 어디서 사용되는지 찾기 (역참조 색인 조회)"""
         usage_results = {
             'target_element': target_element,
             'usages': []
@@ -968,82 +1886,93 @@ class ElementLevelDependencyAnalyzer:
         
         print(f"Searching for '{target_element}' usage...")
         
-        search_files = [Path(search_in_file)] if search_in_file else list(self.project_root.rglob("*.java"))
+        search_key = None
+        if search_in_file:
+            search_key = self._file_key(Path(search_in_file))
+            if search_key not in self.file_entries:
+                # 프로젝트 밖의 파일 - 해당 파일만 분석하여 임시 색인으로 조회
+                element_deps = {search_in_file: self.extract_element_level_dependencies(Path(search_in_file))}
+                postings = defaultdict(list)
+                for symbol, posting in self._iter_usage_postings(search_in_file, element_deps[search_in_file]):
+                    postings[symbol].append(posting)
+                usage_results['usages'] = self._collect_usages(target_element, postings, element_deps)
+                print(f"Total unique usages found: {len(usage_results['usages'])}")
+                return usage_results
+        
+        if not self._usage_index_built:
+            self.build_usage_index()
+        else:
+            # 변경되어 무효화된 파일만 다시 분석
+            self.ensure_element_dependencies([key for key in self.file_entries if key not in self._usage_index_symbols])
         
-        for file_path in search_files:
-            try:
-                print(f"  Analyzing file: {file_path}")
-                element_deps = self.extract_element_level_dependencies(file_path)
-                
-                for elem_id, elem_dep in element_deps.items():
-                    # 디버깅: 각 요소가 어떤 의존성을 가지는지 출력
-                    element_info = f"{elem_dep.element.type}:{elem_dep.element.name}"
-                    
-                    # 1. 메서드 이름으로 직접 검색
-                    for dep_type, deps in elem_dep.dependencies.items():
-                        if target_element in deps:
-                            usage_results['usages'].append({
-                                'file': str(file_path),
-                                'using_element': element_info,
-                                'line_range': f"{elem_dep.element.line_start}-{elem_dep.element.line_end}",
-                                'dependency_type': dep_type,
-                                'usage_context': f'found_in_{dep_type}'
-                            })
-                            print(f"    Found in {dep_type}: {element_info}")
-                    
-                    # 2. referenced_elements에서 찾기
-                    target_variations = [
-                        target_element,
-                        f"method:{target_element}",
-                        f"field:{target_element}",
-                        f"class:{target_element}"
-                    ]
-                    
-                    for variation in target_variations:
-                        if variation in elem_dep.referenced_elements:
-                            usage_results['usages'].append({
-                                'file': str(file_path),
-                                'using_element': element_info,
-                                'line_range': f"{elem_dep.element.line_start}-{elem_dep.element.line_end}",
-                                'usage_context': 'referenced_element',
-                                'target_variation': variation
-                            })
-                            print(f"    Found as reference: {variation} in {element_info}")
-                    
-                    # 3. 요소 자체가 찾는 대상인지 확인 (메서드 정의 등)
-                    if elem_dep.element.name == target_element:
-                        usage_results['usages'].append({
-                            'file': str(file_path),
-                            'using_element': element_info,
-                            'line_range': f"{elem_dep.element.line_start}-{elem_dep.element.line_end}",
-                            'usage_context': 'element_definition',
-                            'element_type': elem_dep.element.type
-                        })
-                        print(f"    Found definition: {element_info}")
-            
-            except Exception as e:
-                print(f"Error analyzing {file_path}: {e}")
+        usage_results['usages'] = self._collect_usages(
+            target_element, self.usage_index, self._file_element_deps, search_key=search_key
+        )
+        print(f"Total unique usages found: {len(usage_results['usages'])}")
+        self._save_cache()
         
-        # 중복 제거
-        seen = set()
-        unique_usages = []
-        for usage in usage_results['usages']:
-            usage_key = (usage['file'], usage['using_element'], usage.get('line_range'))
-            if usage_key not in seen:
-                unique_usages.append(usage)
-                seen.add(usage_key)
+        return usage_results
+    
+    def _collect_usages(self, target_element: str, postings: dict, element_deps_by_file: dict,
+                        search_key: str | None = None) -> list[dict]:
+        """역참조 색인 항목을 사용처 결과 형식으로 변환 (요소당 하나, 의존성 > 참조 > 정의 순 우선)"""
+        target_variations = [
+            target_element,
+            f"method:{target_element}",
+            f"field:{target_element}",
+            f"class:{target_element}"
+        ]
         
-        usage_results['usages'] = unique_usages
-        print(f"Total unique usages found: {len(unique_usages)}")
+        usages = {}
+        for variation in target_variations:
+            for key, element_id, line, usage_type in postings.get(variation, ()):
+                if search_key and key != search_key:
+                    continue
+                
+                elem_dep = element_deps_by_file.get(key, {}).get(element_id)
+                if elem_dep is None:
+                    continue
+                element = elem_dep.element
+                
+                usage_file = str(self.project_root / key) if key in self.file_entries else key
+                line_range = f"{element.line_start}-{element.line_end}"
+                usage_key = (usage_file, element_id, line_range)
+                
+                if usage_type == 'referenced_element':
+                    usage = {'usage_context': 'referenced_element', 'target_variation': variation}
+                elif usage_type == 'element_definition':
+                    if variation != target_element:
+                        continue
+                    usage = {'usage_context': 'element_definition', 'element_type': element.type}
+                else:
+                    if variation != target_element:
+                        continue
+                    usage = {'dependency_type': usage_type, 'usage_context': f'found_in_{usage_type}'}
+                
+                priority = {'referenced_element': 1, 'element_definition': 2}.get(usage_type, 0)
+                existing = usages.get(usage_key)
+                if existing and existing[0] <= priority:
+                    continue
+                
+                usages[usage_key] = (priority, {
+                    'file': usage_file,
+                    'using_element': f"{element.type}:{element.name}",
+                    'line_range': line_range,
+                    'line': line,
+                    **usage
+                })
         
-        return usage_results
+        return [usage for _, usage in sorted(
+            usages.values(),
+            key=lambda item: (item[1]['file'], int(item[1]['line_range'].split('-')[0]))
+        )]
 
 
 def main():
     """CLI 인터페이스"""
     parser = argparse.ArgumentParser(description='Element-Level Java Dependency Analyzer')
     parser.add_argument('project_root', help='Java 프로젝트 루트 디렉토리')
-    parser.add_argument('target_file', help='분석할 대상 파일')
+    parser.add_argument('target_file', nargs='?', help='분석할 대상 파일')
     
     parser.add_argument('--report-file', '-r', help='분석 보고서를 저장할 JSON 파일')
     parser.add_argument('--no-cache', action='store_true', help='캐시 사용 안함')
@@ -1055,6 +1984,18 @@ def main():
     parser.add_argument('--min-dependencies', type=int, default=0, 
                        help='최소 의존성 개수 (이 수치 이상의 의존성을 가진 요소만 표시)')
     parser.add_argument('--verbose', '-v', action='store_true', help='상세 출력')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='프로젝트 스캔 병렬 워커 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--index-db', help='SQLite 코드 색인 파일 경로 (지정 시 색인 생성/갱신)')
+    parser.add_argument('--who-calls', help='색인에서 메서드 호출처 조회 (--index-db 필요)')
+    parser.add_argument('--who-references', help='색인에서 클래스 참조처 조회 (--index-db 필요)')
+    parser.add_argument('--call-graph', help='프로젝트 호출 그래프 저장 경로 (.json 또는 .graphml)')
+    parser.add_argument('--map-flow', action='store_true', help='--call-graph 저장 시 Map 흐름 부분 그래프만 저장')
+    parser.add_argument('--stream-report', help='요소 의존성 보고서를 NDJSON으로 스트리밍 저장 (target_file 생략 시 프로젝트 전체)')
+    parser.add_argument('--watch', action='store_true', help='분석 후 파일 변경을 감시하며 색인을 계속 갱신')
+    parser.add_argument('--poll-interval', type=float, default=2.0, help='감시 모드 폴링 간격 (초, watchdog 미설치 시)')
+    parser.add_argument('--source-cache-mb', type=int, default=None,
+                       help='공유 소스 캐시 상주 크기 상한 (MB, 0이면 캐시 안함)')
     
     args = parser.parse_args()
     
@@ -1063,10 +2004,57 @@ def main():
         print(f"Initializing element-level analyzer for project: {args.project_root}")
         analyzer = ElementLevelDependencyAnalyzer(
             project_root=args.project_root,
-            use_cache=not args.no_cache
+            use_cache=not args.no_cache,
+            max_workers=args.workers,
+            index_path=args.index_db,
+            incremental_parse=args.watch,
+            source_cache_bytes=args.source_cache_mb * 1024 * 1024 if args.source_cache_mb is not None else None
         )
         
-        if args.find_usage:
+        if args.index_db:
+            stats = analyzer.build_index()
+            print(f"Index statistics: {stats}")
+        
+        if args.call_graph:
+            from aiconvertor.dependency.call_graph import CallGraph
+            
+            graph = CallGraph.from_analyzer(analyzer)
+            if args.map_flow:
+                graph = graph.map_flow_graph()
+            if args.call_graph.endswith('.graphml'):
+                graph.save_graphml(args.call_graph)
+            else:
+                graph.save_json(args.call_graph)
+            levels = graph.conversion_levels()
+            print(f"Call graph: {len(graph)} methods, {graph.num_edges} calls, {len(levels)} conversion levels")
+            print(f"Call graph saved to: {args.call_graph}")
+            analyzer._save_cache()
+        
+        if args.who_calls or args.who_references:
+            if not analyzer.index:
+                parser.error('--who-calls/--who-references 는 --index-db 가 필요합니다.')
+            
+            if args.who_calls:
+                rows = analyzer.index.who_calls(args.who_calls)
+                print(f"\n{len(rows)} call sites of '{args.who_calls}':")
+            else:
+                rows = analyzer.index.elements_referencing_class(args.who_references)
+                print(f"\n{len(rows)} references to '{args.who_references}':")
+            for row in rows:
+                print(f"  - {row['type']}:{row['name']} in {row['file']} (line {row['line']}, {row['context']})")
+        
+        elif args.stream_report:
+            targets = [args.target_file] if args.target_file else None
+            summary = analyzer.stream_element_report(args.stream_report, targets, args.top_n)
+            print(f"Total elements analyzed: {summary['summary']['total_elements_analyzed']}")
+            print(f"Streaming report saved to: {args.stream_report}")
+        
+        elif not args.target_file:
+            # 호출 그래프 저장/감시 모드는 대상 파일 없이 실행 가능
+            if not (args.call_graph or args.watch):
+                parser.error('target_file 이 필요합니다.')
+        
+        elif args.find_usage:
             # 특정 요소 사용처 찾기
             print(f"\nFinding usage of element: {args.find_usage}")
             usage_results = analyzer.find_element_usage(args.find_usage, args.target_file)
@@ -1140,6 +2128,17 @@ def main():
                     json.dump(report, f, indent=2, ensure_ascii=False)
                 print(f"\nDetailed report saved to: {args.report_file}")
         
+        if args.watch:
+            import time
+            from aiconvertor.dependency.watcher import ProjectWatcher
+            
+            watcher = ProjectWatcher(analyzer, poll_interval=args.poll_interval).start()
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                watcher.stop()
+        
     except Exception as e:
         print(f"Error: {e}")
         import traceback
@@ -1168,3 +2167,9 @@ if __name__ == "__main__":
 #
 # 4. 상세 보고서 저장:
 # poetry run python analyzer.py ../samples/map_example target.java --report-file element_analysis.json --verbose
+#
+# 5. 프로젝트 전체 보고서 스트리밍 (NDJSON):
+# poetry run python analyzer.py ../samples/map_example --stream-report element_analysis.ndjson
+#
+# 6. 감시 모드 (파일 변경 시 색인 증분 갱신):
+# poetry run python analyzer.py ../samples/map_example --index-db .index.db --watch
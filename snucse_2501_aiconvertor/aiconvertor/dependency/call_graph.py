@@ -0,0 +1,418 @@
+import re
+import json
+import xml.etree.ElementTree as ET
+
+from array import array
+from collections import defaultdict, deque
+from pathlib import Path
+
+
+_MAP_TYPE_PATTERN = re.compile(r'\b\w*Map\b')
+
+# 이름만으로 호출 대상을 찾을 때 후보가 이보다 많으면 (get, set 등) 간선을 만들지 않음
+MAX_AMBIGUOUS_TARGETS = 5
+
+# java.lang.Object 메서드 - 이름만으로는 프로젝트 메서드에 연결하지 않음 (Boolean.equals, x.toString 등)
+OBJECT_METHOD_NAMES = frozenset({
+    'equals', 'hashCode', 'toString', 'getClass', 'clone', 'finalize', 'notify', 'notifyAll', 'wait'
+})
+
+_GENERIC_ARGS_PATTERN = re.compile(r'<.*>|\[\]')
+
+
+def is_map_type(type_name: str | None) -> bool:
+    """Map 계열 타입인지 확인 (Map, HashMap<String, Object>, LinkedHashMap 등)"""
+    return bool(type_name) and bool(_MAP_TYPE_PATTERN.search(type_name))
+
+
+def _closure(start: str, relation: dict[str, set[str]]) -> list[str]:
+    """start부터 relation을 따라 도달하는 클래스 (start 포함, 가까운 순서, 순환 상속에도 종료)"""
+    order = [start]
+    seen = {start}
+    for class_name in order:
+        for nxt in sorted(relation.get(class_name, ())):
+            if nxt not in seen:
+                seen.add(nxt)
+                order.append(nxt)
+    return order
+
+
+class CallGraph:
+    """프로젝트 메서드 호출 그래프
+
+    노드는 메서드/생성자 요소, 간선은 caller -> callee.
+    인접 리스트는 CSR(offsets/targets 정수 배열)로 저장하며
+    노드별 Map 흐름 플래그(receives_map/returns_map/declares_map/passes_map)를 함께 가진다.
+    """
+
+    def __init__(self, node_ids: list[str], node_info: list[dict], edges: list[tuple[int, int]]):
+        self.node_ids = node_ids
+        self.node_info = node_info
+        self.node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        unique_edges = sorted(set((src, dst) for src, dst in edges if src != dst))
+        self.offsets, self.targets = self._build_csr(len(node_ids), unique_edges)
+        self.reverse_offsets, self.reverse_targets = self._build_csr(
+            len(node_ids), sorted((dst, src) for src, dst in unique_edges)
+        )
+
+        # Map을 받는 메서드로 Map을 넘길 수 있는 호출이 있으면 passes_map
+        for src, dst in unique_edges:
+            if self.node_info[dst]['receives_map'] and self._holds_map(src):
+                self.node_info[src]['passes_map'] = True
+
+    @staticmethod
+    def _build_csr(num_nodes: int, sorted_edges: list[tuple[int, int]]) -> tuple[array, array]:
+        offsets = array('i', [0] * (num_nodes + 1))
+        targets = array('i', [dst for _, dst in sorted_edges])
+        for src, _ in sorted_edges:
+            offsets[src + 1] += 1
+        for i in range(num_nodes):
+            offsets[i + 1] += offsets[i]
+        return offsets, targets
+
+    @classmethod
+    def from_analyzer(cls, analyzer, max_ambiguous_targets: int = MAX_AMBIGUOUS_TARGETS) -> "CallGraph":
+        """분석기의 요소 의존성으로부터 호출 그래프 구축"""
+        analyzer.ensure_element_dependencies()
+
+        node_ids = []
+        node_info = []
+        calls = []
+        supertypes = defaultdict(set)  # 클래스 -> 상위 클래스/인터페이스
+        subtypes = defaultdict(set)  # 클래스/인터페이스 -> 직접 하위 클래스/구현 클래스
+        for key in sorted(analyzer.file_entries):
+            element_deps = analyzer.get_element_dependencies(analyzer.project_root / key)
+            for class_name, parents in analyzer.extract_supertypes(analyzer.project_root / key).items():
+                for parent in parents:
+                    supertypes[class_name].add(parent)
+                    subtypes[parent].add(class_name)
+            # 클래스별 필드 타입 (수신 객체의 타입 판단용)
+            field_types = defaultdict(dict)
+            for elem_dep in element_deps.values():
+                if elem_dep.element.type == 'field' and elem_dep.element.return_type:
+                    field_types[elem_dep.element.parent][elem_dep.element.name] = elem_dep.element.return_type
+            
+            for element_id, elem_dep in element_deps.items():
+                element = elem_dep.element
+                if element.type not in ('method', 'constructor'):
+                    continue
+
+                node_ids.append(element_id)
+                node_info.append({
+                    'file': key,
+                    'class': element.parent,
+                    'name': element.name,
+                    'type': element.type,
+                    'line_start': element.line_start,
+                    'line_end': element.line_end,
+                    'receives_map': any(is_map_type(param.get('type')) for param in element.parameters),
+                    'returns_map': is_map_type(element.return_type),
+                    'declares_map': any(
+                        is_map_type(local.partition(':')[2])
+                        for local in elem_dep.symbols_of('local_variables')
+                    ),
+                    'passes_map': False
+                })
+
+                # (메서드명, 수신 객체, 수신 객체 타입) - 수신 객체가 없으면 None, 타입을 모르면 None
+                variable_types = dict(field_types[element.parent])
+                variable_types.update(
+                    (param['name'], param['type']) for param in element.parameters
+                    if param.get('name') and param.get('type')
+                )
+                for local in elem_dep.symbols_of('local_variables'):
+                    var_name, _, var_type = local.partition(':')
+                    if var_type:
+                        variable_types[var_name] = var_type
+                call_sites = set()
+                for location in elem_dep.locations_of('method_calls'):
+                    receiver = location.get('target')
+                    receiver_type = None
+                    if receiver and receiver not in ('this', 'super'):
+                        receiver = receiver.removeprefix('this.')
+                        receiver_type = variable_types.get(receiver)
+                        if receiver_type is None and receiver[:1].isupper() and receiver.isidentifier():
+                            receiver_type = receiver  # 정적 호출 (Class.method)
+                    call_sites.add((
+                        location['name'], receiver,
+                        _GENERIC_ARGS_PATTERN.sub('', receiver_type).strip() if receiver_type else None
+                    ))
+                calls.append(call_sites)
+
+        # 호출 대상 후보 검색용
+        #   수신 객체 없음/this: 같은 파일의 같은 클래스 > 이름만 일치
+        #   수신 객체 타입이 프로젝트 클래스: 그 클래스와 하위/구현 클래스의 메서드 (인터페이스 타입이면 구현 클래스 메서드가 호출됨)
+        #     > 상속받은 상위 클래스 메서드 > 이름만 일치
+        #   수신 객체 타입이 프로젝트 밖 클래스 (List, String 등): 간선 없음
+        #   수신 객체 타입을 모름: 이름만 일치
+        # 이름만 일치는 java.lang.Object 메서드명에는 적용하지 않음
+        by_name = defaultdict(list)
+        by_class = defaultdict(list)
+        by_own_class = defaultdict(list)
+        project_classes = set()
+        for i, info in enumerate(node_info):
+            name = info['name']
+            if info['type'] == 'constructor':
+                name = name.removesuffix('(constructor)')
+            by_name[name].append(i)
+            by_class[(info['class'], name)].append(i)
+            by_own_class[(info['file'], info['class'], name)].append(i)
+            project_classes.add(info['class'])
+        project_classes.update(analyzer.class_to_file)
+
+        edges = []
+        for src, call_sites in enumerate(calls):
+            caller = node_info[src]
+            for method_name, receiver, receiver_type in call_sites:
+                if receiver in (None, 'this'):
+                    candidates = by_own_class.get((caller['file'], caller['class'], method_name))
+                elif receiver_type is not None:
+                    receiver_class = receiver_type.rpartition('.')[2]
+                    if receiver_class not in project_classes:
+                        continue
+                    candidates = [
+                        dst for class_name in _closure(receiver_class, subtypes)
+                        for dst in by_class.get((class_name, method_name), ())
+                    ]
+                    if not candidates:
+                        candidates = next(
+                            (by_class[(class_name, method_name)]
+                             for class_name in _closure(receiver_class, supertypes)
+                             if (class_name, method_name) in by_class),
+                            None
+                        )
+                else:
+                    candidates = None
+                if not candidates:
+                    if method_name in OBJECT_METHOD_NAMES:
+                        continue
+                    candidates = by_name.get(method_name, [])
+                if len(candidates) > max_ambiguous_targets:
+                    continue
+                edges.extend((src, dst) for dst in candidates)
+
+        return cls(node_ids, node_info, edges)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def _holds_map(self, node: int) -> bool:
+        info = self.node_info[node]
+        return info['receives_map'] or info['declares_map'] or info['returns_map']
+
+    def callees(self, node: int) -> array:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def callers(self, node: int) -> array:
+        return self.reverse_targets[self.reverse_offsets[node]:self.reverse_offsets[node + 1]]
+
+    def find_nodes(self, name: str, class_name: str | None = None) -> list[int]:
+        """메서드명(및 클래스명)으로 노드 검색"""
+        return [
+            i for i, info in enumerate(self.node_info)
+            if info['name'] == name and (class_name is None or info['class'] == class_name)
+        ]
+
+    def reachable(self, start: int | list[int], reverse: bool = False) -> list[int]:
+        """BFS로 도달 가능한 노드 (reverse=True면 호출자 방향)"""
+        offsets, targets = (self.reverse_offsets, self.reverse_targets) if reverse else (self.offsets, self.targets)
+        starts = [start] if isinstance(start, int) else list(start)
+
+        visited = bytearray(len(self.node_ids))
+        order = []
+        queue = deque(starts)
+        for node in starts:
+            visited[node] = 1
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for i in range(offsets[node], offsets[node + 1]):
+                nxt = targets[i]
+                if not visited[nxt]:
+                    visited[nxt] = 1
+                    queue.append(nxt)
+        return order
+
+    def strongly_connected_components(self) -> list[list[int]]:
+        """반복 Tarjan 알고리즘으로 SCC 계산 (callee 쪽 컴포넌트가 먼저 반환됨)"""
+        num_nodes = len(self.node_ids)
+        index = array('i', [-1] * num_nodes)
+        lowlink = array('i', [0] * num_nodes)
+        on_stack = bytearray(num_nodes)
+        stack = []
+        components = []
+        counter = 0
+
+        for root in range(num_nodes):
+            if index[root] != -1:
+                continue
+
+            work = [(root, self.offsets[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+
+            while work:
+                node, edge = work[-1]
+                if edge < self.offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    nxt = self.targets[edge]
+                    if index[nxt] == -1:
+                        index[nxt] = lowlink[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack[nxt] = 1
+                        work.append((nxt, self.offsets[nxt]))
+                    elif on_stack[nxt]:
+                        lowlink[node] = min(lowlink[node], index[nxt])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def conversion_levels(self) -> list[list[list[int]]]:
+        """변환 순서 레벨 - 각 레벨의 컴포넌트(SCC)들은 서로 독립이므로 병렬 처리 가능
+
+        레벨 0은 다른 컴포넌트를 호출하지 않는 컴포넌트이며,
+        레벨 k의 컴포넌트는 레벨 k 미만의 컴포넌트만 호출한다 (callee 먼저).
+        """
+        components = self.strongly_connected_components()
+        component_of = array('i', [0] * len(self.node_ids))
+        for comp_id, component in enumerate(components):
+            for node in component:
+                component_of[node] = comp_id
+
+        # Tarjan은 callee 컴포넌트를 먼저 완성하므로 반환 순서가 곧 위상 순서
+        levels = array('i', [0] * len(components))
+        for comp_id, component in enumerate(components):
+            level = 0
+            for node in component:
+                for callee in self.callees(node):
+                    callee_comp = component_of[callee]
+                    if callee_comp != comp_id:
+                        level = max(level, levels[callee_comp] + 1)
+            levels[comp_id] = level
+
+        grouped = defaultdict(list)
+        for comp_id, component in enumerate(components):
+            grouped[levels[comp_id]].append(sorted(component))
+        return [grouped[level] for level in sorted(grouped)]
+
+    def topological_order(self) -> list[int]:
+        """callee가 caller보다 먼저 오는 노드 순서 (순환은 같은 컴포넌트로 묶임)"""
+        return [node for level in self.conversion_levels() for component in level for node in component]
+
+    def file_conversion_levels(self) -> list[list[str]]:
+        """파일 단위 변환 레벨 - 호출되는 파일이 먼저, 같은 레벨의 파일은 병렬 변환 가능
+
+        메서드 간선을 파일 간선으로 축약한 그래프에서 SCC/레벨을 계산하므로
+        서로 호출하는 파일들은 같은 레벨에 놓인다.
+        """
+        files = sorted({info['file'] for info in self.node_info})
+        file_index = {file_key: i for i, file_key in enumerate(files)}
+        edges = [
+            (file_index[self.node_info[src]['file']], file_index[self.node_info[dst]['file']])
+            for src in range(len(self.node_ids))
+            for dst in self.callees(src)
+        ]
+        file_graph = CallGraph(
+            files,
+            [
+                {'file': file_key, 'receives_map': False, 'returns_map': False,
+                 'declares_map': False, 'passes_map': False}
+                for file_key in files
+            ],
+            edges
+        )
+        return [
+            sorted(files[node] for component in components for node in component)
+            for components in file_graph.conversion_levels()
+        ]
+
+    def map_flow_graph(self) -> "CallGraph":
+        """Map을 받거나/반환하거나/넘기는 메서드와 그 사이의 Map 전달 간선만 남긴 부분 그래프"""
+        keep = [
+            i for i, info in enumerate(self.node_info)
+            if info['receives_map'] or info['returns_map'] or info['passes_map']
+        ]
+        remap = {node: i for i, node in enumerate(keep)}
+
+        edges = []
+        for src in keep:
+            for dst in self.callees(src):
+                if dst not in remap:
+                    continue
+                # Map 인자 전달 또는 Map 반환값 수신
+                if (self.node_info[dst]['receives_map'] and self._holds_map(src)) or self.node_info[dst]['returns_map']:
+                    edges.append((remap[src], remap[dst]))
+
+        return CallGraph(
+            [self.node_ids[node] for node in keep],
+            [dict(self.node_info[node]) for node in keep],
+            edges
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'nodes': [
+                {'id': node_id, **info}
+                for node_id, info in zip(self.node_ids, self.node_info)
+            ],
+            'edges': [
+                {'source': self.node_ids[src], 'target': self.node_ids[dst]}
+                for src in range(len(self.node_ids))
+                for dst in self.callees(src)
+            ]
+        }
+
+    def save_json(self, output_path: str | Path):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def save_graphml(self, output_path: str | Path):
+        """GraphML로 저장 (yEd, Gephi 등에서 열람)"""
+        root = ET.Element('graphml', xmlns='http://graphml.graphdrawing.org/xmlns')
+        attributes = {
+            'file': 'string', 'class': 'string', 'name': 'string', 'type': 'string',
+            'line_start': 'int', 'line_end': 'int',
+            'receives_map': 'boolean', 'returns_map': 'boolean',
+            'declares_map': 'boolean', 'passes_map': 'boolean'
+        }
+        for attr_name, attr_type in attributes.items():
+            ET.SubElement(root, 'key', {
+                'id': attr_name, 'for': 'node', 'attr.name': attr_name, 'attr.type': attr_type
+            })
+
+        graph = ET.SubElement(root, 'graph', id='calls', edgedefault='directed')
+        for i, info in enumerate(self.node_info):
+            node = ET.SubElement(graph, 'node', id=f"n{i}")
+            for attr_name in attributes:
+                value = info.get(attr_name)
+                data = ET.SubElement(node, 'data', key=attr_name)
+                data.text = str(value).lower() if isinstance(value, bool) else str(value if value is not None else '')
+
+        for src in range(len(self.node_ids)):
+            for dst in self.callees(src):
+                ET.SubElement(graph, 'edge', source=f"n{src}", target=f"n{dst}")
+
+        ET.ElementTree(root).write(output_path, encoding='utf-8', xml_declaration=True)
@@ -0,0 +1,245 @@
+import json
+import sqlite3
+import threading
+
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    package TEXT NOT NULL DEFAULT '',
+    hash TEXT NOT NULL DEFAULT '',
+    indexed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS classes (
+    name TEXT NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_classes_name ON classes(name, file_id);
+CREATE INDEX IF NOT EXISTS idx_classes_file ON classes(file_id);
+
+CREATE TABLE IF NOT EXISTS elements (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    element_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    parent TEXT,
+    line_start INTEGER NOT NULL,
+    line_end INTEGER NOT NULL,
+    return_type TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_elements_file ON elements(file_id, line_start);
+CREATE INDEX IF NOT EXISTS idx_elements_name ON elements(name, type, file_id);
+
+CREATE TABLE IF NOT EXISTS dependencies (
+    element_id INTEGER NOT NULL REFERENCES elements(id) ON DELETE CASCADE,
+    dep_type TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    line INTEGER,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_dependencies_symbol ON dependencies(symbol, dep_type, element_id, line, context);
+CREATE INDEX IF NOT EXISTS idx_dependencies_element ON dependencies(element_id);
+
+CREATE TABLE IF NOT EXISTS element_references (
+    element_id INTEGER NOT NULL REFERENCES elements(id) ON DELETE CASCADE,
+    target TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_references_target ON element_references(target, element_id);
+CREATE INDEX IF NOT EXISTS idx_references_element ON element_references(element_id);
+"""
+
+_USAGE_COLUMNS = """
+    f.path AS file, e.element_key, e.name, e.type, e.parent,
+    e.line_start, e.line_end
+"""
+
+
+class CodeIndexStore:
+    """SQLite 기반 코드 색인 저장소
+
+    파일/클래스/요소/의존성/참조를 테이블로 저장하고 커버링 인덱스로 조회하므로
+    프로젝트 전체를 메모리에 올리지 않고도 사용처 검색이 가능하다.
+    쓰기는 commit() 호출 시점에 한 번에 반영된다.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+    def commit(self):
+        with self._lock:
+            self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def file_hashes(self) -> dict[str, str]:
+        """색인된 파일 경로 -> 내용 해시"""
+        with self._lock:
+            return {row['path']: row['hash'] for row in self.conn.execute("SELECT path, hash FROM files")}
+
+    def upsert_file(self, path: str, package: str, classes: list, content_hash: str):
+        """파일 정보 갱신 - 내용이 바뀌었으므로 기존 요소/의존성은 삭제"""
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+            if row:
+                file_id = row['id']
+                self.conn.execute("DELETE FROM elements WHERE file_id = ?", (file_id,))
+                self.conn.execute("DELETE FROM classes WHERE file_id = ?", (file_id,))
+                self.conn.execute(
+                    "UPDATE files SET package = ?, hash = ?, indexed = 0 WHERE id = ?",
+                    (package, content_hash, file_id)
+                )
+            else:
+                file_id = self.conn.execute(
+                    "INSERT INTO files (path, package, hash) VALUES (?, ?, ?)",
+                    (path, package, content_hash)
+                ).lastrowid
+
+            rows = []
+            for class_name, _ in classes:
+                rows.append((class_name, file_id))
+                if package:
+                    rows.append((f"{package}.{class_name}", file_id))
+            self.conn.executemany("INSERT INTO classes (name, file_id) VALUES (?, ?)", rows)
+
+    def delete_file(self, path: str):
+        with self._lock:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def replace_elements(self, path: str, element_deps: dict):
+        """파일의 요소/의존성/참조를 교체 (element_id는 '<파일>::<요소 키>' 형식)"""
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+            if not row:
+                return
+            file_id = row['id']
+            self.conn.execute("DELETE FROM elements WHERE file_id = ?", (file_id,))
+
+            dependency_rows = []
+            reference_rows = []
+            for element_id, elem_dep in element_deps.items():
+                element = elem_dep.element
+                _, _, element_key = element_id.partition('::')
+                data = json.dumps({'modifiers': list(element.modifiers), 'parameters': list(element.parameters)}, ensure_ascii=False)
+                row_id = self.conn.execute(
+                    "INSERT INTO elements (file_id, element_key, name, type, parent, line_start, line_end, return_type, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (file_id, element_key, element.name, element.type, element.parent,
+                     element.line_start, element.line_end, element.return_type, data)
+                ).lastrowid
+
+                for dep_type, symbol, line, context in elem_dep.iter_occurrences():
+                    dependency_rows.append((row_id, dep_type, symbol, line, context))
+                for target in elem_dep.referenced_elements:
+                    reference_rows.append((row_id, target))
+
+            self.conn.executemany(
+                "INSERT INTO dependencies (element_id, dep_type, symbol, line, context) VALUES (?, ?, ?, ?, ?)",
+                dependency_rows
+            )
+            self.conn.executemany(
+                "INSERT INTO element_references (element_id, target) VALUES (?, ?)",
+                reference_rows
+            )
+            self.conn.execute("UPDATE files SET indexed = 1 WHERE id = ?", (file_id,))
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def unindexed_files(self) -> list[str]:
+        """요소 의존성이 아직 색인되지 않은 파일 목록"""
+        with self._lock:
+            return [row['path'] for row in self.conn.execute("SELECT path FROM files WHERE indexed = 0")]
+
+    def find_class_files(self, class_name: str) -> list[str]:
+        """클래스명(단순/정규화 이름)으로 정의 파일 검색"""
+        return [row['path'] for row in self._query(
+            "SELECT DISTINCT f.path FROM classes c JOIN files f ON f.id = c.file_id WHERE c.name = ?",
+            (class_name,)
+        )]
+
+    def find_dependents(self, symbol: str, dep_type: str | None = None) -> list[dict]:
+        """특정 심볼에 의존하는 요소와 발생 위치"""
+        sql = f"""
+            SELECT {_USAGE_COLUMNS}, d.dep_type, d.line, d.context
+            FROM dependencies d
+            JOIN elements e ON e.id = d.element_id
+            JOIN files f ON f.id = e.file_id
+            WHERE d.symbol = ?
+        """
+        params = (symbol,)
+        if dep_type:
+            sql += " AND d.dep_type = ?"
+            params = (symbol, dep_type)
+        return self._query(sql + " ORDER BY f.path, d.line", params)
+
+    def who_calls(self, method_name: str) -> list[dict]:
+        """메서드를 호출하는 요소 목록"""
+        return self.find_dependents(method_name, 'method_calls')
+
+    def elements_referencing_class(self, class_name: str) -> list[dict]:
+        """클래스를 참조하는 요소 목록"""
+        return self.find_dependents(class_name, 'class_references')
+
+    def find_references(self, target: str) -> list[dict]:
+        """referenced_elements (예: 'method:Util.parse', 'field:Const.KEY') 역조회"""
+        return self._query(f"""
+            SELECT {_USAGE_COLUMNS}, r.target
+            FROM element_references r
+            JOIN elements e ON e.id = r.element_id
+            JOIN files f ON f.id = e.file_id
+            WHERE r.target = ?
+            ORDER BY f.path, e.line_start
+        """, (target,))
+
+    def find_definitions(self, name: str, element_type: str | None = None) -> list[dict]:
+        """이름으로 요소 정의 검색"""
+        sql = f"SELECT {_USAGE_COLUMNS} FROM elements e JOIN files f ON f.id = e.file_id WHERE e.name = ?"
+        params = (name,)
+        if element_type:
+            sql += " AND e.type = ?"
+            params = (name, element_type)
+        return self._query(sql + " ORDER BY f.path, e.line_start", params)
+
+    def elements_in_file(self, path: str) -> list[dict]:
+        """파일에 정의된 요소 목록 (라인 순)"""
+        return self._query(f"""
+            SELECT {_USAGE_COLUMNS}, e.return_type
+            FROM elements e
+            JOIN files f ON f.id = e.file_id
+            WHERE f.path = ?
+            ORDER BY e.line_start
+        """, (path,))
+
+    def statistics(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('files', 'classes', 'elements', 'dependencies', 'element_references')
+            }
@@ -0,0 +1,340 @@
+"""
+MyBatis 매퍼 XML 색인/변환
+statement id, #{KEY} 파라미터, resultType="map" 조회 컬럼 별칭을 Map 키 테이블로 추출 (iterparse 스트리밍)
+VO 필드명이 정해진 뒤에는 매퍼 XML의 Map 타입/키를 VO 타입/필드명으로 치환
+"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+STATEMENT_TAGS = ('select', 'insert', 'update', 'delete', 'sql')
+
+# Map으로 취급하는 parameterType/resultType/type 값 (소문자 비교)
+MAP_TYPES = {
+    'map', 'hashmap', 'linkedhashmap',
+    'java.util.map', 'java.util.hashmap', 'java.util.linkedhashmap'
+}
+
+# jdbcType -> VO 필드 타입
+JDBC_TYPES = {
+    'CHAR': 'String', 'VARCHAR': 'String', 'NVARCHAR': 'String', 'NCHAR': 'String', 'CLOB': 'String',
+    'NUMERIC': 'BigDecimal', 'DECIMAL': 'BigDecimal', 'INTEGER': 'Integer', 'SMALLINT': 'Integer',
+    'BIGINT': 'Long', 'DOUBLE': 'Double', 'FLOAT': 'Double', 'BOOLEAN': 'Boolean', 'BIT': 'Boolean',
+    'DATE': 'Date', 'TIMESTAMP': 'Timestamp'
+}
+
+# #{KEY}, #{KEY,jdbcType=VARCHAR}, #{item.KEY}, ${KEY}
+_PARAMETER_PATTERN = re.compile(r'([#$])\{\s*([A-Za-z_][\w.]*)\s*((?:,[^}]*)?)\}')
+_PARAMETER_OPTION_PATTERN = re.compile(r'(jdbcType|javaType)\s*=\s*([\w.]+)')
+
+# <if test="..."> / <when test="..."> 식의 식별자 (문자열 리터럴 제외)
+# 그룹: 첫 이름, 이어지는 .이름 (프로퍼티/메서드), 호출 괄호 - 파라미터 키는 첫 이름 (FUND_NM.length() -> FUND_NM)
+_TEST_TOKEN_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|(?<![\w.&])([A-Za-z_]\w*)((?:\s*\.\s*\w+)*)(\s*\()?")
+_TEST_KEYWORDS = {'null', 'and', 'or', 'not', 'true', 'false', 'eq', 'neq', 'lt', 'gt', 'lte', 'gte', 'empty'}
+
+_SQL_COMMENT_PATTERN = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_SELECT_KEYWORD_PATTERN = re.compile(r'\bselect\b(\s+distinct\b)?', re.IGNORECASE)
+_SELECT_ALIAS_PATTERN = re.compile(r'(\bAS\s+)?("?)([A-Za-z_][\w$#]*)\2\s*$', re.IGNORECASE)
+_SQL_OPERATORS = '+-*/|,(=<>'
+
+
+@dataclass
+class MapperStatement:
+    """매퍼의 SQL 문 하나"""
+    id: str
+    kind: str  # select/insert/update/delete/sql
+    parameter_type: str | None = None
+    result_type: str | None = None
+    result_map: str | None = None
+    parameter_keys: list[tuple[str, str | None]] = field(default_factory=list)  # (키, 타입 - 모르면 None)
+    result_columns: list[str] = field(default_factory=list)
+
+
+@dataclass
+class MapperIndex:
+    """매퍼 XML 하나의 색인"""
+    namespace: str
+    statements: list[MapperStatement] = field(default_factory=list)
+    result_maps: dict[str, tuple[str | None, list[str]]] = field(default_factory=dict)  # id -> (type, 프로퍼티 목록)
+
+
+def is_map_type(type_name: str | None) -> bool:
+    return bool(type_name) and type_name.strip().lower() in MAP_TYPES
+
+
+def is_mapper_xml(source: bytes) -> bool:
+    """MyBatis 매퍼 XML인지 (DOCTYPE 또는 루트 태그로 판단 - 정확한 확인은 index_mapper_xml)"""
+    return b'mybatis-3-mapper' in source[:2048] or b'<mapper' in source
+
+
+def _parameter_key(expression: str) -> str:
+    """#{item.KEY} 처럼 점으로 이어진 경우 마지막 이름"""
+    return expression.rsplit('.', 1)[-1]
+
+
+def _parameter_type(options: str) -> str | None:
+    java_type = None
+    for name, value in _PARAMETER_OPTION_PATTERN.findall(options or ""):
+        if name == 'javaType':
+            return value.rsplit('.', 1)[-1]
+        java_type = JDBC_TYPES.get(value.upper(), java_type)
+    return java_type
+
+
+def _is_test_key(match: re.Match) -> bool:
+    """test 식 토큰이 파라미터 키인지 (키워드, 점 없는 함수 호출 제외)"""
+    name = match.group(1)
+    return bool(name) and name.lower() not in _TEST_KEYWORDS and not (match.group(3) and not match.group(2))
+
+
+def _test_identifiers(expression: str) -> list[str]:
+    return [match.group(1) for match in _TEST_TOKEN_PATTERN.finditer(expression) if _is_test_key(match)]
+
+
+def select_items(sql: str) -> list[tuple[int, int, str | None, int | None]]:
+    """최상위 SELECT 절 항목의 (시작, 끝, 결과 컬럼명, 별칭 위치)
+
+    결과 컬럼명은 별칭(AS X / 식 X) 또는 컬럼명(T.COL -> COL), * 나 별칭 없는 식은 None
+    별칭 위치는 명시된 별칭의 시작 위치, 컬럼명을 그대로 쓰는 항목은 None
+    """
+    match = _SELECT_KEYWORD_PATTERN.search(sql)
+    if not match:
+        return []
+
+    spans = []
+    depth = 0
+    item_start = position = match.end()
+    while position < len(sql):
+        char = sql[position]
+        if char == "'":
+            closing = sql.find("'", position + 1)
+            position = len(sql) if closing < 0 else closing
+        elif char == '<':
+            # 동적 SQL 태그는 건너뜀
+            closing = sql.find('>', position + 1)
+            position = len(sql) if closing < 0 else closing
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0 and char == ',':
+            spans.append((item_start, position))
+            item_start = position + 1
+        elif (depth == 0 and sql[position:position + 4].lower() == 'from'
+              and not (sql[position - 1].isalnum() or sql[position - 1] == '_')
+              and not (sql[position + 4:position + 5].isalnum() or sql[position + 4:position + 5] == '_')):
+            break
+        position += 1
+    spans.append((item_start, position))
+
+    items = []
+    for start, end in spans:
+        text = _SQL_COMMENT_PATTERN.sub(lambda m: ' ' * len(m.group(0)), sql[start:end])
+        stripped = text.rstrip()
+        end = start + len(stripped)
+        alias = _SELECT_ALIAS_PATTERN.search(stripped) if stripped and not stripped.endswith('*') else None
+        if alias is None:
+            items.append((start, end, None, None))
+            continue
+        before = stripped[:alias.start()].rstrip()
+        if alias.group(1) or (before and stripped[alias.start() - 1].isspace() and before[-1] not in _SQL_OPERATORS):
+            items.append((start, end, alias.group(3), start + alias.start(3)))
+        elif not before or before.endswith('.'):
+            items.append((start, end, alias.group(3), None))
+        else:
+            items.append((start, end, None, None))
+    return items
+
+
+def index_mapper_xml(source: bytes) -> MapperIndex | None:
+    """매퍼 XML 색인 - iterparse로 statement 단위 처리 후 바로 해제 (매퍼가 아니면 None)"""
+    index = None
+    for event, element in ET.iterparse(io.BytesIO(source), events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if index is None:
+                if tag != 'mapper':
+                    return None
+                index = MapperIndex(namespace=element.get('namespace', ''))
+            continue
+
+        if tag in STATEMENT_TAGS:
+            statement = MapperStatement(
+                id=element.get('id', ''),
+                kind=tag,
+                parameter_type=element.get('parameterType'),
+                result_type=element.get('resultType'),
+                result_map=element.get('resultMap')
+            )
+            text = ''.join(element.itertext())
+            seen = set()
+            for _, expression, options in _PARAMETER_PATTERN.findall(text):
+                key = _parameter_key(expression)
+                if key not in seen:
+                    seen.add(key)
+                    statement.parameter_keys.append((key, _parameter_type(options)))
+            for child in element.iter():
+                for key in _test_identifiers(child.get('test', '')):
+                    if key not in seen:
+                        seen.add(key)
+                        statement.parameter_keys.append((key, None))
+            if tag == 'select':
+                statement.result_columns = [alias for _, _, alias, _ in select_items(text) if alias]
+            index.statements.append(statement)
+            element.clear()
+        elif tag == 'resultMap':
+            properties = [
+                child.get('property') for child in element
+                if child.tag in ('id', 'result') and child.get('property')
+            ]
+            index.result_maps[element.get('id', '')] = (element.get('type'), properties)
+            element.clear()
+    return index
+
+
+def harvest_mapper_keys(source: bytes) -> tuple[list[str], dict[str, dict]]:
+    """매퍼 XML의 키 테이블 - harvest_map_keys 와 같은 형태 (라인 대신 'statements' 에 소속 statement 기록)
+
+    파라미터 키는 get(매퍼가 Map에서 읽음), Map 타입 조회 결과 컬럼/프로퍼티는 put(MyBatis가 Map에 넣음)으로 기록
+    (parameterType 이 Map이 아닌 statement 의 파라미터는 VO/단일 값이므로 제외, 타입을 모르면 키 이름으로 추정되도록 비워 둠)
+    """
+    table: dict[str, dict] = {}
+    index = index_mapper_xml(source)
+    if index is None:
+        return [], table
+
+    def add(key: str, operation: str, java_type: str | None, statement_id: str, example: str):
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = {'types': [], 'ops': [], 'count': 0, 'examples': [], 'lines': [], 'statements': []}
+        if java_type and java_type not in entry['types']:
+            entry['types'].append(java_type)
+        if operation not in entry['ops']:
+            entry['ops'].append(operation)
+        entry['count'] += 1
+        qualified = f"{index.namespace}.{statement_id}" if index.namespace else statement_id
+        if qualified not in entry['statements']:
+            entry['statements'].append(qualified)
+        if len(entry['examples']) < 3:
+            entry['examples'].append(example)
+
+    map_result_maps = {
+        result_map_id for result_map_id, (type_name, _) in index.result_maps.items() if is_map_type(type_name)
+    }
+    for statement in index.statements:
+        for key, java_type in statement.parameter_keys if is_map_type(statement.parameter_type) else ():
+            add(key, 'get', java_type, statement.id, f'<{statement.kind} id="{statement.id}"> #{{{key}}}')
+        if is_map_type(statement.result_type):
+            for column in statement.result_columns:
+                add(column, 'put', None, statement.id, f'<select id="{statement.id}" resultType="map"> {column}')
+        elif statement.result_map in map_result_maps:
+            for prop in index.result_maps[statement.result_map][1]:
+                add(prop, 'put', None, statement.id, f'<resultMap id="{statement.result_map}"> {prop}')
+    return [], table
+
+
+# 변환 대상 블록 - statement 와 resultMap (자기 닫힘 포함)
+_STATEMENT_BLOCK_PATTERN = re.compile(
+    r'<(select|insert|update|delete|sql)\b([^>]*?)(/>|>(.*?)</\1\s*>)', re.DOTALL
+)
+_RESULT_MAP_BLOCK_PATTERN = re.compile(r'<(resultMap)\b([^>]*?)(/>|>(.*?)</\1\s*>)', re.DOTALL)
+_ID_ATTRIBUTE_PATTERN = re.compile(r'\bid\s*=\s*"([^"]*)"')
+_TYPE_ATTRIBUTE_PATTERN = re.compile(r'\b(parameterType|resultType|type)(\s*=\s*)"([^"]*)"')
+_PROPERTY_ATTRIBUTE_PATTERN = re.compile(r'\bproperty(\s*=\s*)"([^"]*)"')
+_TEST_ATTRIBUTE_PATTERN = re.compile(r'\btest(\s*=\s*)"([^"]*)"')
+
+
+def convert_mapper_xml(content: str, field_name: Callable[[str], str | None],
+                       vo_type: Callable[[list[str]], str | None]) -> str:
+    """매퍼 XML의 Map 타입/키를 VO 타입/필드명으로 치환 (주석, 서식 유지)
+
+    Args:
+        content: 매퍼 XML
+        field_name: 키 -> VO 필드명 (모르는 키는 None)
+        vo_type: 블록에서 쓰는 키 목록 -> VO 클래스 전체 이름 (None이면 타입 유지)
+
+    resultType="map" 조회는 VO로 바꾸면서 컬럼에 필드명 별칭을 붙임 (DEPTNO -> DEPTNO AS deptno)
+    프로퍼티가 없는 Map 타입 resultMap 은 id 가 같은 statement 의 VO 타입으로 바꿈
+    """
+    statement_types: dict[str, str] = {}
+
+    def convert_block(match: re.Match) -> str:
+        tag, attributes, body = match.group(1), match.group(2), match.group(4) or ""
+        types = {name: value for name, _, value in _TYPE_ATTRIBUTE_PATTERN.findall(attributes)}
+        block_id = _ID_ATTRIBUTE_PATTERN.search(attributes)
+        block_id = block_id.group(1) if block_id else None
+
+        # 이 블록에서 쓰는 키 - Map 파라미터/Map resultMap 프로퍼티/Map 조회 컬럼만 치환 대상
+        # (<sql> 조각은 parameterType 이 없으므로 포함하는 statement 와 같이 Map 파라미터로 간주)
+        map_parameter = is_map_type(types.get('parameterType')) or tag == 'sql'
+        map_result = tag == 'select' and is_map_type(types.get('resultType'))
+        keys = []
+        if map_parameter:
+            keys += [_parameter_key(expression) for _, expression, _ in _PARAMETER_PATTERN.findall(body)]
+            keys += [key for _, test in _TEST_ATTRIBUTE_PATTERN.findall(body) for key in _test_identifiers(test)]
+        if tag == 'resultMap' and is_map_type(types.get('type')):
+            keys += [prop for _, prop in _PROPERTY_ATTRIBUTE_PATTERN.findall(body)]
+        items = select_items(body) if map_result else []
+        keys += [alias for _, _, alias, _ in items if alias]
+        fields = {key: field_name(key) for key in dict.fromkeys(keys)}
+        fields = {key: name for key, name in fields.items() if name}
+
+        if fields:
+            target_type = vo_type(list(fields))
+        elif tag == 'resultMap' and is_map_type(types.get('type')):
+            target_type = statement_types.get(block_id)
+        else:
+            target_type = None
+        if not target_type and not fields:
+            return match.group(0)
+        if tag != 'resultMap' and target_type and block_id:
+            statement_types[block_id] = target_type
+
+        if target_type:
+            attributes = _TYPE_ATTRIBUTE_PATTERN.sub(
+                lambda m: f'{m.group(1)}{m.group(2)}"{target_type}"' if is_map_type(m.group(3)) else m.group(0),
+                attributes
+            )
+
+        if map_result and target_type:
+            # 뒤에서부터 치환해야 앞 항목의 위치가 유지됨
+            for start, end, alias, alias_start in reversed(items):
+                name = fields.get(alias) if alias else None
+                if not name or name == alias:
+                    continue
+                if alias_start is not None:
+                    body = body[:alias_start] + name + body[alias_start + len(alias):]
+                else:
+                    body = body[:end] + f" AS {name}" + body[end:]
+
+        def rename(expression: str) -> str:
+            # item.KEY 처럼 점으로 이어진 경우 마지막 이름만 치환
+            prefix, dot, last = expression.rpartition('.')
+            return prefix + dot + fields.get(last, last)
+
+        if map_parameter:
+            body = _PARAMETER_PATTERN.sub(lambda m: f"{m.group(1)}{{{rename(m.group(2))}{m.group(3)}}}", body)
+            body = _TEST_ATTRIBUTE_PATTERN.sub(
+                lambda m: f'test{m.group(1)}"' + _TEST_TOKEN_PATTERN.sub(
+                    # 첫 이름(파라미터 키)만 치환 - 뒤의 프로퍼티/메서드 이름은 그대로
+                    lambda t: fields.get(t.group(1), t.group(1)) + t.group(0)[len(t.group(1)):]
+                    if _is_test_key(t) else t.group(0),
+                    m.group(2)
+                ) + '"',
+                body
+            )
+        if tag == 'resultMap':
+            body = _PROPERTY_ATTRIBUTE_PATTERN.sub(lambda m: f'property{m.group(1)}"{rename(m.group(2))}"', body)
+
+        if match.group(4) is None:
+            return f"<{tag}{attributes}{match.group(3)}"
+        return f"<{tag}{attributes}>{body}</{tag}>"
+
+    # statement 를 먼저 변환해야 같은 id 의 빈 resultMap 타입을 정할 수 있음
+    content = _STATEMENT_BLOCK_PATTERN.sub(convert_block, content)
+    return _RESULT_MAP_BLOCK_PATTERN.sub(convert_block, content)
@@ -0,0 +1,81 @@
+"""
+프로세스 전역 소스 파일 캐시
+의존성 분석기와 VO 생성기가 같은 파일을 각자 다시 읽지 않도록 내용을 공유 (mtime/size로 검증)
+"""
+
+import os
+import threading
+
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # 상주 파일 내용 기본 상한 (32MB)
+
+
+class SourceCache:
+    """파일 내용 공유 캐시 (총 크기 제한 LRU)"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[int, int, bytes]] = OrderedDict()  # 경로 -> (mtime_ns, size, 내용)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_path: str | Path) -> str:
+        """상대/절대 경로 표기가 달라도 같은 파일은 같은 키"""
+        return os.fspath(Path(file_path).resolve())
+
+    def read_bytes(self, file_path: str | Path) -> bytes:
+        path = self._key(file_path)
+        stat = os.stat(path)
+
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._entries.move_to_end(path)
+                return cached[2]
+
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._total -= len(previous[2])
+            if len(content) <= self.max_bytes:
+                self._entries[path] = (stat.st_mtime_ns, stat.st_size, content)
+                self._total += len(content)
+                self._evict()
+        return content
+
+    def set_max_bytes(self, max_bytes: int):
+        """상주 크기 상한 변경 (줄이면 오래된 항목부터 즉시 제거)"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        while self._total > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._total -= len(evicted)
+
+    def read_text(self, file_path: str | Path, encoding: str = 'utf-8') -> str:
+        return self.read_bytes(file_path).decode(encoding)
+
+    def invalidate(self, file_path: str | Path | None = None):
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._total = 0
+                return
+            previous = self._entries.pop(self._key(file_path), None)
+            if previous is not None:
+                self._total -= len(previous[2])
+
+
+_source_cache = SourceCache()
+
+
+def get_source_cache() -> SourceCache:
+    return _source_cache
@@ -0,0 +1,137 @@
+"""
+Map 키 클러스터링
+메서드(또는 파일) 단위로 함께 사용되는 키를 묶어 하나의 통합 VO 대신 여러 VO로 분할
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+
+# VO 이름을 만들 때 클래스명에서 제거하는 접미사 (긴 것부터)
+_CLASS_SUFFIXES = ('ServiceImpl', 'Controller', 'Repository', 'Service', 'Mapper', 'Helper', 'Impl', 'DAO', 'Dao', 'Util')
+
+
+@dataclass
+class KeyGroup:
+    """함께 사용되는 키 묶음 (메서드 하나 또는 파일 하나)"""
+    label: str  # 소속 클래스명 (VO 이름 추정용)
+    keys: set[str] = field(default_factory=set)
+
+
+@dataclass
+class VOCluster:
+    """VO 하나에 들어갈 키 묶음"""
+    class_name: str
+    keys: list[str]
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: str, b: str):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def _vo_name_stem(label: str) -> str:
+    for suffix in _CLASS_SUFFIXES:
+        if label.endswith(suffix) and len(label) > len(suffix):
+            return label[:-len(suffix)]
+    return label
+
+
+def cluster_map_keys(groups: list[KeyGroup], key_order: list[str], base_class_name: str,
+                     min_similarity: float = 0.5, hub_ratio: float = 0.5,
+                     min_cluster_size: int = 2) -> list[VOCluster]:
+    """키 동시 사용 그래프로 VO 클러스터 구성
+
+    두 키가 함께 나타난 그룹 수 / 둘 중 적게 나타난 키의 그룹 수 가 min_similarity 이상이면 같은 VO로 묶는다.
+    대부분의 그룹에 등장하는 공통 키(hub)는 묶음 기준에서 제외한 뒤 가장 자주 함께 쓰인 VO에 배정하고,
+    어느 VO에도 속하지 않는 키는 base_class_name VO에 모은다.
+
+    Args:
+        groups: 메서드/파일 단위 키 묶음
+        key_order: 전체 키 (VO 내부 필드 순서 기준)
+        base_class_name: 남은 키를 모을 기본 VO 이름
+    """
+    groups = [group for group in groups if group.keys]
+    frequency = Counter(key for group in groups for key in group.keys)
+    hubs = set()
+    if len(groups) >= 4:
+        hubs = {key for key, count in frequency.items() if count / len(groups) > hub_ratio}
+
+    # 허브를 제외한 키 쌍의 동시 사용 횟수
+    pair_counts: Counter = Counter()
+    for group in groups:
+        keys = sorted(group.keys - hubs)
+        for i, a in enumerate(keys):
+            for b in keys[i + 1:]:
+                pair_counts[(a, b)] += 1
+
+    union_find = _UnionFind()
+    for (a, b), count in pair_counts.items():
+        if count / min(frequency[a], frequency[b]) >= min_similarity:
+            union_find.union(a, b)
+
+    components: dict[str, set[str]] = defaultdict(set)
+    for key in frequency:
+        if key not in hubs:
+            components[union_find.find(key)].add(key)
+    clusters = [keys for keys in components.values() if len(keys) >= min_cluster_size]
+    key_cluster = {key: index for index, keys in enumerate(clusters) for key in keys}
+
+    # 허브 키는 가장 자주 함께 쓰인 클러스터로
+    for hub in sorted(hubs):
+        votes = Counter(
+            key_cluster[key]
+            for group in groups if hub in group.keys
+            for key in group.keys if key in key_cluster
+        )
+        if votes:
+            index = votes.most_common(1)[0][0]
+            clusters[index].add(hub)
+            key_cluster[hub] = index
+
+    # 클러스터 이름: 키가 가장 많이 쓰인 클래스명 기준
+    label_votes = [Counter() for _ in clusters]
+    for group in groups:
+        for key in group.keys:
+            if key in key_cluster:
+                label_votes[key_cluster[key]][group.label] += 1
+
+    order = {key: index for index, key in enumerate(key_order)}
+    used_names = {base_class_name}
+    suffix = next((s for s in ('VO', 'Vo', 'DTO', 'Dto') if base_class_name.endswith(s)), 'VO')
+    result = []
+    for index, keys in enumerate(clusters):
+        stem = _vo_name_stem(label_votes[index].most_common(1)[0][0]) if label_votes[index] else ""
+        name = f"{stem}{suffix}" if stem else f"{base_class_name}{index + 1}"
+        candidate, counter = name, 1
+        while candidate in used_names:
+            counter += 1
+            candidate = f"{name}{counter}"
+        used_names.add(candidate)
+        result.append(VOCluster(candidate, sorted(keys, key=lambda k: order.get(k, len(order)))))
+
+    # 남은 키는 기본 VO로
+    leftover = [key for key in key_order if key not in key_cluster]
+    if leftover or not result:
+        result.append(VOCluster(base_class_name, leftover))
+
+    # 나눌 필요가 없으면 기본 VO 하나
+    if len(result) == 1:
+        result[0].class_name = base_class_name
+
+    result.sort(key=lambda cluster: min((order.get(k, len(order)) for k in cluster.keys), default=len(order)))
+    return result
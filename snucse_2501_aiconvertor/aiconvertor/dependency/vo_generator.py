@@ -5,17 +5,242 @@ Map<String, Object> to VO 변환기
 """
 
 import argparse
+import bisect
+import heapq
+import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, List, Set, Tuple, Any, Optional
 from dataclasses import dataclass, asdict
 import shutil
 from datetime import datetime
 
 from pydantic import BaseModel, Field, model_validator
 
-from .analyzer import ElementLevelDependencyAnalyzer
+from .analyzer import ElementLevelDependencyAnalyzer, PARALLEL_SCAN_MIN_FILES, _content_hash
+from .mybatis_indexer import harvest_mapper_keys, is_mapper_xml
+from .source_cache import get_source_cache
+from .vo_clustering import KeyGroup, VOCluster, cluster_map_keys
+from .vo_types import (
+    MAP_UTIL_TYPES, DeclaredTypeIndex, boxed_type, is_resolvable, resolve_expression_type, vo_field_type
+)
+
+
+# Map 변수 선언 (Map<String, Object> x / Map x)
+_MAP_VARIABLE_PATTERN = re.compile(r'Map<\s*String\s*,\s*Object\s*>\s+(\w+)|Map\s+(\w+)', re.IGNORECASE)
+
+# Map 키 접근 - get/containsKey/remove("key"), put("key", 값), MapDataUtil.getXxx/setXxx(map, "key"[, 값]) 를 한 번에 매칭
+# (값 표현식은 괄호 짝을 맞춰 _argument_end 로 잘라냄)
+_MAP_ACCESS_PATTERN = re.compile(
+    r'\.(get|containsKey|remove)\s*\(\s*["\']([^"\']+)["\']\s*\)'
+    r'|\.put\s*\(\s*["\']([^"\']+)["\']\s*,'
+    r'|\bMapDataUtil\.(get|set)(\w*)\s*\(\s*[\w.]+\s*,\s*"([^"]+)"\s*([,)])'
+)
+
+# 형변환 - (String) map.get("KEY") 처럼 get 앞의 캐스트, (Integer) value 처럼 값 앞의 캐스트
+_CAST_TYPE = r'\(\s*([A-Z][\w.]*(?:<[^()]*>)?|int|long|double|float|boolean|char|short|byte)\s*\)'
+_CAST_BEFORE_GET_PATTERN = re.compile(_CAST_TYPE + r'\s*[\w.]+$')
+_CAST_EXPRESSION_PATTERN = re.compile(_CAST_TYPE + r'\s*[\w"(]')
+
+# 값 표현식으로 쓰인 MapDataUtil 조회 - MapDataUtil.getString(...) 의 String
+_MAP_UTIL_GETTER_PATTERN = re.compile(r'MapDataUtil\.get(\w+)\s*\(')
+
+# 키별로 보관하는 미해석 값 표현식 수 (분석기 선언 타입으로 해석)
+_MAX_VALUE_REFS = 5
+
+# 문자열 리터럴 - 변환 단위가 쓰는 VO 키 조회용 (MapDataUtil.getString(map, "KEY") 같은 간접 접근 포함)
+_STRING_LITERAL_PATTERN = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+
+_INTEGER_PATTERN = re.compile(r'^\d+$')
+_LONG_PATTERN = re.compile(r'^\d+L$', re.IGNORECASE)
+_DOUBLE_PATTERN = re.compile(r'^\d*\.\d+$')
+
+
+def infer_value_type(expr: str) -> str:
+    """표현식에서 타입 추론"""
+    if not expr:
+        return "Object"
+        
+    expr = expr.strip()
+    
+    if expr.lower() == 'null':
+        return "Object"
+    
+    if expr == 'true' or expr == 'false':
+        return "Boolean"
+    
+    cast = _CAST_EXPRESSION_PATTERN.match(expr)
+    if cast:
+        return boxed_type(cast.group(1))
+    
+    util_getter = _MAP_UTIL_GETTER_PATTERN.match(expr)
+    if util_getter and util_getter.group(1) in MAP_UTIL_TYPES:
+        return MAP_UTIL_TYPES[util_getter.group(1)]
+    
+    if expr.startswith('String.valueOf(') or expr.endswith('.toString()'):
+        return "String"
+    
+    if _INTEGER_PATTERN.match(expr):
+        return "Integer"
+    
+    if _LONG_PATTERN.match(expr):
+        return "Long"
+    
+    if _DOUBLE_PATTERN.match(expr):
+        return "Double"
+    
+    if (expr.startswith('"') and expr.endswith('"')) or (expr.startswith("'") and expr.endswith("'")):
+        return "String"
+    
+    if expr.startswith('new '):
+        if 'Date' in expr:
+            return "Date"
+        elif 'String' in expr:
+            return "String"
+        elif 'Integer' in expr:
+            return "Integer"
+    
+    return "Object"
+
+
+def _argument_end(content: str, start: int) -> int:
+    """start 에서 시작하는 호출 인자 하나의 끝 위치 (같은 깊이의 ',' 또는 ')' 위치)"""
+    depth = 0
+    quote = None
+    position = start
+    while position < len(content):
+        char = content[position]
+        if quote:
+            if char == '\\':
+                position += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([{':
+            depth += 1
+        elif char in ')]}':
+            if depth == 0:
+                return position
+            depth -= 1
+        elif (char == ',' and depth == 0) or char == ';':
+            return position
+        position += 1
+    return position
+
+
+def harvest_map_keys(content: str) -> tuple[list[str], dict[str, dict]]:
+    """소스 전체를 한 번 훑어 Map 변수와 키별 사용 정보 추출
+    
+    Returns:
+        (Map 변수 목록, 키 -> {'types', 'ops', 'count', 'examples', 'lines'[, 'refs']}) - 파일 단위 키 테이블
+        refs 는 타입을 정하지 못한 값 표현식의 [라인, 표현식] 목록
+    """
+    map_variables = list(dict.fromkeys(
+        match.group(1) or match.group(2) for match in _MAP_VARIABLE_PATTERN.finditer(content)
+    ))
+    
+    table: dict[str, dict] = {}
+    line, position = 1, 0
+    for match in _MAP_ACCESS_PATTERN.finditer(content):
+        operation, key, put_key, util_operation, util_suffix, util_key, util_end = match.groups()
+        value_expr = None
+        if put_key is not None:
+            operation, key = "put", put_key
+            value_expr = content[match.end():_argument_end(content, match.end())]
+            value_type = infer_value_type(value_expr)
+        elif util_key is not None:
+            key = util_key
+            operation = "get" if util_operation == "get" else "put"
+            value_type = MAP_UTIL_TYPES.get(util_suffix, "Object")
+            if operation == "put" and value_type == "Object" and util_end == ',':
+                value_expr = content[match.end():_argument_end(content, match.end())]
+                value_type = infer_value_type(value_expr)
+        else:
+            value_type = "Object"
+            if operation == "get":
+                # (String) map.get("KEY") - 캐스트 타입을 값 타입으로
+                line_start = content.rfind('\n', 0, match.start()) + 1
+                cast = _CAST_BEFORE_GET_PATTERN.search(content, line_start, match.start())
+                if cast:
+                    value_type = boxed_type(cast.group(1))
+        
+        if not key or key.isspace():
+            continue
+        
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = {'types': [], 'ops': [], 'count': 0, 'examples': [], 'lines': []}
+        if value_type not in entry['types']:
+            entry['types'].append(value_type)
+        if operation not in entry['ops']:
+            entry['ops'].append(operation)
+        entry['count'] += 1
+        
+        # 매치는 앞에서부터 나오므로 라인 번호는 이어서 계산
+        line += content.count('\n', position, match.start())
+        position = match.start()
+        if not entry['lines'] or entry['lines'][-1] != line:
+            entry['lines'].append(line)
+        
+        # 변수/메서드 호출 값은 분석기의 선언 타입으로 나중에 해석
+        if value_type == "Object" and value_expr and is_resolvable(value_expr):
+            refs = entry.setdefault('refs', [])
+            if len(refs) < _MAX_VALUE_REFS:
+                refs.append([line, value_expr.strip()])
+        
+        if len(entry['examples']) < 3:
+            line_start = content.rfind('\n', 0, match.start()) + 1
+            line_end = content.find('\n', match.start())
+            entry['examples'].append(content[line_start:line_end if line_end >= 0 else len(content)].strip())
+    
+    return map_variables, table
+
+
+VO_KEYS_CACHE_VERSION = 4
+
+# 생성된 VO 클래스 주석의 표식 (이미 생성된 VO 파일 식별용)
+_GENERATED_VO_MARKER = "자동 생성일:"
+
+# 값 타입이 섞였을 때 컬렉션으로 합치는 타입
+_LIST_TYPES = {'List', 'ArrayList', 'LinkedList', 'Vector'}
+_COLLECTION_TYPES = _LIST_TYPES | {'Collection', 'Set', 'HashSet', 'LinkedHashSet', 'TreeSet'}
+
+# 매퍼 XML 탐색 시 건너뛰는 디렉토리 (빌드 산출물의 복사본 제외)
+_MAPPER_SKIP_DIRS = {'target', 'build', 'bin', 'out', 'node_modules', '.git'}
+
+
+def _key_contribution(entry: dict | None):
+    """VO 필드에 영향을 주는 키 기여분 (예시/라인 위치 변화는 무시)"""
+    if entry is None:
+        return None
+    return entry['types'], entry['ops'], entry['count']
+
+
+def _harvest_source(file_path: str, source_code: bytes, known_hash: str | None):
+    """(경로, 내용 해시, Map 변수, 키 테이블) - 내용이 known_hash와 같으면 변수/테이블은 None"""
+    content_hash = _content_hash(source_code)
+    if known_hash and content_hash == known_hash:
+        return file_path, content_hash, None, None
+    if file_path.endswith('.xml'):
+        return (file_path, content_hash, *harvest_mapper_keys(source_code))
+    if _GENERATED_VO_MARKER.encode('utf-8') in source_code:
+        # 이전에 생성된 VO 는 모든 키를 다루므로 수집하면 실제 코드에서 삭제된 키가 남음
+        return file_path, content_hash, [], {}
+    return (file_path, content_hash, *harvest_map_keys(source_code.decode('utf-8')))
+
+
+def _harvest_file_worker(task: tuple[str, str | None]):
+    """프로세스 풀 워커: 파일 하나의 Map 키 테이블 반환 (실패 시 해시가 빈 문자열)"""
+    file_path, known_hash = task
+    try:
+        with open(file_path, 'rb') as f:
+            return _harvest_source(file_path, f.read(), known_hash)
+    except Exception as e:
+        print(f"  오류: {file_path}: {e}")
+        return file_path, "", None, None
 
 
 class VOGeneratorConfig(BaseModel):
@@ -27,6 +252,8 @@ class VOGeneratorConfig(BaseModel):
     report_file: Optional[str] = Field(default=None, description='보고서 파일명')
     vo_file: Optional[str] = Field(default=None, description='VO 클래스 파일명')
     verbose: bool = Field(default=False, description='상세 출력 모드')
+    no_cache: bool = Field(default=False, description='파일별 키 캐시 사용 안함')
+    multi_vo: bool = Field(default=False, description='키 동시 사용 기준으로 VO 분할')
 
     @model_validator(mode='after')
     def validate_project_root(self):
@@ -62,181 +289,264 @@ class VOField:
     original_key: str
 
 class VOGenerator:
-    def __init__(self, project_root: str, vo_package: str = "com.example.vo", vo_class_name: str = "UnifiedDataVO"):
+    def __init__(self, project_root: str, vo_package: str = "com.example.vo", vo_class_name: str = "UnifiedDataVO",
+                 analyzer: Optional[ElementLevelDependencyAnalyzer] = None, use_cache: bool = True,
+                 verbose: bool = False):
         self.project_root = Path(project_root)
         self.vo_package = vo_package
         self.vo_class_name = vo_class_name
-        self.analyzer = ElementLevelDependencyAnalyzer(project_root, use_cache=True)
+        # 감시 모드 서버는 이미 색인된 분석기를 넘겨 초기 스캔을 생략, 아니면 실제로 필요할 때 생성
+        self._analyzer = analyzer
         
         # 분석 결과
         self.map_keys: Dict[str, MapKeyAnalysis] = {}
         self.map_variables: Set[str] = set()
         self.java_files: List[Path] = []
+        self.mapper_files: List[Path] = []
         self.vo_fields: List[VOField] = []
-        
+        self.vo_clusters: List[VOCluster] = []
+        self._key_clusters: Dict[str, VOCluster] = {}
+        self.verbose = verbose
+        
+        # 렌더링 결과 (필드 구성이 바뀌면 초기화)
+        self._rendered: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._summary_report: Optional[str] = None
+        self._fields_by_key: Optional[Dict[str, VOField]] = None
+        
+        # 파일별 키 기여분 캐시 - 다음 실행에서는 내용이 바뀐 파일만 다시 수집
+        self.use_cache = use_cache
+        self.cache_file = self.project_root / ".vo_keys_cache.json"
+        self.file_keys: Dict[str, dict] = {}  # 상대 경로 -> {'mtime', 'size', 'hash', 'map_variables', 'table'}
+        self.field_names: Dict[str, str] = {}  # 원본 키 -> 필드명 (이전 실행의 필드 순서/이름 유지)
+        self.changed_keys: List[str] = []
+        
+        # 값 타입 해석용 파일별 선언 타입 색인 (파서 초기화 실패 시 해석 생략)
+        # 프로젝트 스캔 없이 해당 파일만 파싱하고, 다른 클래스는 파일명(공개 클래스명)으로 찾음
+        self._declared_types: Dict[str, Optional[DeclaredTypeIndex]] = {}
+        self._type_parser: Optional[ElementLevelDependencyAnalyzer] = None
+        self._class_files: Optional[Dict[str, Optional[Path]]] = None
+        self._resolve_types = True
+        
+    @property
+    def analyzer(self) -> ElementLevelDependencyAnalyzer:
+        """요소 의존성 분석기 (최초 접근 시 프로젝트 스캔)"""
+        if self._analyzer is None:
+            self._analyzer = ElementLevelDependencyAnalyzer(str(self.project_root), use_cache=True)
+        return self._analyzer
+    
+    def _list_java_files(self) -> List[Path]:
+        """분석 대상 Java 파일 - 이미 스캔된 분석기가 있으면 그 파일 목록을 재사용"""
+        if self._analyzer is not None:
+            return [self.project_root / key for key in sorted(self._analyzer.file_entries)]
+        return sorted(self.project_root.rglob("*.java"))
+    
+    def _list_mapper_files(self) -> List[Path]:
+        """MyBatis 매퍼 XML 목록 (빌드 산출물 디렉토리 제외)"""
+        mapper_files = []
+        for xml_file in sorted(self.project_root.rglob("*.xml")):
+            if _MAPPER_SKIP_DIRS.intersection(xml_file.relative_to(self.project_root).parts[:-1]):
+                continue
+            try:
+                if is_mapper_xml(get_source_cache().read_bytes(str(xml_file))):
+                    mapper_files.append(xml_file)
+            except OSError:
+                continue
+        return mapper_files
+    
     def analyze_all_maps(self) -> Dict[str, Any]:
         """프로젝트 전체에서 Map 사용 패턴 분석"""
         print("=" * 60)
         print("1단계: Map 사용 패턴 분석")
         print("=" * 60)
         
-        self.java_files = list(self.project_root.rglob("*.java"))
-        print(f"분석할 Java 파일: {len(self.java_files)}개")
+        self.java_files = self._list_java_files()
+        self.mapper_files = self._list_mapper_files()
+        print(f"분석할 Java 파일: {len(self.java_files)}개, 매퍼 XML: {len(self.mapper_files)}개")
+        
+        cached = self._load_keys_cache()
+        
+        # mtime/size가 캐시와 다른 파일만 다시 수집
+        stale: Dict[str, tuple] = {}
+        for source_file in self.java_files + self.mapper_files:
+            rel = source_file.relative_to(self.project_root).as_posix()
+            stat = source_file.stat()
+            entry = cached.get(rel)
+            if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                self.file_keys[rel] = entry
+            else:
+                stale[str(source_file)] = (rel, stat)
+        
+        removed = cached.keys() - {rel for rel, _ in stale.values()} - self.file_keys.keys()
+        affected: Set[str] = set()
+        for rel in removed:
+            affected.update(cached[rel]['table'])
+        
+        tasks = [(path, cached[rel]['hash'] if rel in cached else None) for path, (rel, _) in stale.items()]
+        for file_path, content_hash, map_variables, table in self._harvest_files(tasks):
+            rel, stat = stale[file_path]
+            if not content_hash:
+                continue
+            entry = cached.get(rel)
+            if table is None:
+                # 내용 동일 (touch, checkout 등) - stat만 갱신
+                entry = dict(entry, mtime=stat.st_mtime, size=stat.st_size)
+            else:
+                print(f"분석 중: {rel}")
+                self._resolve_value_types(Path(file_path), table)
+                # 기여분이 달라진 키만 영향받은 키로 기록
+                previous_table = entry['table'] if entry else {}
+                affected.update(
+                    key for key in table.keys() | previous_table.keys()
+                    if _key_contribution(table.get(key)) != _key_contribution(previous_table.get(key))
+                )
+                entry = {
+                    'mtime': stat.st_mtime,
+                    'size': stat.st_size,
+                    'hash': content_hash,
+                    'map_variables': map_variables,
+                    'table': table
+                }
+            self.file_keys[rel] = entry
+        
+        for rel in sorted(self.file_keys):
+            entry = self.file_keys[rel]
+            self._merge_file_keys(str(self.project_root / rel), entry['map_variables'], entry['table'])
         
-        for java_file in self.java_files:
-            print(f"분석 중: {java_file.relative_to(self.project_root)}")
-            self._analyze_file(java_file)
+        self.changed_keys = sorted(affected)
+        if cached:
+            print(f"변경 파일: {len(stale)}개, 삭제 파일: {len(removed)}개, 영향받은 키: {len(self.changed_keys)}개")
         
         self._generate_vo_structure()
+        self._save_keys_cache()
         self._print_results()
         
         return self._create_report()
     
-    def _analyze_file(self, file_path: Path):
-        """개별 파일 분석"""
+    def _resolve_value_types(self, file_path: Path, table: Dict[str, dict]):
+        """변수/메서드 호출 값(refs)의 타입을 분석기의 선언 타입으로 해석하여 키 타입에 추가"""
+        pending = [(entry, line, expr) for entry in table.values() for line, expr in entry.get('refs', ())]
+        if not pending or not self._resolve_types:
+            return
+        
+        if self._type_parser is None:
+            try:
+                # 이미 주어진 분석기가 있으면 재사용, 없으면 파서만 초기화 (프로젝트 스캔 없음)
+                self._type_parser = self._analyzer or ElementLevelDependencyAnalyzer.parser_only(self.project_root)
+            except Exception as e:
+                print(f"파서 초기화 실패, 값 타입 해석 생략: {e}")
+                self._resolve_types = False
+                return
+        
+        index = self._declared_type_index(file_path)
+        if index is None:
+            return
+        for entry, line, expr in pending:
+            java_type = resolve_expression_type(expr, line, index, self._member_type)
+            if java_type and java_type not in entry['types']:
+                entry['types'].append(java_type)
+    
+    def _declared_type_index(self, file_path: Path) -> Optional[DeclaredTypeIndex]:
+        key = str(file_path)
+        if key not in self._declared_types:
+            try:
+                self._declared_types[key] = DeclaredTypeIndex(self._type_parser.extract_declared_types(file_path))
+            except Exception as e:
+                print(f"  선언 타입 분석 실패: {file_path}: {e}")
+                self._declared_types[key] = None
+        return self._declared_types[key]
+    
+    def _member_type(self, class_name: str, method_name: str) -> Optional[str]:
+        """프로젝트 내 다른 클래스의 메서드 반환 타입"""
+        if self._analyzer is not None:
+            class_file = self._analyzer.class_to_file.get(class_name)
+        else:
+            if self._class_files is None:
+                # 공개 클래스는 파일명과 같음 - 같은 이름의 파일이 여럿이면 모호하므로 해석하지 않음
+                self._class_files = {}
+                for java_file in self.java_files:
+                    self._class_files[java_file.stem] = None if java_file.stem in self._class_files else java_file
+            class_file = self._class_files.get(class_name)
+        if class_file is None:
+            return None
+        index = self._declared_type_index(class_file)
+        return index.method_type(method_name) if index else None
+    
+    def _load_keys_cache(self) -> Dict[str, dict]:
+        """파일별 키 기여분과 이전 필드 배치 로드"""
+        if not self.use_cache or not self.cache_file.exists():
+            return {}
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
-            
-            # Map 변수 찾기
-            self._find_map_variables(content, str(file_path))
-            
-            # 키 사용 패턴 분석
-            for i, line in enumerate(lines, 1):
-                self._analyze_line(line, i, str(file_path))
-                
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            if cache_data.get('version') != VO_KEYS_CACHE_VERSION or cache_data.get('vo_class') != self.vo_class_name:
+                return {}
+            self.field_names = cache_data.get('field_names', {})
+            return cache_data.get('files', {})
         except Exception as e:
-            print(f"  오류: {e}")
-    
-    def _find_map_variables(self, content: str, file_path: str):
-        """Map 변수 선언 찾기"""
-        patterns = [
-            r'Map<\s*String\s*,\s*Object\s*>\s+(\w+)',
-            r'Map\s+(\w+)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                var_name = match.group(1)
-                self.map_variables.add(var_name)
-                print(f"    Map 변수: {var_name}")
+            print(f"VO 키 캐시 로드 실패: {e}, 새로 분석합니다.")
+            return {}
     
-    def _analyze_line(self, line: str, line_num: int, file_path: str):
-        """라인별 키 사용 패턴 분석"""
-        original_line = line.strip()
-        
-        # get 패턴
-        get_patterns = [
-            r'(\w+)\.get\s*\(\s*["\']([^"\']+)["\']\s*\)',
-            r'\.get\s*\(\s*["\']([^"\']+)["\']\s*\)',
-        ]
-        
-        for pattern in get_patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                key = match.groups()[-1]
-                self._record_key(key, "Object", "get", file_path, original_line)
-        
-        # put 패턴
-        put_patterns = [
-            r'(\w+)\.put\s*\(\s*["\']([^"\']+)["\']\s*,\s*(.+?)\)',
-            r'\.put\s*\(\s*["\']([^"\']+)["\']\s*,\s*(.+?)\)',
-        ]
-        
-        for pattern in put_patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                groups = match.groups()
-                if len(groups) >= 2:
-                    key = groups[-2]
-                    value_expr = groups[-1]
-                    value_type = self._infer_type(value_expr)
-                    self._record_key(key, value_type, "put", file_path, original_line)
-        
-        # containsKey 패턴
-        contains_patterns = [
-            r'(\w+)\.containsKey\s*\(\s*["\']([^"\']+)["\']\s*\)',
-            r'\.containsKey\s*\(\s*["\']([^"\']+)["\']\s*\)',
-        ]
-        
-        for pattern in contains_patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                key = match.groups()[-1]
-                self._record_key(key, "Object", "containsKey", file_path, original_line)
-        
-        # remove 패턴
-        remove_patterns = [
-            r'(\w+)\.remove\s*\(\s*["\']([^"\']+)["\']\s*\)',
-            r'\.remove\s*\(\s*["\']([^"\']+)["\']\s*\)',
-        ]
-        
-        for pattern in remove_patterns:
-            matches = re.finditer(pattern, line)
-            for match in matches:
-                key = match.groups()[-1]
-                self._record_key(key, "Object", "remove", file_path, original_line)
-    
-    def _record_key(self, key: str, value_type: str, operation: str, file_path: str, line_example: str):
-        """키 사용 패턴 기록"""
-        if not key or key.isspace():
+    def _save_keys_cache(self):
+        if not self.use_cache:
             return
-            
-        if key not in self.map_keys:
-            self.map_keys[key] = MapKeyAnalysis(
-                key=key,
-                value_types=set(),
-                usage_count=0,
-                files=set(),
-                operations=set(),
-                line_examples=[]
-            )
-        
-        analysis = self.map_keys[key]
-        analysis.value_types.add(value_type)
-        analysis.usage_count += 1
-        analysis.files.add(file_path)
-        analysis.operations.add(operation)
-        
-        if len(analysis.line_examples) < 3:
-            analysis.line_examples.append(line_example)
+        try:
+            cache_data = {
+                'version': VO_KEYS_CACHE_VERSION,
+                'vo_class': self.vo_class_name,
+                'field_names': {field.original_key: field.name for field in self.vo_fields},
+                'files': self.file_keys
+            }
+            tmp_file = self.cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"VO 키 캐시 저장 실패: {e}")
     
-    def _infer_type(self, expr: str) -> str:
-        """표현식에서 타입 추론"""
-        if not expr:
-            return "Object"
-            
-        expr = expr.strip()
-        
-        if expr.lower() == 'null':
-            return "Object"
-        
-        if expr == 'true' or expr == 'false':
-            return "Boolean"
-        
-        if re.match(r'^\d+$', expr):
-            return "Integer"
-        
-        if re.match(r'^\d+L$', expr, re.IGNORECASE):
-            return "Long"
-        
-        if re.match(r'^\d*\.\d+$', expr):
-            return "Double"
-        
-        if (expr.startswith('"') and expr.endswith('"')) or (expr.startswith("'") and expr.endswith("'")):
-            return "String"
+    def _harvest_files(self, tasks: List[tuple]):
+        """(경로, 이전 해시) 목록의 키 테이블 수집 - 파일이 많으면 프로세스 풀에서 병렬 수행 (결과는 입력 순서대로)"""
+        max_workers = os.cpu_count() or 1
+        if max_workers <= 1 or len(tasks) < PARALLEL_SCAN_MIN_FILES:
+            # 직렬 수행 시에는 분석기와 같은 소스 캐시를 사용
+            source_cache = get_source_cache()
+            for path, known_hash in tasks:
+                try:
+                    yield _harvest_source(path, source_cache.read_bytes(path), known_hash)
+                except Exception as e:
+                    print(f"  오류: {path}: {e}")
+                    yield path, "", None, None
+            return
         
-        if expr.startswith('new '):
-            if 'Date' in expr:
-                return "Date"
-            elif 'String' in expr:
-                return "String"
-            elif 'Integer' in expr:
-                return "Integer"
+        chunksize = max(1, len(tasks) // (max_workers * 8))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            yield from executor.map(_harvest_file_worker, tasks, chunksize=chunksize)
+    
+    def _merge_file_keys(self, file_path: str, map_variables: List[str], table: Dict[str, dict]):
+        """파일 단위 키 테이블을 전체 분석 결과에 병합"""
+        for var_name in map_variables:
+            if var_name not in self.map_variables:
+                self.map_variables.add(var_name)
+                print(f"    Map 변수: {var_name}")
         
-        return "Object"
+        for key, entry in table.items():
+            analysis = self.map_keys.get(key)
+            if analysis is None:
+                analysis = self.map_keys[key] = MapKeyAnalysis(
+                    key=key,
+                    value_types=set(),
+                    usage_count=0,
+                    files=set(),
+                    operations=set(),
+                    line_examples=[]
+                )
+            analysis.value_types.update(entry['types'])
+            analysis.usage_count += entry['count']
+            analysis.files.add(file_path)
+            analysis.operations.update(entry['ops'])
+            
+            remaining = 3 - len(analysis.line_examples)
+            if remaining > 0:
+                analysis.line_examples.extend(entry['examples'][:remaining])
     
     def _generate_vo_structure(self):
         """VO 구조 생성"""
@@ -244,18 +554,35 @@ class VOGenerator:
         print("2단계: VO 구조 생성")
         print("=" * 60)
         
-        sorted_keys = sorted(self.map_keys.items(), key=lambda x: x[1].usage_count, reverse=True)
+        # 이전 실행의 필드는 순서/이름을 유지하고, 새 키만 사용 빈도순으로 뒤에 추가 (diff 최소화)
+        previous_keys = [key for key in self.field_names if key in self.map_keys]
+        new_keys = sorted(
+            (key for key in self.map_keys if key not in self.field_names),
+            key=lambda key: self.map_keys[key].usage_count, reverse=True
+        )
+        
+        self.vo_fields = []
+        self._rendered = {}
+        self._summary_report = None
+        self._fields_by_key = None
+        used_names = set(self.field_names.values())
         
-        for key, analysis in sorted_keys:
+        for key in previous_keys + new_keys:
+            analysis = self.map_keys[key]
             java_type = self._determine_type(analysis.value_types, key)
-            field_name = self._to_field_name(key)
             
-            # 중복 필드명 처리
-            original_field_name = field_name
-            counter = 1
-            while any(f.name == field_name for f in self.vo_fields):
-                field_name = f"{original_field_name}{counter}"
-                counter += 1
+            if key in self.field_names:
+                field_name = self.field_names[key]
+            else:
+                field_name = self._to_field_name(key)
+                
+                # 중복 필드명 처리
+                original_field_name = field_name
+                counter = 1
+                while field_name in used_names:
+                    field_name = f"{original_field_name}{counter}"
+                    counter += 1
+            used_names.add(field_name)
             
             vo_field = VOField(
                 name=field_name,
@@ -300,6 +627,12 @@ class VOGenerator:
         if not value_types:
             return self._guess_type_from_key(key)
         
+        # 생성된 VO 에서 import 할 수 없는 타입(프로젝트 클래스 등)의 값이 들어가면 Object
+        field_types = {vo_field_type(java_type) for java_type in value_types}
+        if None in field_types:
+            return "Object"
+        value_types = field_types
+        
         if "Object" in value_types and len(value_types) > 1:
             non_object_types = value_types - {"Object"}
             if len(non_object_types) == 1:
@@ -311,8 +644,17 @@ class VOGenerator:
                 return self._guess_type_from_key(key)
             return single_type
         
-        # 숫자 타입 우선순위
-        for num_type in ["Double", "Float", "Long", "Integer"]:
+        # 컬렉션 - 같은 컬렉션이면 원소 타입만 Object 로, 스칼라 값과 섞여 있으면 Object
+        raw_types = {java_type.split('<', 1)[0].strip() for java_type in value_types - {"Object"}}
+        if raw_types & _COLLECTION_TYPES:
+            if not raw_types <= _COLLECTION_TYPES:
+                return "Object"
+            if len(raw_types) == 1:
+                return f"{raw_types.pop()}<Object>"
+            return "List<Object>" if raw_types <= _LIST_TYPES else "Collection<Object>"
+        
+        # 숫자 타입 우선순위 (정밀도를 잃지 않는 쪽 우선)
+        for num_type in ["BigDecimal", "Double", "Float", "Long", "Integer", "Short", "Byte"]:
             if num_type in value_types:
                 return num_type
         
@@ -355,6 +697,7 @@ class VOGenerator:
         print("분석 결과")
         print("=" * 60)
         print(f"Java 파일: {len(self.java_files)}개")
+        print(f"매퍼 XML: {len(self.mapper_files)}개")
         print(f"Map 변수: {len(self.map_variables)}개")
         print(f"고유 키: {len(self.map_keys)}개")
         print(f"VO 필드: {len(self.vo_fields)}개")
@@ -370,197 +713,417 @@ class VOGenerator:
             if analysis.line_examples:
                 print(f"    예시: {analysis.line_examples[0]}")
     
-    def generate_vo_class(self) -> str:
-        """VO 클래스 코드 생성"""
+    def generate_vo_class(self, class_name: Optional[str] = None, fields: Optional[List[VOField]] = None) -> str:
+        """VO 클래스 코드 생성 (기본값은 전체 필드를 담은 통합 VO)"""
+        class_name = class_name or self.vo_class_name
+        fields = self.vo_fields if fields is None else fields
+        
+        cache_key = (class_name, tuple(field.name for field in fields))
+        cached = self._rendered.get(cache_key)
+        if cached is not None:
+            return cached
+        
         print("\n" + "=" * 60)
         print("3단계: VO 클래스 생성")
         print("=" * 60)
         
-        code = f"""package {self.vo_package};
+        extra_imports = "import java.math.BigDecimal;\n" if any(field.java_type == "BigDecimal" for field in fields) else ""
+        out = [f"""package {self.vo_package};
 
 import java.util.*;
 import java.sql.Timestamp;
-
+{extra_imports}
 /**
- * 통합 데이터 전달 객체
- * 자동 생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
- * 필드 수: {len(self.vo_fields)}개
+ * {'통합 ' if class_name == self.vo_class_name else ''}데이터 전달 객체
+ * {_GENERATED_VO_MARKER} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+ * 필드 수: {len(fields)}개
  */
-public class {self.vo_class_name} {{
+public class {class_name} {{
 
-"""
+"""]
         
         # 필드 선언
-        for field in self.vo_fields:
-            code += f"    /** 원본 키: '{field.original_key}' */\n"
-            code += f"    private {field.java_type} {field.name};\n\n"
+        for field in fields:
+            out.append(f"    /** 원본 키: '{field.original_key}' */\n")
+            out.append(f"    private {field.java_type} {field.name};\n\n")
         
         # 기본 생성자
-        code += f"    public {self.vo_class_name}() {{}}\n\n"
+        out.append(f"    public {class_name}() {{}}\n\n")
         
         # Map 생성자
-        code += f"    public {self.vo_class_name}(Map<String, Object> map) {{\n"
-        code += f"        fromMap(map);\n"
-        code += f"    }}\n\n"
+        out.append(f"    public {class_name}(Map<String, Object> map) {{\n")
+        out.append(f"        fromMap(map);\n")
+        out.append(f"    }}\n\n")
         
         # Getter/Setter
-        for field in self.vo_fields:
+        for field in fields:
             # Getter
-            code += f"    public {field.java_type} {field.getter_name}() {{\n"
-            code += f"        return {field.name};\n"
-            code += f"    }}\n\n"
+            out.append(f"    public {field.java_type} {field.getter_name}() {{\n")
+            out.append(f"        return {field.name};\n")
+            out.append(f"    }}\n\n")
             
             # Setter
-            code += f"    public void {field.setter_name}({field.java_type} {field.name}) {{\n"
-            code += f"        this.{field.name} = {field.name};\n"
-            code += f"    }}\n\n"
+            out.append(f"    public void {field.setter_name}({field.java_type} {field.name}) {{\n")
+            out.append(f"        this.{field.name} = {field.name};\n")
+            out.append(f"    }}\n\n")
         
         # Map 변환 메서드
-        code += self._generate_conversion_methods()
+        out.append(self._generate_conversion_methods(class_name, fields))
         
         # 유틸리티 메서드
-        code += self._generate_utility_methods()
+        out.append(self._generate_utility_methods(class_name, fields))
         
-        code += "}\n"
+        out.append("}\n")
         
+        code = ''.join(out)
+        self._rendered[cache_key] = code
         return code
     
-    def _generate_conversion_methods(self) -> str:
+    def _generate_conversion_methods(self, class_name: str, fields: List[VOField]) -> str:
         """Map 변환 메서드 생성"""
-        code = f"""    // Map에서 VO로 변환
+        out = [f"""    // Map에서 VO로 변환
     public void fromMap(Map<String, Object> map) {{
         if (map == null) return;
         
-"""
+"""]
         
-        for field in self.vo_fields:
-            code += f'        Object {field.name}Value = map.get("{field.original_key}");\n'
-            code += f'        if ({field.name}Value != null) {{\n'
+        for field in fields:
+            out.append(f'        Object {field.name}Value = map.get("{field.original_key}");\n')
+            out.append(f'        if ({field.name}Value != null) {{\n')
             
             if field.java_type == "String":
-                code += f'            this.{field.name} = {field.name}Value.toString();\n'
+                out.append(f'            this.{field.name} = {field.name}Value.toString();\n')
             elif field.java_type == "Integer":
-                code += f'            if ({field.name}Value instanceof Integer) {{\n'
-                code += f'                this.{field.name} = (Integer) {field.name}Value;\n'
-                code += f'            }} else {{\n'
-                code += f'                try {{ this.{field.name} = Integer.valueOf({field.name}Value.toString()); }} catch (Exception e) {{ }}\n'
-                code += f'            }}\n'
+                out.append(f'            if ({field.name}Value instanceof Integer) {{\n')
+                out.append(f'                this.{field.name} = (Integer) {field.name}Value;\n')
+                out.append(f'            }} else {{\n')
+                out.append(f'                try {{ this.{field.name} = Integer.valueOf({field.name}Value.toString()); }} catch (Exception e) {{ }}\n')
+                out.append(f'            }}\n')
             elif field.java_type == "Long":
-                code += f'            if ({field.name}Value instanceof Long) {{\n'
-                code += f'                this.{field.name} = (Long) {field.name}Value;\n'
-                code += f'            }} else if ({field.name}Value instanceof Integer) {{\n'
-                code += f'                this.{field.name} = ((Integer) {field.name}Value).longValue();\n'
-                code += f'            }} else {{\n'
-                code += f'                try {{ this.{field.name} = Long.valueOf({field.name}Value.toString()); }} catch (Exception e) {{ }}\n'
-                code += f'            }}\n'
+                out.append(f'            if ({field.name}Value instanceof Long) {{\n')
+                out.append(f'                this.{field.name} = (Long) {field.name}Value;\n')
+                out.append(f'            }} else if ({field.name}Value instanceof Integer) {{\n')
+                out.append(f'                this.{field.name} = ((Integer) {field.name}Value).longValue();\n')
+                out.append(f'            }} else {{\n')
+                out.append(f'                try {{ this.{field.name} = Long.valueOf({field.name}Value.toString()); }} catch (Exception e) {{ }}\n')
+                out.append(f'            }}\n')
             elif field.java_type == "Double":
-                code += f'            if ({field.name}Value instanceof Double) {{\n'
-                code += f'                this.{field.name} = (Double) {field.name}Value;\n'
-                code += f'            }} else if ({field.name}Value instanceof Number) {{\n'
-                code += f'                this.{field.name} = ((Number) {field.name}Value).doubleValue();\n'
-                code += f'            }} else {{\n'
-                code += f'                try {{ this.{field.name} = Double.valueOf({field.name}Value.toString()); }} catch (Exception e) {{ }}\n'
-                code += f'            }}\n'
+                out.append(f'            if ({field.name}Value instanceof Double) {{\n')
+                out.append(f'                this.{field.name} = (Double) {field.name}Value;\n')
+                out.append(f'            }} else if ({field.name}Value instanceof Number) {{\n')
+                out.append(f'                this.{field.name} = ((Number) {field.name}Value).doubleValue();\n')
+                out.append(f'            }} else {{\n')
+                out.append(f'                try {{ this.{field.name} = Double.valueOf({field.name}Value.toString()); }} catch (Exception e) {{ }}\n')
+                out.append(f'            }}\n')
+            elif field.java_type in ("Float", "Short", "Byte"):
+                primitive = field.java_type.lower()
+                out.append(f'            if ({field.name}Value instanceof {field.java_type}) {{\n')
+                out.append(f'                this.{field.name} = ({field.java_type}) {field.name}Value;\n')
+                out.append(f'            }} else if ({field.name}Value instanceof Number) {{\n')
+                out.append(f'                this.{field.name} = ((Number) {field.name}Value).{primitive}Value();\n')
+                out.append(f'            }} else {{\n')
+                out.append(f'                try {{ this.{field.name} = {field.java_type}.valueOf({field.name}Value.toString()); }} catch (Exception e) {{ }}\n')
+                out.append(f'            }}\n')
+            elif field.java_type == "Character":
+                out.append(f'            if ({field.name}Value instanceof Character) {{\n')
+                out.append(f'                this.{field.name} = (Character) {field.name}Value;\n')
+                out.append(f'            }} else if (!{field.name}Value.toString().isEmpty()) {{\n')
+                out.append(f'                this.{field.name} = {field.name}Value.toString().charAt(0);\n')
+                out.append(f'            }}\n')
+            elif field.java_type == "BigDecimal":
+                out.append(f'            if ({field.name}Value instanceof BigDecimal) {{\n')
+                out.append(f'                this.{field.name} = (BigDecimal) {field.name}Value;\n')
+                out.append(f'            }} else {{\n')
+                out.append(f'                try {{ this.{field.name} = new BigDecimal({field.name}Value.toString()); }} catch (Exception e) {{ }}\n')
+                out.append(f'            }}\n')
             elif field.java_type == "Boolean":
-                code += f'            if ({field.name}Value instanceof Boolean) {{\n'
-                code += f'                this.{field.name} = (Boolean) {field.name}Value;\n'
-                code += f'            }} else {{\n'
-                code += f'                this.{field.name} = Boolean.valueOf({field.name}Value.toString());\n'
-                code += f'            }}\n'
+                out.append(f'            if ({field.name}Value instanceof Boolean) {{\n')
+                out.append(f'                this.{field.name} = (Boolean) {field.name}Value;\n')
+                out.append(f'            }} else {{\n')
+                out.append(f'                this.{field.name} = Boolean.valueOf({field.name}Value.toString());\n')
+                out.append(f'            }}\n')
             elif field.java_type == "Date":
-                code += f'            if ({field.name}Value instanceof Date) {{\n'
-                code += f'                this.{field.name} = (Date) {field.name}Value;\n'
-                code += f'            }} else if ({field.name}Value instanceof Timestamp) {{\n'
-                code += f'                this.{field.name} = new Date(((Timestamp) {field.name}Value).getTime());\n'
-                code += f'            }} else if ({field.name}Value instanceof Long) {{\n'
-                code += f'                this.{field.name} = new Date((Long) {field.name}Value);\n'
-                code += f'            }}\n'
+                out.append(f'            if ({field.name}Value instanceof Date) {{\n')
+                out.append(f'                this.{field.name} = (Date) {field.name}Value;\n')
+                out.append(f'            }} else if ({field.name}Value instanceof Timestamp) {{\n')
+                out.append(f'                this.{field.name} = new Date(((Timestamp) {field.name}Value).getTime());\n')
+                out.append(f'            }} else if ({field.name}Value instanceof Long) {{\n')
+                out.append(f'                this.{field.name} = new Date((Long) {field.name}Value);\n')
+                out.append(f'            }}\n')
+            elif field.java_type == "Timestamp":
+                out.append(f'            if ({field.name}Value instanceof Timestamp) {{\n')
+                out.append(f'                this.{field.name} = (Timestamp) {field.name}Value;\n')
+                out.append(f'            }} else if ({field.name}Value instanceof Date) {{\n')
+                out.append(f'                this.{field.name} = new Timestamp(((Date) {field.name}Value).getTime());\n')
+                out.append(f'            }} else if ({field.name}Value instanceof Long) {{\n')
+                out.append(f'                this.{field.name} = new Timestamp((Long) {field.name}Value);\n')
+                out.append(f'            }}\n')
+            elif field.java_type == "Object":
+                out.append(f'            this.{field.name} = {field.name}Value;\n')
             else:
-                code += f'            this.{field.name} = ({field.java_type}) {field.name}Value;\n'
+                out.append(f'            this.{field.name} = ({field.java_type}) {field.name}Value;\n')
             
-            code += f'        }}\n\n'
+            out.append(f'        }}\n\n')
         
-        code += f"""    }}
+        out.append(f"""    }}
 
     // VO에서 Map으로 변환
     public Map<String, Object> toMap() {{
         Map<String, Object> map = new HashMap<>();
-"""
+""")
         
-        for field in self.vo_fields:
-            code += f'        if (this.{field.name} != null) {{\n'
-            code += f'            map.put("{field.original_key}", this.{field.name});\n'
-            code += f'        }}\n'
+        for field in fields:
+            out.append(f'        if (this.{field.name} != null) {{\n')
+            out.append(f'            map.put("{field.original_key}", this.{field.name});\n')
+            out.append(f'        }}\n')
         
-        code += f"""        return map;
+        out.append(f"""        return map;
     }}
 
     // 정적 변환 메서드
-    public static {self.vo_class_name} fromMap(Map<String, Object> map) {{
+    public static {class_name} fromMap(Map<String, Object> map) {{
         if (map == null) return null;
-        return new {self.vo_class_name}(map);
+        return new {class_name}(map);
     }}
 
-"""
-        return code
+""")
+        return ''.join(out)
     
-    def _generate_utility_methods(self) -> str:
+    def _generate_utility_methods(self, class_name: str, fields: List[VOField]) -> str:
         """유틸리티 메서드 생성"""
-        code = f"""    // 특정 키 값 존재 확인
+        out = [f"""    // 특정 키 값 존재 확인
     public boolean hasValue(String key) {{
         switch (key) {{
-"""
+"""]
         
-        for field in self.vo_fields:
-            code += f'            case "{field.original_key}": return this.{field.name} != null;\n'
+        for field in fields:
+            out.append(f'            case "{field.original_key}": return this.{field.name} != null;\n')
         
-        code += f"""            default: return false;
+        out.append(f"""            default: return false;
         }}
     }}
 
     // 특정 키 값 조회
     public Object getValue(String key) {{
         switch (key) {{
-"""
+""")
         
-        for field in self.vo_fields:
-            code += f'            case "{field.original_key}": return this.{field.name};\n'
+        for field in fields:
+            out.append(f'            case "{field.original_key}": return this.{field.name};\n')
         
-        code += f"""            default: return null;
+        out.append(f"""            default: return null;
         }}
     }}
 
     @Override
     public String toString() {{
-        return "{self.vo_class_name}{{" +
-"""
+        return "{class_name}{{" +
+""")
         
-        for i, field in enumerate(self.vo_fields[:5]):  # 처음 5개만
+        for i, field in enumerate(fields[:5]):  # 처음 5개만
             if i == 0:
-                code += f'                "{field.name}=" + {field.name} +\n'
+                out.append(f'                "{field.name}=" + {field.name} +\n')
             else:
-                code += f'                ", {field.name}=" + {field.name} +\n'
+                out.append(f'                ", {field.name}=" + {field.name} +\n')
         
-        if len(self.vo_fields) > 5:
-            code += f'                ", ..." +\n'
+        if len(fields) > 5:
+            out.append(f'                ", ..." +\n')
         
-        code += f"""                '}}';
+        out.append(f"""                '}}';
     }}
 
     @Override
     public boolean equals(Object o) {{
         if (this == o) return true;
         if (o == null || getClass() != o.getClass()) return false;
-        {self.vo_class_name} that = ({self.vo_class_name}) o;
-        return Objects.equals({self.vo_fields[0].name if self.vo_fields else 'null'}, that.{self.vo_fields[0].name if self.vo_fields else 'null'});
+        {class_name} that = ({class_name}) o;
+        return Objects.equals({fields[0].name if fields else 'null'}, that.{fields[0].name if fields else 'null'});
     }}
 
     @Override
     public int hashCode() {{
-        return Objects.hash({self.vo_fields[0].name if self.vo_fields else 'null'});
+        return Objects.hash({fields[0].name if fields else 'null'});
     }}
-"""
-        return code
+""")
+        return ''.join(out)
+    
+    def cluster_vos(self, min_similarity: float = 0.5) -> List[VOCluster]:
+        """키 동시 사용 기준으로 통합 VO를 여러 VO로 분할
+        
+        같은 메서드(분석기의 요소 범위 기준)에서 함께 쓰이는 키를 묶는다.
+        """
+        print("\n" + "=" * 60)
+        print("VO 분할: 키 동시 사용 클러스터링")
+        print("=" * 60)
+        
+        self.vo_clusters = cluster_map_keys(
+            self._build_key_groups(),
+            [field.original_key for field in self.vo_fields],
+            self.vo_class_name,
+            min_similarity=min_similarity
+        )
+        self._key_clusters = {
+            key: cluster for cluster in self.vo_clusters for key in cluster.keys
+        }
+        
+        for cluster in self.vo_clusters:
+            print(f"  {cluster.class_name}: {len(cluster.keys)}개 필드")
+        return self.vo_clusters
+    
+    def _build_key_groups(self) -> List[KeyGroup]:
+        """메서드 단위 키 묶음 (메서드 밖에서 쓰인 키는 파일 단위로, 매퍼 XML은 statement 단위로)"""
+        groups = []
+        for rel, entry in sorted(self.file_keys.items()):
+            if not entry['table']:
+                continue
+            
+            file_path = self.project_root / rel
+            if file_path.suffix == '.xml':
+                # namespace 의 클래스명 (com.example.FundMapper -> FundMapper) 을 VO 이름 추정에 사용
+                statement_groups: Dict[str, KeyGroup] = {}
+                for key, key_entry in entry['table'].items():
+                    for statement in key_entry.get('statements', ()):
+                        group = statement_groups.get(statement)
+                        if group is None:
+                            namespace = statement.rpartition('.')[0]
+                            group = statement_groups[statement] = KeyGroup(namespace.rpartition('.')[2] or file_path.stem)
+                        group.keys.add(key)
+                groups.extend(statement_groups.values())
+                continue
+            try:
+                element_deps = self.analyzer.get_element_dependencies(file_path)
+                methods = sorted(
+                    (elem_dep.element.line_start, elem_dep.element.line_end, elem_dep.element.parent or file_path.stem)
+                    for elem_dep in element_deps.values()
+                    if elem_dep.element.type in ('method', 'constructor')
+                )
+            except Exception as e:
+                print(f"  요소 분석 실패, 파일 단위로 묶음: {rel}: {e}")
+                methods = []
+            starts = [start for start, _, _ in methods]
+            
+            file_groups: Dict[int, KeyGroup] = {}
+            for key, key_entry in entry['table'].items():
+                for line in key_entry.get('lines', ()):
+                    index = bisect.bisect_right(starts, line) - 1
+                    if index < 0 or methods[index][1] < line:
+                        index = -1
+                    group = file_groups.get(index)
+                    if group is None:
+                        label = methods[index][2] if index >= 0 else file_path.stem
+                        group = file_groups[index] = KeyGroup(label)
+                    group.keys.add(key)
+            groups.extend(file_groups.values())
+        return groups
+    
+    def generate_vo_classes(self) -> Dict[str, str]:
+        """분할된 VO별 클래스 코드 (cluster_vos 이전에는 통합 VO 하나)"""
+        if not self.vo_clusters:
+            return {self.vo_class_name: self.generate_vo_class()}
+        
+        fields_by_key = {field.original_key: field for field in self.vo_fields}
+        return {
+            cluster.class_name: self.generate_vo_class(
+                cluster.class_name, [fields_by_key[key] for key in cluster.keys if key in fields_by_key]
+            )
+            for cluster in self.vo_clusters
+        }
+    
+    def keys_used_in(self, code: str) -> List[VOField]:
+        """코드 조각의 문자열 리터럴 중 VO 키인 것의 필드 (VO 필드 순서)"""
+        if self._fields_by_key is None:
+            self._fields_by_key = {field.original_key: field for field in self.vo_fields}
+        
+        used = {match.group(1) for match in _STRING_LITERAL_PATTERN.finditer(code)}
+        used.intersection_update(self._fields_by_key)
+        return [field for field in self.vo_fields if field.original_key in used]
+    
+    def field_name_for(self, key: str) -> Optional[str]:
+        """키의 VO 필드명 (VO에 없는 키는 None)"""
+        if self._fields_by_key is None:
+            self._fields_by_key = {field.original_key: field for field in self.vo_fields}
+        field = self._fields_by_key.get(key)
+        return field.name if field else None
+    
+    def vo_class_for_keys(self, keys: List[str]) -> str:
+        """키 목록을 가장 많이 담은 VO의 전체 이름 (매퍼 XML 변환용)"""
+        class_name = self.vo_class_name
+        if self.vo_clusters:
+            votes: Dict[str, int] = {}
+            for key in keys:
+                cluster = self._key_clusters.get(key)
+                if cluster is not None:
+                    votes[cluster.class_name] = votes.get(cluster.class_name, 0) + 1
+            if votes:
+                class_name = max(votes, key=votes.get)
+        return f"{self.vo_package}.{class_name}"
+    
+    def vo_classes_for_code(self, code: str) -> List[str]:
+        """코드 조각이 사용하는 키가 속한 VO 이름 목록 (키가 없으면 빈 목록 - minimal_vo_context 로 대체)"""
+        if not self.vo_clusters:
+            return [self.vo_class_name]
+        
+        names = {self._key_clusters[field.original_key].class_name for field in self.keys_used_in(code)}
+        return [cluster.class_name for cluster in self.vo_clusters if cluster.class_name in names]
+    
+    def generate_vo_stub(self, class_name: str, fields: List[VOField], total_fields: int) -> str:
+        """필드와 메서드 시그니처만 담은 VO 요약 (프롬프트 컨텍스트용, 필드가 없으면 생성자/fromMap/toMap만)"""
+        if fields:
+            header = f"// {self.vo_package}.{class_name} 중 이 코드에서 사용하는 {len(fields)}개 필드 (전체 {total_fields}개)\n"
+        else:
+            header = f"// {self.vo_package}.{class_name} (전체 {total_fields}개 필드, 이 코드에서 키로 접근하는 필드 없음)\n"
+        out = [header, f"public class {class_name} {{\n"]
+        for field in fields:
+            out.append(f"    private {field.java_type} {field.name}; // 원본 키: \"{field.original_key}\"\n")
+        out.append(f"\n    public {class_name}(Map<String, Object> map);\n")
+        out.append(f"    public static {class_name} fromMap(Map<String, Object> map);\n")
+        out.append("    public Map<String, Object> toMap();\n")
+        for field in fields:
+            out.append(f"    public {field.java_type} {field.getter_name}();\n")
+            out.append(f"    public void {field.setter_name}({field.java_type} {field.name});\n")
+        out.append("}\n")
+        return ''.join(out)
+    
+    def minimal_vo_context(self) -> str:
+        """VO 이름과 생성자/fromMap/toMap 시그니처만 담은 요약
+        
+        문자열 키 없이 Map을 만들거나 넘기기만 하는 코드도 변환 대상 VO 이름을 알 수 있도록 함
+        """
+        if not self.vo_clusters:
+            return self.generate_vo_stub(self.vo_class_name, [], len(self.vo_fields))
+        return "\n".join(
+            self.generate_vo_stub(cluster.class_name, [], len(cluster.keys)) for cluster in self.vo_clusters
+        )
+    
+    def vo_context_for(self, code: str) -> str:
+        """코드 조각이 사용하는 키만 담은 VO 요약 (사용하는 키가 없으면 VO 이름/생성자 시그니처만)"""
+        fields = self.keys_used_in(code)
+        if not fields:
+            return self.minimal_vo_context()
+        
+        if not self.vo_clusters:
+            return self.generate_vo_stub(self.vo_class_name, fields, len(self.vo_fields))
+        
+        by_cluster: Dict[str, List[VOField]] = {}
+        for field in fields:
+            by_cluster.setdefault(self._key_clusters[field.original_key].class_name, []).append(field)
+        return "\n".join(
+            self.generate_vo_stub(cluster.class_name, by_cluster[cluster.class_name], len(cluster.keys))
+            for cluster in self.vo_clusters if cluster.class_name in by_cluster
+        )
+    
+    def save_vo_classes(self, vo_dir: Path) -> List[Path]:
+        """분할된 VO를 각각 <VO 이름>.java 로 저장"""
+        vo_dir.mkdir(parents=True, exist_ok=True)
+        saved = []
+        for class_name, code in self.generate_vo_classes().items():
+            vo_file = vo_dir / f"{class_name}.java"
+            with open(vo_file, 'w', encoding='utf-8') as f:
+                f.write(code)
+            saved.append(vo_file)
+            if self.verbose:
+                print(f"VO 클래스 생성: {vo_file}")
+        return saved
     
     def save_vo_class(self, vo_file_path: Path):
         """VO 클래스 파일 저장"""
@@ -592,6 +1155,7 @@ public class {self.vo_class_name} {{
             'vo_package': self.vo_package,
             'statistics': {
                 'java_files': len(self.java_files),
+                'mapper_files': len(self.mapper_files),
                 'map_variables': len(self.map_variables),
                 'unique_keys': len(self.map_keys),
                 'vo_fields': len(self.vo_fields)
@@ -608,16 +1172,20 @@ public class {self.vo_class_name} {{
                 for key, analysis in self.map_keys.items()
             },
             'vo_fields': [asdict(field) for field in self.vo_fields],
+            'changed_keys': self.changed_keys,
         }
     
     def generate_summary_report(self) -> str:
         """요약 보고서 생성"""
-        sorted_fields = sorted(self.vo_fields, 
-                             key=lambda f: self.map_keys.get(f.original_key, 
-                                                           MapKeyAnalysis('', set(), 0, set(), set(), [])).usage_count, 
-                             reverse=True)
+        if self._summary_report is not None:
+            return self._summary_report
+        
+        # 상위 15개만 필요하므로 전체 정렬 대신 부분 선택
+        top_fields = heapq.nlargest(15, self.vo_fields,
+                                    key=lambda f: self.map_keys.get(f.original_key, 
+                                                                  MapKeyAnalysis('', set(), 0, set(), set(), [])).usage_count)
         
-        report = f"""
+        out = [f"""
 Map to VO 변환 보고서
 {'=' * 50}
 변환 일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -634,17 +1202,18 @@ Map to VO 변환 보고서
 - 패키지: {self.vo_package}
 
 주요 필드 (사용빈도순):
-"""
+"""]
         
-        for field in sorted_fields[:15]:
+        for field in top_fields:
             key_info = self.map_keys.get(field.original_key, 
                                        MapKeyAnalysis('', set(), 0, set(), set(), []))
-            report += f"- {field.name} ({field.java_type}) - 키: '{field.original_key}', 사용: {key_info.usage_count}회\n"
+            out.append(f"- {field.name} ({field.java_type}) - 키: '{field.original_key}', 사용: {key_info.usage_count}회\n")
         
-        if len(sorted_fields) > 15:
-            report += f"... 그 외 {len(sorted_fields) - 15}개 필드\n"
+        if len(self.vo_fields) > 15:
+            out.append(f"... 그 외 {len(self.vo_fields) - 15}개 필드\n")
 
-        return report
+        self._summary_report = ''.join(out)
+        return self._summary_report
 
 
 def create_parser():
@@ -659,6 +1228,7 @@ def create_parser():
   %(prog)s /path/to/project --vo-class DataVO             # 커스텀 VO 클래스명
   %(prog)s /path/to/project --vo-file custom/path/VO.java # 커스텀 VO 경로
   %(prog)s /path/to/project --dry-run --report-file report.json  # 분석 + 보고서 저장
+  %(prog)s /path/to/project --vo-file vo/UnifiedDataVO.java --multi-vo  # 기능별 VO로 분할
         """
     )
     
@@ -696,6 +1266,18 @@ def create_parser():
         help='생성할 VO 클래스 파일 경로 (지정하지 않으면 패키지 구조에 따라 자동 생성)'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='파일별 키 캐시를 사용하지 않고 전체 재분석'
+    )
+    
+    parser.add_argument(
+        '--multi-vo',
+        action='store_true',
+        help='함께 사용되는 키끼리 묶어 여러 VO로 분할 생성 (VO 파일은 --vo-file 디렉토리에 저장)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -705,9 +1287,14 @@ def create_parser():
     return parser
 
 
-def run_vo_generator(config: VOGeneratorConfig) -> Dict[str, Any] | None:
+def run_vo_generator(config: VOGeneratorConfig,
+                     analyzer: Optional[ElementLevelDependencyAnalyzer] = None) -> Dict[str, Any] | None:
     """VO 생성 실행 함수
     
+    Args:
+        config: VO 생성 설정
+        analyzer: 재사용할 의존성 분석기 (감시 모드에서 메모리에 유지 중인 색인)
+    
     Returns:
         Dict[str, Any] | None: 생성 결과 (오류 발생시 None 반환)
     """
@@ -724,7 +1311,10 @@ def run_vo_generator(config: VOGeneratorConfig) -> Dict[str, Any] | None:
         vo_generator = VOGenerator(
             project_root=config.project_root,
             vo_package=config.vo_package,
-            vo_class_name=config.vo_class
+            vo_class_name=config.vo_class,
+            analyzer=analyzer,
+            use_cache=not config.no_cache,
+            verbose=config.verbose
         )
         
         # 분석 수행
@@ -738,6 +1328,9 @@ def run_vo_generator(config: VOGeneratorConfig) -> Dict[str, Any] | None:
                 print("\n❌ Map<String, Object> 사용을 찾을 수 없습니다.")
             return None
         
+        if config.multi_vo:
+            vo_generator.cluster_vos()
+        
         # dry-run 모드
         if config.dry_run:
             if config.verbose:
@@ -749,6 +1342,7 @@ def run_vo_generator(config: VOGeneratorConfig) -> Dict[str, Any] | None:
                 'report': report,
                 'summary': vo_generator.generate_summary_report(),
                 'vo_code': vo_generator.generate_vo_class(),
+                'vo_classes': vo_generator.generate_vo_classes(),
                 'statistics': report.get('statistics', {})
             }
             
@@ -767,10 +1361,16 @@ def run_vo_generator(config: VOGeneratorConfig) -> Dict[str, Any] | None:
             print(f"- VO 생성: {config.vo_package}.{config.vo_class}")
                 
         # VO 클래스 생성
-        vo_file_path = vo_generator.save_vo_class(Path(config.vo_file))
+        if config.multi_vo:
+            vo_file_paths = vo_generator.save_vo_classes(Path(config.vo_file).parent)
+            vo_file_path = vo_file_paths[0]
+        else:
+            vo_file_path = vo_generator.save_vo_class(Path(config.vo_file))
+            vo_file_paths = [vo_file_path]
         
         if config.verbose:
-            print(f"📄 VO 클래스 생성: {vo_file_path}")
+            for path in vo_file_paths:
+                print(f"📄 VO 클래스 생성: {path}")
 
         # 완료 보고서
         if config.verbose:
@@ -786,7 +1386,9 @@ def run_vo_generator(config: VOGeneratorConfig) -> Dict[str, Any] | None:
             'vo_class_name': config.vo_class,
             'vo_package': config.vo_package,
             'vo_file_path': str(vo_file_path),
+            'vo_file_paths': [str(path) for path in vo_file_paths],
             'vo_code': vo_generator.generate_vo_class(),
+            'vo_classes': vo_generator.generate_vo_classes(),
             'statistics': report.get('statistics', {}),
             'report': report,
             'summary': vo_generator.generate_summary_report()
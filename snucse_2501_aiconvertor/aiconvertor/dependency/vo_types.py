@@ -0,0 +1,191 @@
+"""
+VO 필드 타입 해석
+Map에 넣는 값이 변수/메서드 호출일 때 분석기의 선언 타입(지역 변수, 매개변수, 필드, 메서드 반환 타입)으로 타입을 결정
+"""
+
+import re
+
+from collections import defaultdict
+from typing import Callable
+
+from .analyzer import DeclaredType
+
+
+# 기본 타입 -> VO 필드용 래퍼 타입
+PRIMITIVE_WRAPPERS = {
+    'int': 'Integer', 'long': 'Long', 'double': 'Double', 'float': 'Float',
+    'boolean': 'Boolean', 'char': 'Character', 'short': 'Short', 'byte': 'Byte'
+}
+
+# MapDataUtil.getString / setBigDecimal 등 메서드 접미사 -> 값 타입 (getAttribute, get/set 은 해석 대상 아님)
+MAP_UTIL_TYPES = {
+    'String': 'String', 'Int': 'Integer', 'Integer': 'Integer', 'Long': 'Long', 'Double': 'Double',
+    'Float': 'Float', 'Boolean': 'Boolean', 'BigDecimal': 'BigDecimal', 'Date': 'Date',
+    'Timestamp': 'Timestamp', 'List': 'List', 'Vector': 'Vector', 'Map': 'Map'
+}
+
+# 생성된 VO 에서 import/변환할 수 있는 JDK 타입 (java.util.*, java.sql.Timestamp, java.math.BigDecimal)
+VO_SCALAR_TYPES = {
+    'String', 'Integer', 'Long', 'Double', 'Float', 'Short', 'Byte', 'Character', 'Boolean',
+    'BigDecimal', 'Date', 'Timestamp', 'Object'
+}
+VO_CONTAINER_TYPES = {
+    'List', 'ArrayList', 'LinkedList', 'Vector', 'Collection', 'Set', 'HashSet', 'LinkedHashSet', 'TreeSet',
+    'Map', 'HashMap', 'LinkedHashMap', 'TreeMap'
+}
+_JDK_PACKAGES = ('java.lang.', 'java.util.', 'java.math.', 'java.sql.')
+
+# 해석 가능한 값 표현식 - 변수, this.필드, 메서드 호출, 수신 객체.메서드 호출
+_VARIABLE_PATTERN = re.compile(r'(this\.)?([A-Za-z_]\w*)$')
+_CALL_PATTERN = re.compile(r'(?:this\.)?([A-Za-z_]\w*)\s*\(')
+_MEMBER_CALL_PATTERN = re.compile(r'([A-Za-z_]\w*)\.([A-Za-z_]\w*)\s*\(')
+
+
+def _match_call(pattern: re.Pattern, expr: str) -> re.Match | None:
+    """expr 전체가 호출 하나인 경우만 매치 (foo(x).bar() 처럼 이어지는 호출 제외)"""
+    match = pattern.match(expr)
+    if not match:
+        return None
+    depth = 0
+    for position in range(match.end() - 1, len(expr)):
+        char = expr[position]
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return match if position == len(expr) - 1 else None
+    return None
+
+
+def is_resolvable(expr: str) -> bool:
+    """선언 타입으로 해석을 시도할 만한 표현식인지"""
+    expr = expr.strip()
+    return bool(_VARIABLE_PATTERN.match(expr) or _match_call(_MEMBER_CALL_PATTERN, expr)
+                or _match_call(_CALL_PATTERN, expr))
+
+
+def boxed_type(java_type: str) -> str:
+    return PRIMITIVE_WRAPPERS.get(java_type, java_type)
+
+
+def _raw_type(java_type: str) -> str:
+    """제네릭 인자를 뗀 클래스명 (List<String> -> List)"""
+    return java_type.split('<', 1)[0].strip()
+
+
+def _type_arguments(java_type: str) -> list[str]:
+    """최상위 제네릭 인자 목록 (Map<String, List<X>> -> ['String', 'List<X>'])"""
+    inner = java_type[java_type.index('<') + 1:java_type.rindex('>')]
+    arguments, depth, start = [], 0, 0
+    for position, char in enumerate(inner):
+        if char == '<':
+            depth += 1
+        elif char == '>':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            arguments.append(inner[start:position].strip())
+            start = position + 1
+    arguments.append(inner[start:].strip())
+    return arguments
+
+
+def vo_field_type(java_type: str) -> str | None:
+    """VO 필드에 쓸 수 있는 타입 (JDK 패키지 접두사 제거)
+
+    프로젝트 클래스처럼 생성된 VO 에서 import 할 수 없는 타입은 None,
+    컬렉션의 제네릭 인자 중 쓸 수 없는 타입은 Object 로 바꿈
+    """
+    java_type = boxed_type(java_type.strip())
+    if java_type.endswith('[]'):
+        element = java_type[:-2].strip()
+        return java_type if element in PRIMITIVE_WRAPPERS or vo_field_type(element) == element else None
+
+    raw = _raw_type(java_type)
+    for package in _JDK_PACKAGES:
+        if raw.startswith(package):
+            raw = raw[len(package):]
+            break
+    if raw in VO_SCALAR_TYPES:
+        return raw
+    if raw not in VO_CONTAINER_TYPES:
+        return None
+    if '<' not in java_type or '>' not in java_type:
+        return raw
+    arguments = [vo_field_type(argument) or 'Object' for argument in _type_arguments(java_type)]
+    return f"{raw}<{', '.join(arguments)}>"
+
+
+class DeclaredTypeIndex:
+    """파일 하나의 선언 타입 조회용 색인"""
+
+    def __init__(self, declared: list[DeclaredType]):
+        self.variables: dict[str, list[DeclaredType]] = defaultdict(list)  # 지역 변수/매개변수
+        self.fields: dict[str, str] = {}
+        self.methods: dict[str, set[str]] = defaultdict(set)
+        for item in declared:
+            if item.kind == 'field':
+                self.fields.setdefault(item.name, item.type)
+            elif item.kind == 'method':
+                if item.type != 'void':
+                    self.methods[item.name].add(item.type)
+            else:
+                self.variables[item.name].append(item)
+
+    def variable_type(self, name: str, line: int, field_only: bool = False) -> str | None:
+        """line 시점에 보이는 변수 타입 - 가장 안쪽 메서드의 마지막 선언, 없으면 필드"""
+        if not field_only:
+            best = None
+            for item in self.variables.get(name, ()):
+                if item.scope_start <= line <= item.scope_end and item.line <= line:
+                    if best is None or (item.scope_start, item.line) > (best.scope_start, best.line):
+                        best = item
+            if best is not None:
+                return best.type
+        return self.fields.get(name)
+
+    def method_type(self, name: str) -> str | None:
+        """메서드 반환 타입 (오버로드의 반환 타입이 서로 다르면 None)"""
+        types = self.methods.get(name)
+        if types and len(types) == 1:
+            return next(iter(types))
+        return None
+
+
+def resolve_expression_type(expr: str, line: int, index: DeclaredTypeIndex,
+                            member_type: Callable[[str, str], str | None] | None = None) -> str | None:
+    """값 표현식의 타입을 선언 타입으로 해석 (해석 불가 시 None)
+
+    Args:
+        expr: put/setXxx 에 전달된 값 표현식
+        line: 표현식이 있는 라인
+        index: 같은 파일의 선언 타입 색인
+        member_type: (클래스명, 메서드명) -> 반환 타입 - 다른 파일에 선언된 메서드 조회용
+    """
+    expr = expr.strip()
+
+    match = _VARIABLE_PATTERN.match(expr)
+    if match:
+        java_type = index.variable_type(match.group(2), line, field_only=bool(match.group(1)))
+        return boxed_type(java_type) if java_type else None
+
+    match = _match_call(_MEMBER_CALL_PATTERN, expr)
+    if match and match.group(1) != 'this':
+        if member_type is None:
+            return None
+        receiver, method = match.groups()
+        # 변수면 그 타입의 메서드, 대문자로 시작하면 정적 호출로 간주
+        receiver_type = index.variable_type(receiver, line)
+        if receiver_type is None and receiver[:1].isupper():
+            receiver_type = receiver
+        if receiver_type:
+            java_type = member_type(_raw_type(receiver_type), method)
+            return boxed_type(java_type) if java_type else None
+        return None
+
+    match = _match_call(_CALL_PATTERN, expr)
+    if match:
+        java_type = index.method_type(match.group(1))
+        return boxed_type(java_type) if java_type else None
+
+    return None
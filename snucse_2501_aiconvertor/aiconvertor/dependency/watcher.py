@@ -0,0 +1,167 @@
+"""
+프로젝트 감시기
+Java 파일 변경을 감지하여 의존성 분석기 색인을 증분 갱신 (watchdog 사용 가능 시 OS 이벤트, 아니면 폴링)
+"""
+
+import threading
+import time
+
+from pathlib import Path
+
+from aiconvertor.dependency.analyzer import ElementLevelDependencyAnalyzer
+
+
+class ProjectWatcher:
+    """분석기 색인을 파일 변경에 맞춰 유지하는 백그라운드 감시기
+
+    분석기 접근은 lock으로 직렬화되므로 조회하는 쪽도 `with watcher.lock:` 안에서 사용해야 한다.
+    """
+
+    def __init__(self, analyzer: ElementLevelDependencyAnalyzer, poll_interval: float = 2.0,
+                 debounce: float = 0.3, use_events: bool = True):
+        self.analyzer = analyzer
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_events = use_events
+        self.lock = threading.RLock()
+
+        self._pending: dict[str, bool] = {}  # 경로 -> 삭제 여부
+        self._pending_lock = threading.Lock()
+        self._full_sync = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._observer = None
+
+    @property
+    def mode(self) -> str:
+        return "events" if self._observer is not None else "polling"
+
+    def start(self) -> "ProjectWatcher":
+        if self._thread is not None:
+            return self
+
+        if self.use_events:
+            self._observer = self._start_observer()
+
+        target = self._drain_loop if self._observer is not None else self._poll_loop
+        self._thread = threading.Thread(target=target, name="project-watcher", daemon=True)
+        self._thread.start()
+        print(f"👀 프로젝트 감시 시작 ({self.mode}): {self.analyzer.project_root}")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self.lock:
+            self.analyzer._save_cache()
+
+    def _start_observer(self):
+        """watchdog 옵저버 시작 (미설치 시 None → 폴링)"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    # 디렉토리 이동/삭제는 하위 파일 이벤트가 오지 않으므로 전체 동기화
+                    if event.event_type in ('moved', 'deleted'):
+                        watcher._request_full_sync()
+                    return
+                if event.event_type == 'moved':
+                    watcher._enqueue(event.src_path, deleted=True)
+                    watcher._enqueue(event.dest_path, deleted=False)
+                elif event.event_type in ('created', 'modified', 'deleted'):
+                    watcher._enqueue(event.src_path, deleted=event.event_type == 'deleted')
+
+        observer = Observer()
+        observer.schedule(_Handler(), str(self.analyzer.project_root), recursive=True)
+        observer.start()
+        return observer
+
+    def _enqueue(self, path: str, deleted: bool):
+        if not path.endswith('.java'):
+            return
+        with self._pending_lock:
+            self._pending[path] = deleted
+
+    def _request_full_sync(self):
+        with self._pending_lock:
+            self._full_sync = True
+
+    def _drain_loop(self):
+        """이벤트 모드: 모인 변경을 debounce 간격으로 한 번에 반영"""
+        while not self._stop.wait(self.debounce):
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                full_sync, self._full_sync = self._full_sync, False
+            if pending or full_sync:
+                self.apply_changes(pending, full_sync)
+
+    def _poll_loop(self):
+        """폴링 모드: mtime/size 비교로 변경분만 다시 분석"""
+        while not self._stop.wait(self.poll_interval):
+            try:
+                with self.lock:
+                    if self.analyzer.sync():
+                        print(f"🔄 색인 갱신 완료 ({len(self.analyzer.file_entries)}개 파일)")
+            except Exception as e:
+                print(f"⚠️ 색인 갱신 실패: {e}")
+
+    def apply_changes(self, pending: dict[str, bool], full_sync: bool = False):
+        """변경된 파일 목록을 분석기에 반영"""
+        started = time.perf_counter()
+        updated = 0
+        with self.lock:
+            try:
+                if full_sync:
+                    self.analyzer.sync()
+                for path, deleted in pending.items():
+                    if deleted or not Path(path).exists():
+                        if self.analyzer.remove_file(Path(path)):
+                            updated += 1
+                    elif self.analyzer.refresh_file(Path(path)):
+                        updated += 1
+                if updated:
+                    self.analyzer._save_cache()
+            except Exception as e:
+                print(f"⚠️ 색인 갱신 실패: {e}")
+                return
+        if updated:
+            print(f"🔄 {updated}개 파일 색인 갱신 ({time.perf_counter() - started:.2f}s)")
+
+
+_live_lock = threading.Lock()
+_live_watchers: dict[str, ProjectWatcher] = {}
+
+
+def get_live_watcher(project_root: str, index_path: str | None = None) -> ProjectWatcher:
+    """프로젝트별 상주 분석기/감시기 반환 (최초 호출 시 초기 스캔 후 감시 시작)"""
+    key = str(Path(project_root).resolve())
+    with _live_lock:
+        watcher = _live_watchers.get(key)
+        if watcher is None:
+            analyzer = ElementLevelDependencyAnalyzer(
+                project_root, use_cache=True, index_path=index_path, incremental_parse=True
+            )
+            watcher = ProjectWatcher(analyzer).start()
+            _live_watchers[key] = watcher
+        return watcher
+
+
+def stop_live_watchers():
+    with _live_lock:
+        watchers = list(_live_watchers.values())
+        _live_watchers.clear()
+    for watcher in watchers:
+        watcher.stop()
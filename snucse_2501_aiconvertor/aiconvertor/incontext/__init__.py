@@ -4,3 +4,6 @@ from .embedder import CodeEmbedder
 from .embedder import get_embedding_model
 from .retriever import CaseRetriever
 from .retriever import quick_search
+from .retriever import append_references_from_files
+from .lexical import BM25Index
+from .lexical import tokenize_code
@@ -1,8 +1,9 @@
+import os
 import pickle
 from typing import Any
 from pathlib import Path
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from aiconvertor.model_registry import get_sentence_transformer
 from .reference_store import ReferenceExample
 
 
@@ -25,11 +26,11 @@ class CodeEmbedder:
         self.data_dir = Path(data_dir)
         self.db_dir = self.data_dir / "db"
         self.db_dir.mkdir(parents=True, exist_ok=True)
-        
-        print(f"🔄 Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
-        
-        print(f"✅ Embedding model loaded: {self.model_name}")
+    
+    @property
+    def model(self):
+        """공유 임베딩 모델 (최초 사용 시 로드)"""
+        return get_sentence_transformer(self.model_name)
     
     def preprocess_code_line(self, line: str, context_before: list[str] = None, 
                            context_after: list[str] = None) -> str:
@@ -75,6 +76,7 @@ class CodeEmbedder:
         embedding_data = {
             'embeddings': embeddings,
             'references': references,
+            'hashes': [ref.content_hash for ref in references],
             'model_name': self.model_name,
             'use_context': use_context,
             'input_texts': input_texts  # 디버깅용
@@ -105,18 +107,154 @@ class CodeEmbedder:
         return filepath
     
     def load_embeddings(self, filename: str) -> dict[str, Any]:
-        """임베딩 데이터 로드"""
+        """임베딩 데이터 로드 (추가 파트 병합 및 삭제 표시 반영)"""
         filepath = self.db_dir / f"{filename}.pkl"
+        part_paths = self._part_paths(filename)
         
-        if not filepath.exists():
+        if not filepath.exists() and not part_paths:
             raise FileNotFoundError(f"Embeddings file not found: {filepath}")
         
-        with open(filepath, 'rb') as f:
-            embedding_data = pickle.load(f)
+        segments = []
+        for path in ([filepath] if filepath.exists() else []) + part_paths:
+            with open(path, 'rb') as f:
+                segments.append(pickle.load(f))
         
-        print(f"✅ Embeddings loaded from {filepath}")
+        embedding_data = self._merge_segments(segments, self._load_tombstones(filename))
+        
+        print(f"✅ Embeddings loaded from {filepath} (+{len(part_paths)} parts)")
         return embedding_data
     
+    def append_embeddings(self, references: list[ReferenceExample], filename: str,
+                          use_context: bool = True) -> dict[str, Any] | None:
+        """새 레퍼런스 예제만 임베딩하여 파트 파일로 추가 (기존 데이터는 다시 쓰지 않음)
+        
+        Returns:
+            새로 추가된 임베딩 데이터 (추가된 예제가 없으면 None)
+        """
+        try:
+            existing = self.load_embeddings(filename)
+        except FileNotFoundError:
+            existing = None
+        
+        if existing is not None:
+            # 기존 저장소와 동일한 전처리 방식을 유지해야 유사도가 의미를 가짐
+            use_context = existing.get('use_context', use_context)
+            seen = set(existing['hashes'])
+        else:
+            seen = set()
+        
+        new_references = []
+        for ref in references:
+            ref_hash = ref.content_hash
+            if ref_hash not in seen:
+                seen.add(ref_hash)
+                new_references.append(ref)
+        
+        print(f"🔄 {len(new_references)} unseen / {len(references)} references")
+        if not new_references:
+            return None
+        
+        embedding_data = self.embed_reference_examples(new_references, use_context=use_context)
+        
+        if existing is None:
+            self.save_embeddings(embedding_data, filename)
+        else:
+            part_paths = self._part_paths(filename)
+            next_index = int(part_paths[-1].stem.rsplit('-', 1)[-1]) + 1 if part_paths else 0
+            self.save_embeddings(embedding_data, f"{filename}.part-{next_index:05d}")
+        
+        # 삭제 후 다시 추가된 예제는 삭제 표시 해제 (이전 사본은 병합 시 새 사본으로 대체)
+        self._remove_tombstones(set(embedding_data['hashes']), filename)
+        
+        return embedding_data
+    
+    def delete_embeddings(self, hashes: set[str], filename: str):
+        """레퍼런스 해시에 삭제 표시(tombstone) 추가"""
+        tombstone_path = self.db_dir / f"{filename}.tombstones"
+        
+        with open(tombstone_path, 'a', encoding='utf-8') as f:
+            for ref_hash in sorted(hashes):
+                f.write(f"{ref_hash}\n")
+        
+        print(f"✅ {len(hashes)} tombstones added to {tombstone_path}")
+    
+    def compact_embeddings(self, filename: str) -> Path:
+        """파트 파일과 삭제 표시를 하나의 임베딩 파일로 병합"""
+        embedding_data = self.load_embeddings(filename)
+        filepath = self.save_embeddings(embedding_data, filename)
+        
+        for part_path in self._part_paths(filename):
+            part_path.unlink()
+        tombstone_path = self.db_dir / f"{filename}.tombstones"
+        if tombstone_path.exists():
+            tombstone_path.unlink()
+        
+        return filepath
+    
+    def _part_paths(self, filename: str) -> list[Path]:
+        """추가 파트 파일 목록 (생성 순서대로)"""
+        return sorted(self.db_dir.glob(f"{filename}.part-*.pkl"))
+    
+    def _load_tombstones(self, filename: str) -> set[str]:
+        """삭제 표시된 레퍼런스 해시 로드"""
+        tombstone_path = self.db_dir / f"{filename}.tombstones"
+        if not tombstone_path.exists():
+            return set()
+        
+        with open(tombstone_path, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+    
+    def _remove_tombstones(self, hashes: set[str], filename: str):
+        """다시 추가된 레퍼런스 해시의 삭제 표시 제거"""
+        tombstones = self._load_tombstones(filename)
+        if not tombstones & hashes:
+            return
+        
+        tombstone_path = self.db_dir / f"{filename}.tombstones"
+        tmp_path = tombstone_path.with_name(tombstone_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for ref_hash in sorted(tombstones - hashes):
+                f.write(f"{ref_hash}\n")
+        os.replace(tmp_path, tombstone_path)
+    
+    def _merge_segments(self, segments: list[dict[str, Any]], tombstones: set[str]) -> dict[str, Any]:
+        """임베딩 세그먼트 병합 (삭제 표시된 예제 제외, 다시 추가된 예제는 마지막 사본만 유지)"""
+        embeddings = []
+        references = []
+        hashes = []
+        input_texts = []
+        seen = set(tombstones)
+        dim = 0
+        
+        for segment in reversed(segments):
+            segment_hashes = segment.get('hashes') or [ref.content_hash for ref in segment['references']]
+            segment_texts = segment.get('input_texts') or [''] * len(segment_hashes)
+            if np.ndim(segment['embeddings']) == 2:
+                dim = dim or np.shape(segment['embeddings'])[1]
+            for i in reversed(range(len(segment_hashes))):
+                ref_hash = segment_hashes[i]
+                if ref_hash in seen:
+                    continue
+                seen.add(ref_hash)
+                embeddings.append(segment['embeddings'][i])
+                references.append(segment['references'][i])
+                hashes.append(ref_hash)
+                input_texts.append(segment_texts[i])
+        
+        embeddings.reverse()
+        references.reverse()
+        hashes.reverse()
+        input_texts.reverse()
+        
+        return {
+            'embeddings': np.vstack(embeddings) if embeddings else np.empty((0, dim)),
+            'references': references,
+            'hashes': hashes,
+            'model_name': segments[0].get('model_name', self.model_name),
+            'use_context': segments[0].get('use_context', True),
+            'input_texts': input_texts
+        }
+    
     def compute_similarity(self, query_embedding: np.ndarray, 
                           reference_embeddings: np.ndarray) -> np.ndarray:
         """코사인 유사도 계산"""
@@ -0,0 +1,120 @@
+import re
+import math
+from collections import defaultdict
+
+
+_STRING_LITERAL_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_$][A-Za-z0-9_$]*|\d+')
+_CAMEL_CASE_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+
+def split_identifier(identifier: str) -> list[str]:
+    """camelCase / snake_case 식별자를 소문자 하위 토큰으로 분리"""
+    parts = []
+    for chunk in re.split(r'[_$]+', identifier):
+        parts.extend(part.lower() for part in _CAMEL_CASE_PATTERN.findall(chunk))
+    return parts
+
+
+def extract_map_keys(code: str) -> list[str]:
+    """코드에서 문자열 리터럴 키 추출 (예: getString(pDoc, "ACNT_NO") -> ACNT_NO)"""
+    return [key for key in _STRING_LITERAL_PATTERN.findall(code) if key.strip()]
+
+
+def tokenize_code(code: str) -> list[str]:
+    """식별자 인식 토큰화
+
+    - 문자열 리터럴은 `key:<원문>` 토큰 + 하위 토큰으로 색인
+    - 식별자는 원형(소문자) + camelCase/snake_case 하위 토큰으로 색인
+    """
+    tokens = []
+
+    for key in extract_map_keys(code):
+        tokens.append(f"key:{key}")
+        tokens.extend(split_identifier(key))
+
+    code_without_strings = _STRING_LITERAL_PATTERN.sub(' ', code)
+    for identifier in _IDENTIFIER_PATTERN.findall(code_without_strings):
+        lowered = identifier.lower()
+        tokens.append(lowered)
+        sub_tokens = split_identifier(identifier)
+        if len(sub_tokens) > 1:
+            tokens.extend(sub_tokens)
+
+    return tokens
+
+
+class BM25Index:
+    """역색인 기반 BM25 검색기"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)  # token -> [(doc_id, tf)]
+        self.key_postings: dict[str, set[int]] = defaultdict(set)  # map key -> {doc_id}
+        self.doc_lengths: list[int] = []
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add_document(self, text: str) -> int:
+        """문서 추가 후 문서 id 반환"""
+        doc_id = len(self.doc_lengths)
+        tokens = tokenize_code(text)
+
+        term_freqs = defaultdict(int)
+        for token in tokens:
+            term_freqs[token] += 1
+
+        for token, tf in term_freqs.items():
+            self.postings[token].append((doc_id, tf))
+            if token.startswith("key:"):
+                self.key_postings[token[4:]].add(doc_id)
+
+        self.doc_lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        return doc_id
+
+    def search(self, query: str, top_k: int = None, allowed: set[int] = None) -> list[tuple[int, float]]:
+        """BM25 점수 순으로 (doc_id, score) 반환"""
+        if not self.doc_lengths:
+            return []
+
+        num_docs = len(self.doc_lengths)
+        avg_length = self.total_length / num_docs or 1.0
+        scores = defaultdict(float)
+
+        for token in set(tokenize_code(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        return ranked[:top_k] if top_k else ranked
+
+    def lookup_keys(self, keys: list[str]) -> set[int]:
+        """모든 키를 포함하는 문서 id 집합 (정확 일치)"""
+        if not keys:
+            return set()
+
+        postings = sorted((self.key_postings.get(key, set()) for key in keys), key=len)
+        result = set(postings[0])
+        for doc_ids in postings[1:]:
+            result &= doc_ids
+        return result
+
+
+def reciprocal_rank_fusion(rankings: list[list[int]], k: int = 60) -> list[tuple[int, float]]:
+    """여러 랭킹 결과를 Reciprocal Rank Fusion으로 결합"""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
@@ -1,4 +1,5 @@
 import json
+import hashlib
 from pathlib import Path
 
 
@@ -17,6 +18,16 @@ class ReferenceExample:
         self.context_before = context_before if context_before is not None else []
         self.context_after = context_after if context_after is not None else []
 
+    @property
+    def content_hash(self) -> str:
+        """예제 내용 기반 해시 (중복 판별 및 증분 임베딩용)"""
+        payload = json.dumps(
+            [self.input_line, self.output_line, self.task_type,
+             self.context_before, self.context_after],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
 
 class ReferenceStore:
     """레퍼런스 예제 저장소"""
@@ -116,6 +127,44 @@ class ReferenceStore:
         
         return references
     
+    def append_references(self, references: list[ReferenceExample], filename: str) -> list[ReferenceExample]:
+        """기존 레퍼런스 파일에 새 예제만 추가
+
+        Returns:
+            새로 추가된 (기존에 없던) 레퍼런스 예제 리스트
+        """
+        try:
+            existing = self.load_references(filename)
+        except FileNotFoundError:
+            existing = []
+
+        seen = {ref.content_hash for ref in existing}
+        new_references = []
+        for ref in references:
+            ref_hash = ref.content_hash
+            if ref_hash not in seen:
+                seen.add(ref_hash)
+                new_references.append(ref)
+
+        if new_references:
+            self.save_references(existing + new_references, filename)
+        print(f"✅ {len(new_references)} new / {len(references) - len(new_references)} duplicate references")
+        return new_references
+
+    def delete_references(self, hashes: set[str], filename: str) -> list[ReferenceExample]:
+        """해시에 해당하는 레퍼런스 예제 삭제
+
+        Returns:
+            삭제된 레퍼런스 예제 리스트
+        """
+        existing = self.load_references(filename)
+        kept = [ref for ref in existing if ref.content_hash not in hashes]
+        removed = [ref for ref in existing if ref.content_hash in hashes]
+
+        if removed:
+            self.save_references(kept, filename)
+        return removed
+
     def get_all_reference_files(self) -> list[str]:
         """모든 레퍼런스 파일 목록 반환"""
         files = []
@@ -4,6 +4,9 @@ from pathlib import Path
 from .reference_store import ReferenceExample
 from .embedder import CodeEmbedder
 from .embedder import get_embedding_model
+from .lexical import BM25Index
+from .lexical import extract_map_keys
+from .lexical import reciprocal_rank_fusion
 
 
 class CaseRetriever:
@@ -17,6 +20,7 @@ class CaseRetriever:
         self.data_dir = Path(data_dir)
         self.embedder = embedder
         self.embedding_data = embedding_data
+        self._lexical_index: BM25Index | None = None
         
         if self.embedder is None:
             self.embedder = CodeEmbedder(model_name=get_embedding_model())
@@ -24,6 +28,7 @@ class CaseRetriever:
     def load_embedding_data(self, filename: str = "map_to_vo_embeddings"):
         """임베딩 데이터 로드"""
         self.embedding_data = self.embedder.load_embeddings(filename)
+        self._lexical_index = None
         print(f"✅ Loaded {len(self.embedding_data['references'])} reference embeddings")
     
     def retrieve_similar_examples(self, 
@@ -46,21 +51,7 @@ class CaseRetriever:
             (ReferenceExample, similarity_score) 튜플 리스트
         """
         
-        if self.embedding_data is None:
-            raise ValueError("Embedding data not loaded. Call load_embedding_data() first.")
-        
-        # 쿼리 임베딩 생성
-        use_context = self.embedding_data.get('use_context', True)
-        query_embedding = self.embedder.embed_query(
-            query_line, 
-            context_before, 
-            context_after, 
-            use_context=use_context
-        )
-        
-        # 유사도 계산
-        reference_embeddings = self.embedding_data['embeddings']
-        similarities = self.embedder.compute_similarity(query_embedding, reference_embeddings)
+        similarities = self._compute_similarities(query_line, context_before, context_after)
         
         # 상위 k개 선택
         top_indices = np.argsort(similarities)[::-1][:top_k]
@@ -88,24 +79,99 @@ class CaseRetriever:
             task_type: 특정 태스크 타입으로 필터링
         """
         
-        # 기본 검색 수행
-        all_results = self.retrieve_similar_examples(
-            query_line, context_before, context_after, 
-            top_k=top_k*2,  # 필터링을 위해 더 많이 가져옴
+        # 태스크 타입은 랭킹 전에 후보 집합으로 필터링
+        return self.retrieve_hybrid(
+            query_line, context_before, context_after,
+            task_type=task_type,
+            top_k=top_k,
             min_similarity=min_similarity
         )
+    
+    def retrieve_hybrid(self,
+                        query_line: str,
+                        context_before: list[str] = None,
+                        context_after: list[str] = None,
+                        task_type: str = None,
+                        top_k: int = 5,
+                        min_similarity: float = 0.1,
+                        rrf_k: int = 60) -> list[tuple[ReferenceExample, float]]:
+        """
+        어휘(BM25) + 벡터 검색 결합 (Reciprocal Rank Fusion)
+        
+        쿼리의 Map 키(문자열 리터럴)를 모두 포함하는 예제가 top_k개 이상이면
+        임베딩 없이 그 예제들만 BM25 순서로 반환 (점수는 최고 BM25 점수 대비 비율).
+        그 외에는 쿼리를 임베딩하여 결합하며, 점수는 코사인 유사도이고 min_similarity 미만인 예제는 제외
+        
+        Returns:
+            (ReferenceExample, similarity_score) 튜플 리스트
+        """
+        if self.embedding_data is None:
+            raise ValueError("Embedding data not loaded. Call load_embedding_data() first.")
         
-        # 태스크 타입 필터링
+        references = self.embedding_data['references']
+        lexical_index = self._get_lexical_index()
+        allowed = None
         if task_type:
-            filtered_results = [
-                (ref, sim) for ref, sim in all_results 
-                if ref.task_type == task_type
-            ]
-        else:
-            filtered_results = all_results
+            allowed = {i for i, ref in enumerate(references) if ref.task_type == task_type}
+        
+        # 1. 정확한 키 일치 (역색인 조회, 임베딩 없음)
+        keys = extract_map_keys(query_line)
+        if keys:
+            exact_ids = lexical_index.lookup_keys(keys)
+            if allowed is not None:
+                exact_ids &= allowed
+            if len(exact_ids) >= top_k:
+                ranked = lexical_index.search(query_line, top_k=top_k, allowed=exact_ids)
+                top_score = ranked[0][1] if ranked else 1.0
+                return [(references[doc_id], score / top_score) for doc_id, score in ranked]
+        
+        similarities = self._compute_similarities(query_line, context_before, context_after)
+        
+        # 2. 어휘 랭킹 (유사도 임계값 미만 제외)
+        lexical_ranking = [
+            doc_id for doc_id, _ in lexical_index.search(query_line, allowed=allowed)
+            if similarities[doc_id] >= min_similarity
+        ]
         
-        # 상위 k개만 반환
-        return filtered_results[:top_k]
+        # 3. 벡터 랭킹
+        vector_ranking = [
+            int(idx) for idx in np.argsort(similarities)[::-1]
+            if similarities[idx] >= min_similarity and (allowed is None or int(idx) in allowed)
+        ]
+        
+        # 4. 결합
+        fused = reciprocal_rank_fusion([vector_ranking, lexical_ranking], k=rrf_k)
+        
+        return [(references[doc_id], float(similarities[doc_id])) for doc_id, _ in fused[:top_k]]
+    
+    def _compute_similarities(self,
+                              query_line: str,
+                              context_before: list[str] = None,
+                              context_after: list[str] = None) -> np.ndarray:
+        """쿼리와 모든 레퍼런스 사이의 코사인 유사도"""
+        if self.embedding_data is None:
+            raise ValueError("Embedding data not loaded. Call load_embedding_data() first.")
+        
+        # 쿼리 임베딩 생성
+        use_context = self.embedding_data.get('use_context', True)
+        query_embedding = self.embedder.embed_query(
+            query_line, 
+            context_before, 
+            context_after, 
+            use_context=use_context
+        )
+        
+        # 유사도 계산
+        reference_embeddings = self.embedding_data['embeddings']
+        return self.embedder.compute_similarity(query_embedding, reference_embeddings)
+    
+    def _get_lexical_index(self) -> BM25Index:
+        """레퍼런스 입력 라인에 대한 BM25 역색인 (지연 생성)"""
+        if self._lexical_index is None or len(self._lexical_index) != len(self.embedding_data['references']):
+            self._lexical_index = BM25Index()
+            for ref in self.embedding_data['references']:
+                self._lexical_index.add_document(ref.input_line)
+        return self._lexical_index
     
     def explain_retrieval(self, 
                          query_line: str,
@@ -153,7 +219,7 @@ class CaseRetriever:
     
     def get_prompt(self, query_line: str) -> str | None:
         """쿼리 라인에 대한 프롬프트 생성"""
-        return self.explain_retrieval(query_line, self.retrieve_similar_examples(query_line, top_k=3))
+        return self.explain_retrieval(query_line, self.retrieve_hybrid(query_line, top_k=3))
 
 
 # 편의 함수들
@@ -179,6 +245,28 @@ def create_retriever_from_files(input_file: str, output_file: str,
     return retriever
 
 
+def append_references_from_files(input_file: str, output_file: str,
+                                 reference_filename: str = "map_to_vo_samples",
+                                 embedding_filename: str = "map_to_vo_embeddings",
+                                 embedder: CodeEmbedder = None) -> int:
+    """새 입력/출력 파일 쌍의 레퍼런스를 기존 저장소에 증분 추가
+    
+    Returns:
+        새로 임베딩된 예제 수
+    """
+    from .reference_store import ReferenceStore
+    
+    store = ReferenceStore()
+    references = store.create_references_from_files(input_file, output_file)
+    store.append_references(references, reference_filename)
+    
+    if embedder is None:
+        embedder = CodeEmbedder(model_name=get_embedding_model())
+    embedding_data = embedder.append_embeddings(references, embedding_filename)
+    
+    return len(embedding_data['references']) if embedding_data else 0
+
+
 def quick_search(query_line: str, 
                 context_before: list[str] = None,
                 top_k: int = 3) -> list[tuple[ReferenceExample, float]]:
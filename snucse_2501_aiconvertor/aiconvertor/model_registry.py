@@ -0,0 +1,39 @@
+"""
+프로세스 전역 임베딩 모델 레지스트리
+같은 이름의 모델은 최초 사용 시 한 번만 로드하고 모든 검색기/RAG 빌더가 공유
+"""
+
+import threading
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+_lock = threading.Lock()
+_sentence_transformers: dict[str, "SentenceTransformer"] = {}
+
+
+def get_sentence_transformer(model_name: str) -> "SentenceTransformer":
+    """SentenceTransformer 모델 반환 (최초 호출 시 로드)"""
+    model = _sentence_transformers.get(model_name)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _sentence_transformers.get(model_name)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+
+            print(f"🔄 Loading embedding model: {model_name}")
+            model = SentenceTransformer(model_name)
+            _sentence_transformers[model_name] = model
+            print(f"✅ Embedding model loaded: {model_name}")
+
+    return model
+
+
+def loaded_models() -> list[str]:
+    """현재 로드된 모델 이름 목록"""
+    return list(_sentence_transformers.keys())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+폴더 단위 변환 파이프라인
+탐색 -> 호출 그래프 순서 정렬 -> 사전 필터링(Map 사용 여부) -> 분할 -> 변환(동시 실행 수 제한) -> 출력 디렉토리에 저장
+파일 내용/변환 결과는 파일 하나를 처리하는 동안만 메모리에 두고, 결과에는 상태만 남김
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from aiconvertor.convertor import AIConverter, ConversionConfig, create_converter, create_parser, has_map_usage
+from aiconvertor.dependency.analyzer import ElementLevelDependencyAnalyzer
+from aiconvertor.dependency.call_graph import CallGraph
+from aiconvertor.dependency.mybatis_indexer import is_mapper_xml
+from aiconvertor.java_utils_tree_sitter import split_java_code
+from aiconvertor.prompt_handler import load_contexts
+from aiconvertor.run_manifest import RunManifest, config_hash, content_hash, write_atomic
+
+
+# 탐색에서 제외하는 디렉토리 (숨김 디렉토리도 제외 - 기본 출력 디렉토리 .aiconvertor 포함)
+DEFAULT_EXCLUDE_DIRS = ['node_modules', '__pycache__', 'target', 'build', 'bin', 'out', 'dist']
+
+
+class PipelineConfig(BaseModel):
+    """폴더 변환 설정"""
+    input_dir: str = Field(description='변환할 프로젝트(폴더) 경로')
+    output_dir: Optional[str] = Field(default=None, description='변환 결과 저장 경로 (기본: <input_dir>/.aiconvertor/converted)')
+    file_extensions: List[str] = Field(default=['.java'], description='변환 대상 확장자 (.xml 은 VO 생성기 사용 시 매퍼 XML 변환)')
+    exclude_dirs: List[str] = Field(default=DEFAULT_EXCLUDE_DIRS, description='탐색에서 제외할 디렉토리 이름')
+    max_workers: int = Field(default=2, ge=1, description='동시에 변환하는 파일 수 (LLM 서버의 동시 처리 수에 맞춤)')
+    run_dir: Optional[str] = Field(default=None, description='실행 디렉토리 - 매니페스트/단위별 결과 (기본: <input_dir>/.aiconvertor/run)')
+    resume: bool = Field(default=False, description='매니페스트에서 입력/설정 해시가 같은 완료 파일/단위는 다시 변환하지 않음')
+    order_by_calls: bool = Field(default=True, description='호출 그래프의 파일 레벨 순서로 변환 (호출되는 파일이 먼저, 끄면 경로 순으로 탐색과 함께 변환)')
+
+    class Config:
+        """Pydantic 설정"""
+        validate_assignment = True
+        extra = 'forbid'  # 정의되지 않은 필드 금지
+
+
+@dataclass
+class FileResult:
+    """파일 하나의 변환 상태"""
+    file_path: str  # input_dir 기준 상대 경로
+    status: str  # converted / skipped(Map 미사용) / up_to_date(resume 시 이전 결과 재사용) / failed
+    output_path: Optional[str] = None
+    units: int = 0
+    converted_units: int = 0
+    error: Optional[str] = None
+    processing_time: float = 0.0
+
+
+def default_output_dir(input_dir: str | Path) -> Path:
+    """기본 출력 경로 - 입력 폴더 안의 숨김 디렉토리 (탐색에서 제외됨)"""
+    return Path(input_dir) / ".aiconvertor" / "converted"
+
+
+def default_run_dir(input_dir: str | Path) -> Path:
+    return Path(input_dir) / ".aiconvertor" / "run"
+
+
+def discover_files(input_dir: Path, extensions: List[str], exclude_dirs: List[str],
+                   output_dir: Optional[Path] = None) -> Iterator[Path]:
+    """변환 대상 파일을 경로 순으로 하나씩 반환 (전체 목록을 만들지 않음, 출력 디렉토리는 제외)"""
+    extensions = {ext.lower() for ext in extensions}
+    excluded = set(exclude_dirs)
+    output_dir = output_dir.resolve() if output_dir else None
+    for root, dirs, files in os.walk(input_dir):
+        dirs[:] = sorted(
+            d for d in dirs
+            if d not in excluded and not d.startswith('.') and (Path(root) / d).resolve() != output_dir
+        )
+        for file in sorted(files):
+            if os.path.splitext(file)[1].lower() in extensions:
+                yield Path(root) / file
+
+
+def _keep_spacing(original: str, converted: str) -> str:
+    """변환 결과에 원본 단위의 앞뒤 공백을 복원 (단위를 이어 붙였을 때 줄바꿈 유지)"""
+    leading = original[:len(original) - len(original.lstrip())]
+    trailing = original[len(original.rstrip()):]
+    return leading + converted.strip() + trailing
+
+
+class ConversionPipeline:
+    """폴더 변환 파이프라인
+
+    파일마다 읽기/필터링/분할/변환/저장을 한 작업으로 처리하고, 작업은 max_workers 개 스레드에서 실행.
+    Agent는 대화 상태를 가지므로 스레드마다 fork 한 변환기를 사용 (VO 생성기/RAG 상태는 공유).
+    manifest 가 있으면 파일/단위가 끝날 때마다 상태를 기록하고, resume 시 입력/설정이 같은 결과를 재사용.
+    """
+
+    def __init__(self, config: PipelineConfig, converter: AIConverter, mode: str = 'module', contexts: str = "",
+                 manifest: Optional[RunManifest] = None):
+        self.config = config
+        self.converter = converter
+        self.manifest = manifest
+        self.mode = mode
+        self.contexts = contexts
+        self.input_dir = Path(config.input_dir)
+        self.output_dir = Path(config.output_dir) if config.output_dir else default_output_dir(self.input_dir)
+        self._local = threading.local()
+
+    def _thread_converter(self) -> AIConverter:
+        converter = getattr(self._local, 'converter', None)
+        if converter is None:
+            converter = self._local.converter = self.converter.fork()
+        return converter
+
+    def split(self, file_path: Path, source_code: str) -> List[str]:
+        """변환 단위 분할 - 이어 붙이면 원본이 되는 조각들 (page 모드나 분할 실패 시 파일 전체)"""
+        if self.mode == 'page' or file_path.suffix != '.java':
+            return [source_code]
+        units = [unit['content'] for unit in split_java_code(source_code) if 'content' in unit]
+        return units if ''.join(units) == source_code else [source_code]
+
+    def process_file(self, file_path: Path) -> FileResult:
+        """파일 하나 변환 후 저장"""
+        start_time = time.time()
+        rel = file_path.relative_to(self.input_dir).as_posix()
+        output_path = self.output_dir / rel
+        result = FileResult(file_path=rel, status='skipped')
+        input_hash = None
+        converter = self._thread_converter()
+        try:
+            source_bytes = file_path.read_bytes()
+            source_code = source_bytes.decode('utf-8')
+            input_hash = content_hash(source_code)
+
+            if self.manifest is not None:
+                record = self.manifest.completed_file(rel, input_hash) if self.config.resume else None
+                if record is not None:
+                    result.status = 'up_to_date'
+                    result.output_path = record.output_path
+                    return result
+                converter.checkpoint = self.manifest.file_checkpoint(rel, source_code)
+
+            converted_code = self._convert(file_path, source_bytes, source_code, converter, result)
+            if converted_code is not None:
+                write_atomic(output_path, converted_code)
+                result.status = 'converted'
+                result.output_path = str(output_path)
+        except Exception as e:
+            result.status = 'failed'
+            result.error = str(e)
+        finally:
+            converter.checkpoint = None
+            result.processing_time = time.time() - start_time
+
+        if self.manifest is not None and input_hash is not None and result.status != 'up_to_date':
+            self.manifest.record_file(rel, result.status, input_hash, result.output_path, result.error)
+        return result
+
+    def _convert(self, file_path: Path, source_bytes: bytes, source_code: str,
+                 converter: AIConverter, result: FileResult) -> Optional[str]:
+        """필터링/분할/변환 - 변환할 필요가 없으면 None"""
+        if file_path.suffix == '.xml':
+            # 매퍼 XML 은 VO 생성기의 키/필드 매핑으로 변환 (LLM 호출 없음)
+            if converter.vo_generator is None or not is_mapper_xml(source_bytes):
+                return None
+            result.units = 1
+            converted_code = converter.convert_mapper_xml(
+                {'java_code': source_code, 'gt_java_code': source_code}
+            )['converted_code']
+            if converted_code == source_code:
+                return None
+            result.converted_units = 1
+            return converted_code
+
+        if not has_map_usage(source_code):
+            return None
+        units = self.split(file_path, source_code)
+        result.units = len(units)
+        targets = [index for index, unit in enumerate(units) if has_map_usage(unit)]
+        unit_results = converter.convert_units([units[index] for index in targets], self.contexts)
+        for index, unit_result in zip(targets, unit_results):
+            units[index] = _keep_spacing(units[index], unit_result['converted_code'] or "")
+        result.converted_units = len(targets)
+        return ''.join(units)
+
+    def conversion_levels(self, files: List[Path]) -> List[List[Path]]:
+        """호출 그래프의 파일 레벨로 묶은 변환 순서 - 호출되는 파일이 먼저, 그래프에 없는 파일(XML 등)은 마지막 레벨"""
+        try:
+            analyzer = ElementLevelDependencyAnalyzer(str(self.input_dir))
+            file_levels = CallGraph.from_analyzer(analyzer).file_conversion_levels()
+        except Exception as e:
+            print(f"⚠️ 호출 그래프 구축 실패, 경로 순으로 변환: {e}")
+            return [files]
+
+        by_key = {file_path.relative_to(self.input_dir).as_posix(): file_path for file_path in files}
+        levels = [[by_key.pop(key) for key in level if key in by_key] for level in file_levels]
+        levels.append(list(by_key.values()))
+        return [level for level in levels if level]
+
+    def run(self, on_progress: Optional[Callable[[int, FileResult], None]] = None) -> List[FileResult]:
+        """전체 파일 변환 - 대기 작업은 max_workers 의 2배까지만 유지
+
+        order_by_calls 면 레벨 순서로 변환하고 다음 레벨은 이전 레벨이 모두 끝난 뒤 시작 (같은 레벨은 병렬),
+        아니면 파일 탐색을 변환과 함께 진행.
+        """
+        results: List[FileResult] = []
+        window = self.config.max_workers * 2
+        files = discover_files(self.input_dir, self.config.file_extensions, self.config.exclude_dirs, self.output_dir)
+        levels = self.conversion_levels(list(files)) if self.config.order_by_calls else [files]
+
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+            pending = deque()
+
+            def complete_oldest():
+                result = pending.popleft().result()
+                results.append(result)
+                if on_progress is not None:
+                    on_progress(len(results), result)
+
+            for level in levels:
+                for file_path in level:
+                    pending.append(executor.submit(self.process_file, file_path))
+                    if len(pending) >= window:
+                        complete_oldest()
+                while pending:
+                    complete_oldest()
+        return results
+
+
+_STATUS_ICONS = {'converted': '✅', 'skipped': '⏭️', 'up_to_date': '♻️', 'failed': '❌'}
+
+
+def print_progress(done: int, result: FileResult):
+    """파일 단위 진행 상황 출력"""
+    detail = f"{result.converted_units}/{result.units} units" if result.units else result.status
+    print(f"[{done}] {_STATUS_ICONS.get(result.status, '')} {result.file_path} ({detail}, {result.processing_time:.1f}s)")
+    if result.error:
+        print(f"    오류: {result.error}")
+
+
+def run_pipeline(config: PipelineConfig, conversion_config: ConversionConfig,
+                 on_progress: Optional[Callable[[int, FileResult], None]] = print_progress) -> List[FileResult]:
+    """폴더 변환 실행 (변환기는 한 번만 생성 - VO 생성/RAG 로드도 한 번)"""
+    start_time = time.time()
+    if conversion_config.use_vo_generator and not conversion_config.project_root:
+        conversion_config.project_root = config.input_dir
+    converter = create_converter(conversion_config)
+    contexts = load_contexts(conversion_config.context) if conversion_config.context else ""
+    run_dir = Path(config.run_dir) if config.run_dir else default_run_dir(config.input_dir)
+
+    # 컨텍스트 파일 내용과 생성된 VO 도 결과에 영향을 주므로 설정 해시에 포함
+    run_config_hash = config_hash(conversion_config, contexts=content_hash(contexts), **converter.vo_fingerprint())
+    with RunManifest(run_dir, run_config_hash, resume=config.resume) as manifest:
+        pipeline = ConversionPipeline(config, converter, mode=conversion_config.mode, contexts=contexts,
+                                      manifest=manifest)
+        print(f"📂 Converting folder: {pipeline.input_dir} -> {pipeline.output_dir} (run: {run_dir})")
+        results = pipeline.run(on_progress)
+
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    print(f"\n🎉 Folder conversion completed in {time.time() - start_time:.1f}s")
+    print(f"📊 {len(results)} files: " + ", ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+    return results
+
+
+def main():
+    """메인 실행 함수 - 변환 옵션은 convertor 와 동일, 폴더/출력/동시 실행 옵션 추가"""
+    parser = create_parser()
+    parser.description = 'Map -> VO 폴더 변환 파이프라인'
+    parser.add_argument('--input-dir', required=True, help='변환할 프로젝트(폴더) 경로')
+    parser.add_argument('--output-dir', help='변환 결과 저장 경로 (기본: <input-dir>/.aiconvertor/converted)')
+    parser.add_argument('--file-extensions', nargs='+', default=['.java'], help='변환 대상 확장자 (기본: .java)')
+    parser.add_argument('--max-workers', type=int, default=2, help='동시에 변환하는 파일 수 (기본: 2)')
+    parser.add_argument('--no-order-by-calls', dest='order_by_calls', action='store_false',
+                        help='호출 그래프 순서 대신 경로 순으로 변환')
+    # --run-dir / --resume 은 convertor 와 같은 옵션 (기본 실행 디렉토리: <input-dir>/.aiconvertor/run)
+    args = vars(parser.parse_args())
+
+    pipeline_args = {key: args.pop(key) for key in list(args) if key in PipelineConfig.model_fields}
+    config = PipelineConfig(**pipeline_args)
+    conversion_config = ConversionConfig(**args)
+
+    results = run_pipeline(config, conversion_config)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,12 @@ from langchain_community.vectorstores import FAISS
 from langchain.chains import RetrievalQA
 from langchain_community.llms import Ollama
 from langchain.prompts import PromptTemplate
-from langchain_huggingface import HuggingFaceEmbeddings
+
+from aiconvertor.rag.embeddings import get_shared_embeddings
 
 
 def ask_proworks5(embedding_model_name, llm_model_name, vectorstore_path):
-    embedding_model = HuggingFaceEmbeddings(model_name=embedding_model_name)
+    embedding_model = get_shared_embeddings(embedding_model_name)
     vectorstore = FAISS.load_local(
         vectorstore_path,
         embedding_model,
@@ -1,8 +1,12 @@
+import os
 import re
+import json
+import uuid
+import hashlib
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 # from langchain_community.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain.schema import Document
 import javalang
@@ -16,6 +20,12 @@ from javalang.tree import (
     EnumDeclaration,
 )
 
+from aiconvertor.rag.embeddings import get_shared_embeddings
+
+
+MANIFEST_FILENAME = "manifest.json"
+STAGING_DIRNAME = ".staging"
+
 
 def collect_code_files(root_dir, extensions=None):
     """
@@ -528,97 +538,210 @@ def save_problematic_files(error_files, output_dir):
     print(f"Saved list of problematic files to: {output_path}")
 
 
-def build_vectorstore(code_dir, vectorstore_path, embedding_model_name, output_dir="./output"):
+def file_hash(file_path: Path) -> str:
+    """파일 내용의 SHA-256 해시"""
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+def load_manifest(vectorstore_path) -> dict:
+    """벡터스토어 매니페스트 로드 (파일별 해시와 벡터 id 목록)"""
+    manifest_path = Path(vectorstore_path) / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+    
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(vectorstore_path, manifest: dict):
+    """벡터스토어 매니페스트를 원자적으로 저장"""
+    manifest_path = Path(vectorstore_path) / MANIFEST_FILENAME
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix(".tmp")
+    
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def save_checkpoint(vectorstore, vectorstore_path, manifest: dict):
+    """인덱스와 매니페스트를 함께 저장
+    
+    스테이징 디렉터리에 모두 쓴 뒤 매니페스트를 마지막으로 기록하고 교체하므로,
+    스테이징에 매니페스트가 남아 있으면 완성된 체크포인트로 보고 다음 빌드에서 마저 반영
+    """
+    staging_path = Path(vectorstore_path) / STAGING_DIRNAME
+    vectorstore.save_local(str(staging_path))
+    save_manifest(staging_path, manifest)
+    recover_checkpoint(vectorstore_path)
+
+
+def recover_checkpoint(vectorstore_path):
+    """중단된 체크포인트 반영 (완성된 스테이징은 교체, 미완성은 폐기)"""
+    staging_path = Path(vectorstore_path) / STAGING_DIRNAME
+    if not staging_path.exists():
+        return
+    
+    if (staging_path / MANIFEST_FILENAME).exists():
+        # 매니페스트를 마지막에 교체해야 인덱스보다 먼저 기록되지 않음
+        for name in ["index.faiss", "index.pkl", MANIFEST_FILENAME]:
+            if (staging_path / name).exists():
+                os.replace(staging_path / name, Path(vectorstore_path) / name)
+    
+    for leftover in staging_path.iterdir():
+        leftover.unlink()
+    staging_path.rmdir()
+
+
+def process_code_file(path: Path) -> tuple[Path, list[Document] | None]:
+    """파일 하나를 읽어 청크로 분할 (프로세스 풀 작업 단위)"""
+    try:
+        code = extract_code(path)
+        if not code:
+            return path, None
+        return path, split_java_by_module(code, path)
+    except Exception as e:
+        print(f"Error processing {path}: {e}")
+        return path, None
+
+
+def build_vectorstore(code_dir, vectorstore_path, embedding_model_name, output_dir="./output",
+                      workers=None, batch_size=512, checkpoint_every=10, incremental=True):
     """
     Build a vector store from code files in the specified directory.
     
+    Files are parsed on a process pool and embedded in batches, with the index
+    and a file-hash manifest checkpointed periodically. With ``incremental``,
+    only new or changed files are re-chunked and re-embedded, and vectors of
+    changed or deleted files are removed from the existing store.
+    
     Args:
         code_dir: Path to the directory containing code files
         vectorstore_path: Path to save the vector store
         embedding_model_name: Name of the embedding model to use
         output_dir: Directory to save analysis and debug information
+        workers: Number of parser processes (default: CPU count)
+        batch_size: Number of chunks embedded per batch
+        checkpoint_every: Save the index and manifest every N batches
+        incremental: Reuse the existing store and manifest when possible
     """
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    docs = []
-    error_files = []
-    code_files = collect_code_files(code_dir)
-    total_files = len(code_files)
+    embeddings = get_shared_embeddings(embedding_model_name)
+    
+    # Load previous state (finishing a checkpoint interrupted by a crash)
+    recover_checkpoint(vectorstore_path)
+    manifest = load_manifest(vectorstore_path) if incremental else {}
+    vectorstore = None
+    if manifest.get("embedding_model") == embedding_model_name and (Path(vectorstore_path) / "index.faiss").exists():
+        vectorstore = FAISS.load_local(vectorstore_path, embeddings, allow_dangerous_deserialization=True)
+        print(f"[!] Loaded existing vectorstore with {len(manifest.get('files', {}))} files")
+    else:
+        manifest = {}
+    manifest = {"embedding_model": embedding_model_name, "files": manifest.get("files", {})}
     
-    print(f"Processing {total_files} Java files...")
+    code_files = collect_code_files(code_dir)
+    current_hashes = {str(path): file_hash(path) for path in code_files}
     
-    # Initialize progress tracking
-    progress_bar = tqdm(total=total_files, desc="Processing Java files")
+    # Determine changed / deleted files
+    changed_files = [
+        path for path in code_files
+        if manifest["files"].get(str(path), {}).get("hash") != current_hashes[str(path)]
+    ]
+    deleted_files = [path for path in manifest["files"] if path not in current_hashes]
+    
+    stale_ids = []
+    for path in deleted_files + [str(path) for path in changed_files]:
+        entry = manifest["files"].pop(path, None)
+        if entry:
+            stale_ids.extend(entry["ids"])
+    if stale_ids and vectorstore is not None:
+        vectorstore.delete(stale_ids)
+    
+    print(f"Processing {len(changed_files)} changed Java files "
+          f"({len(code_files) - len(changed_files)} unchanged, {len(deleted_files)} deleted, "
+          f"{len(stale_ids)} stale chunks removed)...")
+    
+    if not changed_files:
+        if stale_ids and vectorstore is not None:
+            save_checkpoint(vectorstore, vectorstore_path, manifest)
+        print(f"✅ FAISS vectorstore is up to date: {vectorstore_path}")
+        return vectorstore
     
-    # Track parsing stats
+    error_files = []
     successful_files = 0
     failed_files = 0
     direct_extraction_used = 0
+    total_chunks = 0
+    batches = 0
+    
+    pending_docs = []
+    pending_ids = []
+    pending_entries = {}
+    
+    def flush_pending():
+        """대기 중인 청크 임베딩 후 주기적으로 체크포인트 저장"""
+        nonlocal vectorstore, batches, pending_docs, pending_ids, pending_entries
+        if not pending_docs:
+            return
+        
+        if vectorstore is None:
+            vectorstore = FAISS.from_documents(pending_docs, embeddings, ids=pending_ids)
+        else:
+            vectorstore.add_documents(pending_docs, ids=pending_ids)
+        manifest["files"].update(pending_entries)
+        
+        batches += 1
+        pending_docs, pending_ids, pending_entries = [], [], {}
+        
+        if batches % checkpoint_every == 0:
+            save_checkpoint(vectorstore, vectorstore_path, manifest)
     
-    for path in code_files:
-        try:
-            code = extract_code(path)
-            if not code:
-                failed_files += 1
-                error_files.append(path)
-                progress_bar.update(1)
-                continue
-                
-            # Get original number of docs
-            original_doc_count = len(docs)
-            
-            # Try to parse the file
-            new_docs = split_java_by_module(code, path)
-            if new_docs is None:
+    # Parse in parallel, embed in streamed batches
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(changed_files) // ((workers or os.cpu_count() or 1) * 8))
+        results = executor.map(process_code_file, changed_files, chunksize=chunksize)
+        
+        for path, new_docs in tqdm(results, total=len(changed_files), desc="Processing Java files"):
+            if not new_docs:
                 failed_files += 1
                 error_files.append(path)
-                progress_bar.update(1)
                 continue
             
-            # Check if direct extraction was used
+            successful_files += 1
             if any("TYPE: FULL_FILE" in doc.page_content for doc in new_docs):
                 direct_extraction_used += 1
-                
-            docs.extend(new_docs)
             
-            # If we added new docs, consider it successful
-            if len(docs) > original_doc_count:
-                successful_files += 1
-            else:
-                failed_files += 1
-                error_files.append(path)
-                
-        except Exception as e:
-            print(f"Error processing {path}: {e}")
-            failed_files += 1
-            error_files.append(path)
-        
-        # Update progress bar
-        progress_bar.update(1)
+            doc_ids = [str(uuid.uuid4()) for _ in new_docs]
+            pending_docs.extend(new_docs)
+            pending_ids.extend(doc_ids)
+            pending_entries[str(path)] = {"hash": current_hashes[str(path)], "ids": doc_ids}
+            total_chunks += len(new_docs)
+            
+            # 파일 단위로 배치를 구성해 매니페스트와 인덱스가 항상 일치하도록 함
+            if len(pending_docs) >= batch_size:
+                flush_pending()
     
-    progress_bar.close()
+    flush_pending()
     
     # Save list of problematic files
     save_problematic_files(error_files, output_dir)
     
-    print(f"✅ Total chunks created: {len(docs)}")
+    print(f"✅ Total chunks created: {total_chunks}")
     print(f"📊 Processing stats:")
     print(f"   - Successful files: {successful_files}")
     print(f"   - Failed files: {failed_files}")
     print(f"   - Direct text extraction used: {direct_extraction_used}")
-
-    print(f"🔄 Creating embeddings with model: {embedding_model_name}")
-    embeddings = HuggingFaceEmbeddings(model_name=embedding_model_name)
+    print(f"   - Embedding batches: {batches}")
     
-    # Show progress for vector store creation
-    with tqdm(total=1, desc="Creating vector store") as progress_bar:
-        vectorstore = FAISS.from_documents(docs, embeddings)
-        progress_bar.update(1)
+    if vectorstore is None:
+        print("❌ No chunks to index")
+        return None
     
     # Show progress for saving
     with tqdm(total=1, desc="Saving vector store") as progress_bar:
-        vectorstore.save_local(vectorstore_path)
+        save_checkpoint(vectorstore, vectorstore_path, manifest)
         progress_bar.update(1)
         
     print(f"✅ FAISS vectorstore saved to: {vectorstore_path}")
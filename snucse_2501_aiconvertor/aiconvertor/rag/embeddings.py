@@ -0,0 +1,39 @@
+import threading
+
+from langchain_core.embeddings import Embeddings
+
+from aiconvertor.model_registry import get_sentence_transformer
+
+
+class SharedHuggingFaceEmbeddings(Embeddings):
+    """공유 SentenceTransformer를 사용하는 LangChain 임베딩
+
+    HuggingFaceEmbeddings와 동일한 전처리/인코딩을 수행하므로
+    기존에 생성된 FAISS 벡터스토어와 그대로 호환됨
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @property
+    def client(self):
+        return get_sentence_transformer(self.model_name)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        texts = [text.replace("\n", " ") for text in texts]
+        return self.client.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+_lock = threading.Lock()
+_embeddings: dict[str, SharedHuggingFaceEmbeddings] = {}
+
+
+def get_shared_embeddings(model_name: str) -> SharedHuggingFaceEmbeddings:
+    """모델 이름별 공유 임베딩 인스턴스 반환 (모델은 실제 사용 시 로드)"""
+    with _lock:
+        if model_name not in _embeddings:
+            _embeddings[model_name] = SharedHuggingFaceEmbeddings(model_name)
+        return _embeddings[model_name]
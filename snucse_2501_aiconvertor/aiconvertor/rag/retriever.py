@@ -1,7 +1,19 @@
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_core.documents import Document
+import numpy as np
+import os
 import statistics
+import threading
+
+from aiconvertor.rag.embeddings import get_shared_embeddings
+
+
+# 유사도 임계값 기본값 - 저장소의 문서 쌍 95%보다 가까운 문서만 사용
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+
+# 유사도 보정에 사용하는 표본 문서 수 (표본 문서 쌍 사이의 거리 분포를 기준으로 사용)
+CALIBRATION_SAMPLE_SIZE = 512
 
 
 class ApiRetriever:
@@ -15,8 +27,9 @@ class ApiRetriever:
         """
         self.vectorstore_path = vectorstore_path
         self.embedding_model_name = embedding_model_name
-        self.embedding_model = HuggingFaceEmbeddings(model_name=embedding_model_name)
+        self.embedding_model = get_shared_embeddings(embedding_model_name)
         self.vectorstore = None
+        self._pair_scores = None
         self._load_vectorstore()
     
     def _load_vectorstore(self):
@@ -26,6 +39,47 @@ class ApiRetriever:
             self.embedding_model, 
             allow_dangerous_deserialization=True
         )
+        self._pair_scores = None
+    
+    def _is_inner_product(self) -> bool:
+        return self.vectorstore.distance_strategy == DistanceStrategy.MAX_INNER_PRODUCT
+    
+    def _get_pair_scores(self) -> np.ndarray:
+        """저장된 문서 표본의 모든 쌍에 대한 FAISS 점수 (정렬됨, 최초 사용 시 계산)"""
+        if self._pair_scores is None:
+            index = self.vectorstore.index
+            sample_size = min(index.ntotal, CALIBRATION_SAMPLE_SIZE)
+            if sample_size < 2:
+                self._pair_scores = np.empty(0, dtype=np.float32)
+                return self._pair_scores
+            
+            # 인덱스 전체에 고르게 퍼진 표본 (문서는 소스 파일 순서로 저장되어 있음)
+            sample_ids = np.unique(np.linspace(0, index.ntotal - 1, sample_size).astype(int))
+            vectors = np.stack([index.reconstruct(int(i)) for i in sample_ids])
+            dots = vectors @ vectors.T
+            if self._is_inner_product():
+                pair_scores = dots
+            else:
+                squared_norms = np.diag(dots)
+                pair_scores = squared_norms[:, None] + squared_norms[None, :] - 2 * dots
+            self._pair_scores = np.sort(pair_scores[np.triu_indices(len(vectors), k=1)])
+        return self._pair_scores
+    
+    def _to_similarity(self, scores: np.ndarray) -> np.ndarray:
+        """FAISS 점수를 [0, 1] 유사도로 보정 - 저장소의 문서 쌍 중 이 결과보다 먼 쌍의 비율
+
+        CodeBERT 임베딩은 코사인 유사도가 거의 모든 쌍에서 0.9 이상이고 L2 거리의 크기도 모델마다 달라
+        원래 점수로는 임계값을 정할 수 없으므로, 같은 저장소의 문서 쌍 점수 분포에서의 백분위를 사용
+        """
+        pair_scores = self._get_pair_scores()
+        if len(pair_scores) == 0:
+            return np.ones_like(scores, dtype=np.float32)
+        if self._is_inner_product():
+            # 내적은 클수록 가까움
+            farther = np.searchsorted(pair_scores, scores, side='left')
+        else:
+            farther = len(pair_scores) - np.searchsorted(pair_scores, scores, side='right')
+        return farther / len(pair_scores)
     
     def analyze_chunks(self):
         """청크 분석 정보 출력"""
@@ -45,61 +99,88 @@ class ApiRetriever:
             print(f"[{i}] 길이={len(doc.page_content)} --------------------------------------")
             print(doc.page_content[:] + "\n---\n")
     
+    def query_batch(
+        self,
+        queries: list[str],
+        k: int = 3,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        verbose: bool = False
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        여러 쿼리를 한 번에 임베딩하고 단일 FAISS search로 상위 k개 문서를 반환
+        
+        Args:
+            queries: 검색 쿼리 리스트
+            k: 쿼리별 반환할 문서 수
+            similarity_threshold: 보정된 유사도 임계값 (0~1, 문서 쌍 분포의 백분위)
+            verbose: 상세 출력 여부
+            
+        Returns:
+            쿼리별 List[(Document, similarity_score)]
+        """
+        if not self.vectorstore:
+            raise ValueError("벡터스토어가 로드되지 않았습니다.")
+        if not queries:
+            return []
+        
+        query_matrix = np.asarray(self.embedding_model.embed_documents(queries), dtype=np.float32)
+        
+        scores, ids = self.vectorstore.index.search(query_matrix, k)
+        similarities = self._to_similarity(scores)
+        
+        all_results = []
+        for row, query in enumerate(queries):
+            filtered_results = []
+            for idx, similarity in zip(ids[row], similarities[row]):
+                if idx == -1 or similarity < similarity_threshold:
+                    continue
+                doc_id = self.vectorstore.index_to_docstore_id[int(idx)]
+                doc = self.vectorstore.docstore.search(doc_id)
+                filtered_results.append((doc, float(similarity)))
+            all_results.append(filtered_results)
+            
+            if verbose:
+                print(f"쿼리: {query}")
+                print(f"전체 결과 수: {int((ids[row] != -1).sum())}, 필터링된 결과 수: {len(filtered_results)}")
+                for i, (doc, similarity) in enumerate(filtered_results):
+                    print(f"[{i}] 유사도: {similarity:.4f}")
+                    print(f"본문: {doc.page_content}")
+                    print("---")
+        
+        return all_results
+    
     def query(
         self,
         query: str, 
         k: int = 3,
-        similarity_threshold: float = 0.9,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
         verbose: bool = False
-    ) -> list[Document]:
+    ) -> list[tuple[Document, float]]:
         """
         쿼리에 대해 상위 k개의 관련 문서를 반환 (유사도 임계값 이상만 필터링)
         
         Args:
             query: 검색 쿼리
             k: 반환할 문서 수
-            similarity_threshold: 유사도 임계값
+            similarity_threshold: 보정된 유사도 임계값 (0~1, 문서 쌍 분포의 백분위)
             verbose: 상세 출력 여부
             
         Returns:
             List[(Document, similarity_score)]: 필터링된 문서와 유사도 리스트
         """
-        if not self.vectorstore:
-            raise ValueError("벡터스토어가 로드되지 않았습니다.")
-            
-        results = self.vectorstore.similarity_search_with_score(query, k=k)
-        
-        # 거리를 유사도로 변환하고 임계값 이상인 결과만 필터링
-        filtered_results = []
-        for doc, distance in results:
-            # 변환 옵션들:
-            # 1) 1/(1+d) - 부드러운 감소
-            # 2) exp(-d) - 지수적 감소
-            # 3) max(0, 1-d) - 선형 감소
-            similarity = 1 - distance / 100
-            if similarity >= similarity_threshold:
-                filtered_results.append((doc, similarity))
-
-        if verbose:
-            print(f"전체 결과 수: {len(results)}, 필터링된 결과 수: {len(filtered_results)}")
-            for i, (doc, similarity) in enumerate(filtered_results):
-                print(f"[{i}] 유사도: {similarity:.4f}")
-                print(f"본문: {doc.page_content}")
-                # 벡터 reconstruct
-                # FAISS index에 저장된 벡터 id = i 일 수 있음 (주의: 키와 순서 다를 수 있음)
-                # id를 찾으려면 `index_to_docstore_id` 활용
-                doc_id = list(self.vectorstore.index_to_docstore_id.keys())[i]
-                vec = self.vectorstore.index.reconstruct(i)
-                print(f"키: {doc_id}")
-                print(f"벡터: {vec[:5]}...")  # 일부만 출력
-                print("---")
-        
-        return filtered_results
+        return self.query_batch([query], k=k, similarity_threshold=similarity_threshold, verbose=verbose)[0]
     
-    def get_prompt(self, query: str, k: int = 3, similarity_threshold: float = 0.9) -> str | None:
+    def get_prompt(self, query: str, k: int = 3, similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD) -> str | None:
         """쿼리에 대한 프롬프트 생성"""
-        results = self.query(query, k=k, similarity_threshold=similarity_threshold, verbose=False)
-        
+        return self.get_prompts([query], k=k, similarity_threshold=similarity_threshold)[0]
+    
+    def get_prompts(self, queries: list[str], k: int = 3, similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD) -> list[str | None]:
+        """여러 쿼리에 대한 프롬프트를 한 번의 검색으로 생성"""
+        batch_results = self.query_batch(queries, k=k, similarity_threshold=similarity_threshold)
+        return [self._format_prompt(results) for results in batch_results]
+    
+    def _format_prompt(self, results: list[tuple[Document, float]]) -> str | None:
+        """검색 결과를 프롬프트 형식으로 변환"""
         if not results:
             return None
         
@@ -117,6 +198,28 @@ class ApiRetriever:
         return "\n".join(prompt_parts)
 
 
+_retriever_lock = threading.Lock()
+_shared_retrievers: dict[tuple[str, str], tuple[float | None, ApiRetriever]] = {}
+
+
+def _index_mtime(vectorstore_path: str) -> float | None:
+    try:
+        return os.stat(os.path.join(vectorstore_path, "index.faiss")).st_mtime
+    except OSError:
+        return None
+
+
+def get_shared_api_retriever(vectorstore_path: str, embedding_model_name: str) -> ApiRetriever:
+    """프로세스 전역에서 공유되는 ApiRetriever 반환 (벡터스토어가 다시 빌드되면 새로 로드)"""
+    key = (vectorstore_path, embedding_model_name)
+    mtime = _index_mtime(vectorstore_path)
+    with _retriever_lock:
+        cached = _shared_retrievers.get(key)
+        if cached is None or cached[0] != mtime:
+            _shared_retrievers[key] = (mtime, ApiRetriever(vectorstore_path, embedding_model_name))
+        return _shared_retrievers[key][1]
+
+
 if __name__ == "__main__":
     embedding_model_name = "microsoft/codebert-base" #"BAAI/bge-base-en-v1.5"
     # embedding_model_name = "nlpai-lab/KURE-v1"
@@ -129,6 +232,6 @@ if __name__ == "__main__":
 
     # 쿼리 테스트
     query = "public void deleteEmpXDA(Map doc) throws Exception {"
-    # results = retriever.query(query, k=5, similarity_threshold=0.71, verbose=True)
+    # results = retriever.query(query, k=5, verbose=True)
 
-    print(retriever.get_prompt(query, k=5, similarity_threshold=0.71))
+    print(retriever.get_prompt(query, k=5))
@@ -0,0 +1,220 @@
+"""
+변환 실행 체크포인트
+실행 디렉토리의 매니페스트에 파일/변환 단위별 상태, 입력 해시, 설정 해시, 출력 경로를 기록하여
+중단된 변환을 다시 실행할 때 입력과 설정이 그대로인 단위는 LLM 호출 없이 재사용
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+MANIFEST_VERSION = 1
+
+# 설정 해시에서 제외하는 필드 (변환 결과에 영향 없음)
+_CONFIG_HASH_EXCLUDE = {'java', 'gt', 'verbose', 'run_dir', 'resume'}
+
+# 완료로 간주하는 상태
+_DONE_STATUSES = ('converted', 'skipped')
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def config_hash(config: BaseModel, **extra) -> str:
+    """변환 결과에 영향을 주는 설정의 해시 (extra 는 설정 모델 밖의 값 - 예: 파이프라인 모드)"""
+    values = config.model_dump(exclude=_CONFIG_HASH_EXCLUDE)
+    values.update(extra)
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def write_atomic(path: Path, content: str):
+    """임시 파일에 쓰고 fsync 후 교체 (중단되어도 일부만 쓰인 파일이 남지 않음)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class UnitRecord:
+    """변환 단위 하나의 상태 (단위 식별은 입력 해시)"""
+    status: str  # converted / failed
+    config_hash: str
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class FileRecord:
+    """파일 하나의 상태"""
+    status: str  # converted / skipped / failed
+    input_hash: str
+    config_hash: str
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    units: Dict[str, UnitRecord] = field(default_factory=dict)
+
+
+class RunManifest:
+    """실행 디렉토리의 매니페스트
+
+    완료된 단위는 출력 파일을 원자적으로 쓴 뒤 저널(manifest.journal.jsonl)에 한 줄씩 추가하고 fsync,
+    close() 에서 전체 상태를 manifest.json 으로 원자적으로 저장하고 저널을 비움.
+    중간에 죽으면 다음 로드 시 manifest.json 에 저널을 이어서 반영 (마지막 줄이 잘렸으면 잘라내고 무시).
+    """
+
+    def __init__(self, run_dir: str | Path, config_hash: str, resume: bool = False):
+        self.run_dir = Path(run_dir)
+        self.config_hash = config_hash
+        self.manifest_file = self.run_dir / "manifest.json"
+        self.journal_file = self.run_dir / "manifest.journal.jsonl"
+        self.units_dir = self.run_dir / "units"
+        self.files: Dict[str, FileRecord] = {}
+        self._lock = threading.Lock()
+
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        if resume:
+            self._load()
+        else:
+            self.journal_file.unlink(missing_ok=True)
+        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+
+    def _load(self):
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    for path, record in data.get('files', {}).items():
+                        units = {key: UnitRecord(**unit) for key, unit in record.pop('units', {}).items()}
+                        self.files[path] = FileRecord(**record, units=units)
+            except Exception as e:
+                print(f"매니페스트 로드 실패: {e}, 처음부터 실행합니다.")
+                self.files = {}
+
+        if self.journal_file.exists():
+            with open(self.journal_file, 'rb+') as f:
+                journal = f.read()
+                # 기록 도중 중단된 마지막 줄은 잘라냄 (이어서 추가하는 기록이 잘린 줄 뒤에 붙지 않도록)
+                end = journal.rfind(b'\n') + 1
+                if end < len(journal):
+                    f.truncate(end)
+                    f.flush()
+                    os.fsync(f.fileno())
+            for line in journal[:end].decode('utf-8', errors='replace').splitlines():
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, TypeError, KeyError):
+                    # 손상된 줄
+                    continue
+
+    def _apply(self, entry: dict):
+        # 단위는 입력 해시로 식별하므로 파일이 바뀌어도 그대로인 단위의 기록은 유지
+        path = entry['path']
+        record = self.files.get(path)
+        if entry['type'] == 'unit':
+            if record is None:
+                record = self.files[path] = FileRecord('pending', entry['file_hash'], entry['config_hash'])
+            elif record.input_hash != entry['file_hash']:
+                record.status, record.input_hash = 'pending', entry['file_hash']
+            record.units[entry['input_hash']] = UnitRecord(
+                entry['status'], entry['config_hash'], entry.get('output_path'), entry.get('error')
+            )
+        else:
+            self.files[path] = FileRecord(
+                entry['status'], entry['input_hash'], entry['config_hash'],
+                entry.get('output_path'), entry.get('error'), record.units if record is not None else {}
+            )
+
+    def _append(self, entry: dict):
+        with self._lock:
+            self._apply(entry)
+            self._journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+
+    def completed_file(self, path: str, input_hash: str) -> Optional[FileRecord]:
+        """입력/설정 해시가 같은 완료된 파일 기록 (출력 파일이 없어졌으면 None)"""
+        record = self.files.get(path)
+        if (record is None or record.status not in _DONE_STATUSES or record.input_hash != input_hash
+                or record.config_hash != self.config_hash):
+            return None
+        if record.output_path and not Path(record.output_path).exists():
+            return None
+        return record
+
+    def record_file(self, path: str, status: str, input_hash: str,
+                    output_path: Optional[str] = None, error: Optional[str] = None):
+        self._append({
+            'type': 'file', 'path': path, 'status': status, 'input_hash': input_hash,
+            'config_hash': self.config_hash, 'output_path': output_path, 'error': error
+        })
+
+    def file_checkpoint(self, path: str, source_code: str) -> 'FileCheckpoint':
+        return FileCheckpoint(self, path, content_hash(source_code))
+
+    def close(self):
+        """전체 상태를 manifest.json 으로 저장하고 저널 정리"""
+        with self._lock:
+            data = {
+                'version': MANIFEST_VERSION,
+                'updated': datetime.now().isoformat(),
+                'config_hash': self.config_hash,
+                'files': {path: asdict(record) for path, record in sorted(self.files.items())}
+            }
+            write_atomic(self.manifest_file, json.dumps(data, ensure_ascii=False, indent=2))
+            self._journal.close()
+            self.journal_file.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FileCheckpoint:
+    """파일 하나의 변환 단위 체크포인트 (AIConverter.convert_code 에서 사용)"""
+
+    def __init__(self, manifest: RunManifest, path: str, file_hash: str):
+        self.manifest = manifest
+        self.path = path
+        self.file_hash = file_hash
+        self._unit_dir = manifest.units_dir / content_hash(path)[:16]
+
+    def lookup(self, code: str) -> Optional[str]:
+        """입력/설정 해시가 같은 완료된 단위의 변환 결과 (없으면 None)"""
+        record = self.manifest.files.get(self.path)
+        unit = record.units.get(content_hash(code)) if record is not None else None
+        if unit is None or unit.status != 'converted' or unit.config_hash != self.manifest.config_hash:
+            return None
+        try:
+            with open(unit.output_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def record(self, code: str, converted_code: Optional[str], error: Optional[str] = None):
+        """단위 변환 결과 기록 - 출력 파일을 먼저 쓴 뒤 저널에 추가"""
+        input_hash = content_hash(code)
+        output_path = None
+        if error is None:
+            output_path = self._unit_dir / f"{input_hash[:16]}.txt"
+            write_atomic(output_path, converted_code or "")
+        self.manifest._append({
+            'type': 'unit', 'path': self.path, 'file_hash': self.file_hash, 'input_hash': input_hash,
+            'status': 'failed' if error else 'converted', 'config_hash': self.manifest.config_hash,
+            'output_path': str(output_path) if output_path else None, 'error': error
+        })
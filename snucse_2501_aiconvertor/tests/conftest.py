@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# aiconvertor 패키지와 저장소 루트를 import 경로에 추가
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(PACKAGE_ROOT), str(PACKAGE_ROOT.parent)]
+
+SAMPLES_DIR = PACKAGE_ROOT / "samples"
+
+
+class FakeAgent:
+    """프롬프트에 fail_on 이 들어 있으면 LLM 서버 장애처럼 예외 발생
+
+    파이프라인은 스레드마다 에이전트를 복사하므로 호출 기록은 복사본과 공유하는 리스트에 남김
+    """
+
+    model = 'fake'
+    messages = []
+
+    def __init__(self):
+        self.prompts = []
+        self.fail_on = None
+
+    def __call__(self, prompt, clear_messages=True, max_lines=None):
+        self.prompts.append(prompt)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError('ollama restarted')
+        return "```java\nCONVERTED\n```"
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """변환기의 LLM 에이전트를 가짜 에이전트로 대체"""
+    import aiconvertor.convertor as convertor
+
+    fake = FakeAgent()
+    monkeypatch.setattr(convertor, 'Agent', lambda model, verbose=False: fake)
+    return fake
@@ -0,0 +1,89 @@
+"""의존성 분석기 파일별 캐시 무효화 테스트"""
+
+import os
+
+import pytest
+
+from aiconvertor.dependency.analyzer import ElementLevelDependencyAnalyzer
+
+SOURCES = {
+    'com/a/EmpService.java': 'package com.a;\npublic class EmpService {\n  public void selectEmp(Map doc) { dao.select(doc); }\n}\n',
+    'com/a/DeptService.java': 'package com.a;\npublic class DeptService {\n  public void selectDept(Map doc) { }\n}\n',
+    'com/a/FundService.java': 'package com.a;\npublic class FundService {\n  public void deleteFund(Map doc) { }\n}\n',
+}
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mtime = path.stat().st_mtime + 10 if path.exists() else None
+    path.write_text(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def spy(monkeypatch):
+    """재스캔/재분석한 파일 이름 기록"""
+    calls = {'scanned': [], 'analyzed': []}
+    scan_files = ElementLevelDependencyAnalyzer._scan_files
+    extract = ElementLevelDependencyAnalyzer.extract_element_level_dependencies
+
+    def spy_scan_files(self, java_files):
+        calls['scanned'].extend(sorted(path.name for path in java_files))
+        return scan_files(self, java_files)
+
+    def spy_extract(self, file_path):
+        calls['analyzed'].append(file_path.name)
+        return extract(self, file_path)
+
+    monkeypatch.setattr(ElementLevelDependencyAnalyzer, '_scan_files', spy_scan_files)
+    monkeypatch.setattr(ElementLevelDependencyAnalyzer, 'extract_element_level_dependencies', spy_extract)
+    return calls
+
+
+@pytest.fixture
+def project(tmp_path):
+    for key, source in SOURCES.items():
+        _write(tmp_path / key, source)
+    analyzer = ElementLevelDependencyAnalyzer(str(tmp_path), max_workers=1)
+    analyzer.ensure_element_dependencies()
+    analyzer._save_cache()
+    return tmp_path
+
+
+def test_warm_start_rescans_only_changed_files(project, spy):
+    _write(project / 'com/a/DeptService.java', SOURCES['com/a/DeptService.java'].replace('selectDept', 'updateDept'))
+    (project / 'com/a/FundService.java').unlink()
+    _write(project / 'com/a/AcntService.java', 'package com.a;\npublic class AcntService { }\n')
+
+    analyzer = ElementLevelDependencyAnalyzer(str(project), max_workers=1)
+
+    assert spy['scanned'] == ['AcntService.java', 'DeptService.java']
+    assert sorted(analyzer.file_entries) == ['com/a/AcntService.java', 'com/a/DeptService.java', 'com/a/EmpService.java']
+    assert 'FundService' not in analyzer.class_to_file and 'AcntService' in analyzer.class_to_file
+
+    # 바뀌지 않은 파일의 요소 의존성은 캐시에서 복원
+    analyzer.ensure_element_dependencies()
+    assert sorted(spy['analyzed']) == ['AcntService.java', 'DeptService.java']
+    names = {dep.element.name for dep in analyzer.get_element_dependencies(project / 'com/a/DeptService.java').values()}
+    assert 'updateDept' in names and 'selectDept' not in names
+
+
+def test_touched_file_keeps_cached_elements(project, spy):
+    path = project / 'com/a/EmpService.java'
+    _write(path, path.read_text())
+
+    analyzer = ElementLevelDependencyAnalyzer(str(project), max_workers=1)
+    analyzer.ensure_element_dependencies()
+
+    assert spy['scanned'] == ['EmpService.java']
+    assert spy['analyzed'] == []
+    assert analyzer.file_entries['com/a/EmpService.java']['mtime'] == path.stat().st_mtime
+
+
+def test_cache_version_mismatch_rescans_everything(project, spy):
+    cache_file = project / '.element_deps_cache.json'
+    cache_file.write_text('{"version": -1, "files": {}}')
+
+    ElementLevelDependencyAnalyzer(str(project), max_workers=1)
+    assert spy['scanned'] == sorted(os.path.basename(key) for key in SOURCES)
@@ -0,0 +1,81 @@
+"""API 문서 벡터스토어 증분 빌드 테스트 (임베딩은 문자 빈도 기반 가짜 임베딩으로 대체)"""
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+import aiconvertor.rag.build_proworks5_rag as build_module
+from aiconvertor.rag.build_proworks5_rag import build_vectorstore, load_manifest
+
+
+class CountingEmbeddings(Embeddings):
+    """소문자 알파벳 빈도 벡터 (임베딩한 텍스트 수를 기록)"""
+
+    def __init__(self):
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [[float(text.lower().count(chr(c))) for c in range(ord('a'), ord('z') + 1)] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def _service(name: str, *methods: str) -> str:
+    body = ''.join(f'    public void {method}(Map doc) throws Exception {{ dao.{method}(doc); }}\n' for method in methods)
+    return f'public class {name} {{\n{body}}}\n'
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    fake = CountingEmbeddings()
+    monkeypatch.setattr(build_module, 'get_shared_embeddings', lambda model_name: fake)
+    return fake
+
+
+def _build(tmp_path):
+    return build_vectorstore(tmp_path / 'src', str(tmp_path / 'db'), 'fake', output_dir=str(tmp_path / 'out'), workers=1)
+
+
+def _contents(vectorstore) -> list[str]:
+    return [vectorstore.docstore.search(doc_id).page_content for doc_id in vectorstore.index_to_docstore_id.values()]
+
+
+def test_incremental_build_replaces_changed_and_removes_deleted_files(tmp_path, embeddings):
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'EmpService.java').write_text(_service('EmpService', 'selectEmp', 'insertEmp'))
+    (src / 'DeptService.java').write_text(_service('DeptService', 'selectDept'))
+    (src / 'FundService.java').write_text(_service('FundService', 'deleteFund'))
+    first = _build(tmp_path)
+    first_ids = {path.rpartition('/')[2]: entry['ids'] for path, entry in load_manifest(tmp_path / 'db')['files'].items()}
+    assert first.index.ntotal == sum(len(ids) for ids in first_ids.values())
+
+    (src / 'DeptService.java').write_text(_service('DeptService', 'updateDept'))
+    (src / 'FundService.java').unlink()
+    (src / 'AcntService.java').write_text(_service('AcntService', 'mergeAcnt'))
+    embeddings.embedded = 0
+    second = _build(tmp_path)
+
+    files = {path.rpartition('/')[2]: entry['ids'] for path, entry in load_manifest(tmp_path / 'db')['files'].items()}
+    assert sorted(files) == ['AcntService.java', 'DeptService.java', 'EmpService.java']
+    assert files['EmpService.java'] == first_ids['EmpService.java']
+    assert not set(files['DeptService.java']) & set(first_ids['DeptService.java'])
+    assert second.index.ntotal == len(second.index_to_docstore_id) == sum(len(ids) for ids in files.values())
+    # 바뀐 파일과 새 파일만 다시 임베딩
+    assert embeddings.embedded == len(files['DeptService.java']) + len(files['AcntService.java'])
+
+    contents = '\n'.join(_contents(second))
+    assert 'updateDept' in contents and 'mergeAcnt' in contents and 'selectEmp' in contents
+    assert 'deleteFund' not in contents and 'selectDept' not in contents
+
+
+def test_unchanged_tree_is_not_reembedded(tmp_path, embeddings):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'EmpService.java').write_text(_service('EmpService', 'selectEmp'))
+    _build(tmp_path)
+
+    embeddings.embedded = 0
+    _build(tmp_path)
+    assert embeddings.embedded == 0
+    assert not (tmp_path / 'db' / '.staging').exists()
@@ -0,0 +1,111 @@
+"""호출 그래프 간선/파일 레벨과 파이프라인 변환 순서 테스트"""
+
+import pytest
+
+from aiconvertor.convertor import ConversionConfig
+from aiconvertor.dependency.analyzer import ElementLevelDependencyAnalyzer
+from aiconvertor.dependency.call_graph import CallGraph
+from aiconvertor.pipeline import PipelineConfig, run_pipeline
+
+SOURCES = {
+    'FundService.java': (
+        'public interface FundService {\n'
+        '  void save(Map m);\n'
+        '}\n'
+    ),
+    'AbstractService.java': (
+        'public abstract class AbstractService {\n'
+        '  protected void log(String s) { }\n'
+        '}\n'
+    ),
+    'FundServiceImpl.java': (
+        'public class FundServiceImpl extends AbstractService implements FundService {\n'
+        '  private FundDao dao;\n'
+        '  public void save(Map m) { dao.insert(m); }\n'
+        '}\n'
+    ),
+    'FundDao.java': (
+        'public class FundDao {\n'
+        '  public void insert(Map m) { }\n'
+        '  public void save(Map m) { }\n'
+        '  public void add(String s) { }\n'
+        '  public String toString() { return "dao"; }\n'
+        '}\n'
+    ),
+    'AuditLogger.java': (
+        'public class AuditLogger {\n'
+        '  public void log(String s) { }\n'
+        '}\n'
+    ),
+    'Controller.java': (
+        'public class Controller {\n'
+        '  private FundService service;\n'
+        '  private FundServiceImpl impl;\n'
+        '  public void handle(Map m) { service.save(m); }\n'
+        '  public void audit(Map m) { impl.log("x"); }\n'
+        '  public void forward(Map m) { other.save(m); }\n'
+        '  public void misc(Map m, List<String> names) { names.add("x"); service.toString(); }\n'
+        '}\n'
+    ),
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    for name, source in SOURCES.items():
+        (tmp_path / name).write_text(source)
+    return tmp_path
+
+
+@pytest.fixture
+def graph(project):
+    return CallGraph.from_analyzer(ElementLevelDependencyAnalyzer(str(project), use_cache=False))
+
+
+def _callees(graph, class_name, name):
+    [node] = graph.find_nodes(name, class_name)
+    return sorted((graph.node_info[i]['class'], graph.node_info[i]['name']) for i in graph.callees(node))
+
+
+def test_interface_receiver_links_to_its_implementations_only(graph):
+    # FundDao.save 는 이름만 같으므로 연결하지 않음
+    assert _callees(graph, 'Controller', 'handle') == [('FundService', 'save'), ('FundServiceImpl', 'save')]
+
+
+def test_field_receiver_links_to_its_class(graph):
+    assert _callees(graph, 'FundServiceImpl', 'save') == [('FundDao', 'insert')]
+
+
+def test_inherited_method_resolves_to_superclass(graph):
+    assert _callees(graph, 'Controller', 'audit') == [('AbstractService', 'log')]
+
+
+def test_unknown_receiver_falls_back_to_name(graph):
+    assert _callees(graph, 'Controller', 'forward') == [
+        ('FundDao', 'save'), ('FundService', 'save'), ('FundServiceImpl', 'save')
+    ]
+
+
+def test_no_edges_for_library_receivers_or_object_methods(graph):
+    assert _callees(graph, 'Controller', 'misc') == []
+
+
+def test_file_levels_put_callees_first(graph):
+    levels = graph.file_conversion_levels()
+    level_of = {file_key: i for i, level in enumerate(levels) for file_key in level}
+    assert level_of['FundDao.java'] < level_of['FundServiceImpl.java'] < level_of['Controller.java']
+    assert level_of['FundService.java'] < level_of['Controller.java']
+
+
+def _converted_order(project, order_by_calls):
+    config = PipelineConfig(input_dir=str(project), max_workers=1, order_by_calls=order_by_calls)
+    return [result.file_path for result in run_pipeline(config, ConversionConfig(mode='module'), on_progress=None)]
+
+
+def test_pipeline_converts_callees_first(project, agent):
+    order = _converted_order(project, order_by_calls=True)
+    assert order.index('FundDao.java') < order.index('FundServiceImpl.java') < order.index('Controller.java')
+
+
+def test_pipeline_without_call_order_uses_path_order(project, agent):
+    assert _converted_order(project, order_by_calls=False) == sorted(SOURCES)
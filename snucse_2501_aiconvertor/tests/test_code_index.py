@@ -0,0 +1,97 @@
+"""SQLite 코드 색인과 역참조 색인(find_element_usage) 조회 결과 비교 테스트"""
+
+import pytest
+
+from aiconvertor.dependency.analyzer import ElementLevelDependencyAnalyzer
+
+SOURCES = {
+    'com/a/EmpDao.java': (
+        'package com.a;\n'
+        'public class EmpDao {\n'
+        '  public void insert(Map doc) { }\n'
+        '  public EmpVO select(String id) { return new EmpVO(); }\n'
+        '}\n'
+    ),
+    'com/a/EmpVO.java': (
+        'package com.a;\n'
+        'public class EmpVO {\n'
+        '  private String name;\n'
+        '}\n'
+    ),
+    'com/a/EmpService.java': (
+        'package com.a;\n'
+        'public class EmpService {\n'
+        '  private EmpDao dao;\n'
+        '  public void save(Map doc) {\n'
+        '    dao.insert(doc);\n'
+        '    EmpVO vo = dao.select("1");\n'
+        '  }\n'
+        '  public EmpVO load(String id) { return dao.select(id); }\n'
+        '}\n'
+    ),
+    'com/b/EmpController.java': (
+        'package com.b;\n'
+        'import com.a.EmpService;\n'
+        'import com.a.EmpVO;\n'
+        'public class EmpController {\n'
+        '  private EmpService service;\n'
+        '  public void handle(Map doc) {\n'
+        '    service.save(doc);\n'
+        '    EmpVO vo = new EmpVO();\n'
+        '  }\n'
+        '}\n'
+    ),
+}
+
+SYMBOLS = ['insert', 'select', 'save', 'EmpVO', 'EmpDao', 'EmpService']
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    for key, source in SOURCES.items():
+        (tmp_path / key).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / key).write_text(source)
+    analyzer = ElementLevelDependencyAnalyzer(
+        str(tmp_path), use_cache=False, max_workers=1, index_path=str(tmp_path / 'index.db')
+    )
+    analyzer.build_index()
+    return analyzer
+
+
+def _in_memory_dependents(analyzer, symbol):
+    return {
+        (usage['file'], usage['using_element'])
+        for usage in analyzer.find_element_usage(symbol)['usages']
+        if 'dependency_type' in usage
+    }
+
+
+def _indexed_dependents(analyzer, symbol):
+    return {
+        (str(analyzer.project_root / row['file']), f"{row['type']}:{row['name']}")
+        for row in analyzer.index.find_dependents(symbol)
+    }
+
+
+@pytest.mark.parametrize('symbol', SYMBOLS)
+def test_index_dependents_match_usage_index(analyzer, symbol):
+    assert _indexed_dependents(analyzer, symbol) == _in_memory_dependents(analyzer, symbol)
+
+
+def test_index_answers_typed_lookups(analyzer):
+    callers = {(row['parent'], row['name']) for row in analyzer.index.who_calls('select')}
+    assert callers == {('EmpService', 'save'), ('EmpService', 'load')}
+    assert {row['name'] for row in analyzer.index.elements_referencing_class('EmpVO')} >= {'save', 'handle'}
+    assert analyzer.index.find_class_files('com.a.EmpVO') == ['com/a/EmpVO.java']
+    assert [row['name'] for row in analyzer.index.elements_in_file('com/a/EmpDao.java')] == ['EmpDao', 'insert', 'select']
+
+
+def test_edited_file_is_updated_in_both_indexes(analyzer):
+    path = analyzer.project_root / 'com/b/EmpController.java'
+    path.write_text(SOURCES['com/b/EmpController.java'].replace('service.save(doc);', ''))
+
+    assert analyzer.refresh_file(path)
+    analyzer.index.commit()
+    for symbol in SYMBOLS:
+        assert _indexed_dependents(analyzer, symbol) == _in_memory_dependents(analyzer, symbol)
+    assert all('EmpController' not in file for file, _ in _indexed_dependents(analyzer, 'save'))
@@ -0,0 +1,71 @@
+"""tree-sitter 쿼리 기반 의존성 추출과 반복 순회 추출 결과 비교 테스트"""
+
+import json
+
+import pytest
+
+from aiconvertor.dependency.analyzer import ElementLevelDependencyAnalyzer
+from conftest import SAMPLES_DIR
+
+SAMPLE_FILES = sorted(SAMPLES_DIR.rglob('*.java'))
+
+NESTED_SOURCE = (
+    'public class Outer {\n'
+    '  private Map cache = new HashMap();\n'
+    '  @Transactional\n'
+    '  public void run(Map doc) throws Exception {\n'
+    '    try (Reader r = new FileReader("a")) {\n'
+    '      Runnable task = new Runnable() {\n'
+    '        public void run() { Util.log((String) doc.get("KEY")); }\n'
+    '      };\n'
+    '    } catch (IOException | SQLException e) {\n'
+    '      throw new ElException(e);\n'
+    '    }\n'
+    '  }\n'
+    '  static class Inner {\n'
+    '    void call() { helper.execute(Const.VALUE); }\n'
+    '  }\n'
+    '}\n'
+)
+
+
+@pytest.fixture(scope='module')
+def analyzers():
+    query_analyzer = ElementLevelDependencyAnalyzer.parser_only()
+    walk_analyzer = ElementLevelDependencyAnalyzer.parser_only()
+    walk_analyzer.dependency_query = None
+    assert query_analyzer.dependency_query is not None
+    return query_analyzer, walk_analyzer
+
+
+def _normalized(element_deps) -> dict:
+    normalized = {}
+    for element_id, elem_dep in element_deps.items():
+        data = elem_dep.to_dict()
+        normalized[element_id] = {
+            'element': data['element'],
+            'dependencies': {dep_type: sorted(symbols) for dep_type, symbols in data['dependencies'].items() if symbols},
+            'referenced_elements': sorted(data['referenced_elements']),
+            'location_info': {
+                dep_type: sorted(json.dumps(location, sort_keys=True) for location in locations)
+                for dep_type, locations in data['location_info'].items() if locations
+            }
+        }
+    return normalized
+
+
+def _assert_same_extraction(analyzers, file_path):
+    query_analyzer, walk_analyzer = analyzers
+    assert _normalized(query_analyzer.extract_element_level_dependencies(file_path)) == \
+        _normalized(walk_analyzer.extract_element_level_dependencies(file_path))
+
+
+@pytest.mark.parametrize('file_path', SAMPLE_FILES, ids=lambda path: str(path.relative_to(SAMPLES_DIR)))
+def test_query_extraction_matches_tree_walk_on_samples(analyzers, file_path):
+    _assert_same_extraction(analyzers, file_path)
+
+
+def test_query_extraction_matches_tree_walk_on_nested_code(analyzers, tmp_path):
+    file_path = tmp_path / 'Outer.java'
+    file_path.write_text(NESTED_SOURCE)
+    _assert_same_extraction(analyzers, file_path)
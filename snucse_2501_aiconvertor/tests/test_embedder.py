@@ -0,0 +1,84 @@
+"""레퍼런스 임베딩 증분 추가/삭제 표시/병합 테스트 (임베딩 모델은 가짜 모델로 대체)"""
+
+import numpy as np
+import pytest
+
+import aiconvertor.incontext.embedder as embedder_module
+from aiconvertor.incontext.embedder import CodeEmbedder
+from aiconvertor.incontext.reference_store import ReferenceExample
+
+FILENAME = 'map_to_vo_embeddings'
+
+
+class FakeModel:
+    """입력 길이 기반의 결정적 임베딩"""
+
+    def encode(self, texts, show_progress_bar=False):
+        return np.array([[len(text), text.count('"'), 1.0] for text in texts])
+
+
+@pytest.fixture
+def embedder(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedder_module, 'get_sentence_transformer', lambda model_name: FakeModel())
+    return CodeEmbedder(model_name='fake', data_dir=str(tmp_path))
+
+
+def _reference(key: str) -> ReferenceExample:
+    return ReferenceExample(f'map.get("{key}");', f'vo.get{key}();', 'map_to_vo')
+
+
+def _loaded_inputs(embedder: CodeEmbedder) -> list[str]:
+    data = embedder.load_embeddings(FILENAME)
+    assert len(data['embeddings']) == len(data['references']) == len(data['hashes'])
+    return [ref.input_line for ref in data['references']]
+
+
+def test_append_writes_only_unseen_references(embedder):
+    a, b, c = _reference('A'), _reference('B'), _reference('C')
+
+    assert len(embedder.append_embeddings([a, b], FILENAME)['references']) == 2
+    assert len(embedder.append_embeddings([a, b, c], FILENAME)['references']) == 1
+    assert embedder.append_embeddings([a, c], FILENAME) is None
+
+    assert len(embedder._part_paths(FILENAME)) == 1
+    assert _loaded_inputs(embedder) == [a.input_line, b.input_line, c.input_line]
+
+
+def test_tombstone_then_re_add(embedder):
+    a, b, c = _reference('A'), _reference('B'), _reference('C')
+    embedder.append_embeddings([a, b], FILENAME)
+    embedder.append_embeddings([c], FILENAME)
+
+    embedder.delete_embeddings({b.content_hash}, FILENAME)
+    assert _loaded_inputs(embedder) == [a.input_line, c.input_line]
+
+    # 다시 추가하면 삭제 표시가 풀리고 새 사본 하나만 남음
+    assert len(embedder.append_embeddings([b], FILENAME)['references']) == 1
+    assert embedder._load_tombstones(FILENAME) == set()
+    assert _loaded_inputs(embedder) == [a.input_line, c.input_line, b.input_line]
+
+
+def test_compact_merges_parts_and_tombstones(embedder):
+    a, b, c = _reference('A'), _reference('B'), _reference('C')
+    embedder.append_embeddings([a, b], FILENAME)
+    embedder.append_embeddings([c], FILENAME)
+    embedder.delete_embeddings({a.content_hash}, FILENAME)
+    before = embedder.load_embeddings(FILENAME)
+
+    embedder.compact_embeddings(FILENAME)
+
+    assert embedder._part_paths(FILENAME) == []
+    assert not (embedder.db_dir / f'{FILENAME}.tombstones').exists()
+    after = embedder.load_embeddings(FILENAME)
+    assert after['hashes'] == before['hashes'] == [b.content_hash, c.content_hash]
+    np.testing.assert_array_equal(after['embeddings'], before['embeddings'])
+
+
+def test_deleting_everything_keeps_embedding_shape(embedder):
+    a, b = _reference('A'), _reference('B')
+    embedder.append_embeddings([a, b], FILENAME)
+    embedder.delete_embeddings({a.content_hash, b.content_hash}, FILENAME)
+
+    data = embedder.load_embeddings(FILENAME)
+    assert data['references'] == []
+    assert data['embeddings'].shape == (0, 3)
@@ -0,0 +1,73 @@
+"""레퍼런스 예제 하이브리드 검색 테스트 (임베딩은 고정 벡터의 가짜 임베더로 대체)"""
+
+import numpy as np
+import pytest
+
+from aiconvertor.incontext.reference_store import ReferenceExample
+from aiconvertor.incontext.retriever import CaseRetriever
+
+
+class FakeEmbedder:
+    """쿼리는 항상 같은 벡터로 임베딩하고 호출 횟수를 기록"""
+
+    def __init__(self):
+        self.queries = []
+
+    def embed_query(self, query_line, context_before=None, context_after=None, use_context=True):
+        self.queries.append(query_line)
+        return np.array([1.0, 0.0, 0.0])
+
+    def compute_similarity(self, query_embedding, reference_embeddings):
+        norms = np.linalg.norm(reference_embeddings, axis=1) * np.linalg.norm(query_embedding)
+        return reference_embeddings @ query_embedding / norms
+
+
+def _retriever(lines_and_embeddings):
+    references = [ReferenceExample(line, line, 'map_to_vo') for line, _ in lines_and_embeddings]
+    embeddings = np.array([embedding for _, embedding in lines_and_embeddings], dtype=float)
+    embedder = FakeEmbedder()
+    return CaseRetriever(embedder=embedder, embedding_data={'references': references, 'embeddings': embeddings}), embedder
+
+
+def test_exact_key_hits_are_returned_without_embedding():
+    retriever, embedder = _retriever([
+        ('String no = getString(doc, "ACNT_NO");', [0, 1, 0]),
+        ('getString(doc, "ACNT_NO") + getString(doc, "ACNT_NM");', [0, 1, 0]),
+        ('String nm = getString(doc, "ACNT_NM");', [1, 0, 0]),
+    ])
+
+    results = retriever.retrieve_hybrid('String acnt = getString(pDoc, "ACNT_NO");', top_k=2)
+
+    assert embedder.queries == []
+    assert {ref.input_line for ref, _ in results} == {
+        'String no = getString(doc, "ACNT_NO");', 'getString(doc, "ACNT_NO") + getString(doc, "ACNT_NM");'
+    }
+    assert results[0][1] == pytest.approx(1.0)
+    assert 0 < results[1][1] <= 1.0
+
+
+def test_fusion_ranks_documents_found_by_both_rankings_first():
+    retriever, embedder = _retriever([
+        ('int count = list.size();', [1, 0, 0]),  # 벡터 1위, 어휘 일치 없음
+        ('vo.setAcntNo(acntNo);', [0, 1, 0]),  # 어휘 1위, 유사도 0 (임계값 미만)
+        ('dto.setAcntNo(value);', [1, 1, 0]),  # 벡터 2위, 어휘 일치
+    ])
+
+    results = retriever.retrieve_hybrid('vo.setAcntNo(acntNo);', top_k=3, min_similarity=0.1)
+
+    assert len(embedder.queries) == 1
+    assert [ref.input_line for ref, _ in results] == ['dto.setAcntNo(value);', 'int count = list.size();']
+    assert [score for _, score in results] == pytest.approx([np.sqrt(0.5), 1.0])
+
+
+def test_too_few_exact_hits_fall_back_to_fusion():
+    retriever, embedder = _retriever([
+        ('String no = getString(doc, "ACNT_NO");', [1, 0, 0]),
+        ('String nm = getString(doc, "ACNT_NM");', [1, 1, 0]),
+    ])
+
+    results = retriever.retrieve_hybrid('getString(pDoc, "ACNT_NO");', top_k=2)
+
+    assert len(embedder.queries) == 1
+    assert [ref.input_line for ref, _ in results][0] == 'String no = getString(doc, "ACNT_NO");'
+    assert len(results) == 2
@@ -0,0 +1,81 @@
+"""MyBatis 매퍼 XML 변환 테스트"""
+
+import re
+import shutil
+
+from aiconvertor.dependency.mybatis_indexer import convert_mapper_xml, harvest_mapper_keys, index_mapper_xml
+from aiconvertor.dependency.vo_generator import VOGenerator
+from conftest import SAMPLES_DIR
+
+TWO_VOS_DIR = SAMPLES_DIR / 'two_vos'
+VO_PACKAGE = 'kds.poc.com.inswave.cvt.vo'
+
+# samples/two_vos 정답(_out)의 필드명
+GT_FIELD_NAMES = {
+    'DEPTNO': 'deptNo', 'DNAME': 'deptName', 'LOC': 'location', 'BUDGET': 'budget',
+    'EMPNO': 'empNo', 'ENAME': 'empName', 'JOB': 'job', 'SAL': 'salary'
+}
+DEPT_KEYS = {'DEPTNO', 'DNAME', 'LOC', 'BUDGET'}
+
+# 정답과 서식이 같아야 하는 부분 (정답은 resultMap/조회 컬럼을 손으로 다시 작성)
+_COMPARED_BLOCK_PATTERN = re.compile(r'<(insert|update|delete)\b.*?</\1>|<where>.*?</where>', re.S)
+_PARAMETER_TYPE_PATTERN = re.compile(r'<\w+ id="(\w+)" parameterType="([\w.]+)"')
+
+OGNL_MAPPER = """<?xml version="1.0" encoding="UTF-8"?>
+<mapper namespace="fund">
+    <select id="SelectFund" parameterType="map" resultType="map">
+        SELECT FUND_CD FROM FUND WHERE 1 = 1
+        <if test="FUND_NM != null and FUND_NM.length() > 0 and list.size() &gt; 0">AND FUND_NM = #{FUND_NM}</if>
+    </select>
+</mapper>"""
+
+
+def test_ognl_method_calls_are_not_keys():
+    [statement] = index_mapper_xml(OGNL_MAPPER.encode('utf-8')).statements
+    assert [key for key, _ in statement.parameter_keys] == ['FUND_NM', 'list']
+
+    _, table = harvest_mapper_keys(OGNL_MAPPER.encode('utf-8'))
+    assert set(table) == {'FUND_NM', 'list', 'FUND_CD'}
+
+
+def test_ognl_receivers_are_renamed_and_methods_kept():
+    field_names = {'FUND_NM': 'fundNm', 'list': 'list', 'FUND_CD': 'fundCd'}
+    converted = convert_mapper_xml(OGNL_MAPPER, field_names.get, lambda keys: 'com.example.vo.FundVO')
+
+    assert 'test="fundNm != null and fundNm.length() > 0 and list.size() &gt; 0"' in converted
+    assert '#{fundNm}' in converted
+
+
+def test_convert_mapper_xml_two_vos_matches_ground_truth():
+    source = (TWO_VOS_DIR / 'Dept_SQL_oracle_MyBatis_in.xml').read_text(encoding='utf-8')
+    expected = (TWO_VOS_DIR / 'Dept_SQL_oracle_MyBatis_out.xml').read_text(encoding='utf-8')
+
+    def vo_type(keys):
+        return f"{VO_PACKAGE}.{'DeptVo' if set(keys) <= DEPT_KEYS else 'EmpVo'}"
+
+    converted = convert_mapper_xml(source, GT_FIELD_NAMES.get, vo_type)
+
+    assert 'java.util.HashMap' not in converted
+    assert _PARAMETER_TYPE_PATTERN.findall(converted) == _PARAMETER_TYPE_PATTERN.findall(expected)
+    converted_blocks = [match.group(0) for match in _COMPARED_BLOCK_PATTERN.finditer(converted)]
+    expected_blocks = [match.group(0) for match in _COMPARED_BLOCK_PATTERN.finditer(expected)]
+    assert len(converted_blocks) == 5
+    assert converted_blocks == expected_blocks
+
+
+def test_convert_mapper_xml_two_vos_with_generated_vo(tmp_path):
+    for source_file in TWO_VOS_DIR.glob('*_in.*'):
+        shutil.copy(source_file, tmp_path)
+    generator = VOGenerator(str(tmp_path), vo_package=VO_PACKAGE)
+    generator.analyze_all_maps()
+    source = (tmp_path / 'Dept_SQL_oracle_MyBatis_in.xml').read_text(encoding='utf-8')
+
+    converted = convert_mapper_xml(source, generator.field_name_for, generator.vo_class_for_keys)
+
+    assert 'java.util.HashMap' not in converted
+    assert converted.count(f'"{VO_PACKAGE}.{generator.vo_class_name}"') == 10
+    # 주석과 서식 유지
+    assert converted.count('\n') == source.count('\n')
+    assert re.findall(r'<!--.*?-->', converted) == re.findall(r'<!--.*?-->', source)
+    for parameter in re.findall(r'#\{(\w+)\}', converted):
+        assert parameter in {field.name for field in generator.vo_fields}
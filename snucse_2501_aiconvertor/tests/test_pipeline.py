@@ -0,0 +1,59 @@
+"""폴더 변환 파이프라인 테스트 (LLM 은 가짜 에이전트로 대체)"""
+
+import pytest
+
+from aiconvertor.convertor import ConversionConfig, has_map_usage
+from aiconvertor.pipeline import PipelineConfig, run_pipeline
+
+MODULE_SOURCE = (
+    'class A {\n'
+    '  void f(Map m){ m.get("X"); }\n\n'
+    '  void g(Map m){ m.get("Y"); }\n'
+    '}\n'
+)
+
+
+def _run(project, **options):
+    config = PipelineConfig(input_dir=str(project), max_workers=2, **options)
+    return run_pipeline(config, ConversionConfig(mode='module'), on_progress=None)
+
+
+def test_converts_map_files_and_skips_others(tmp_path, agent):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'A.java').write_text(MODULE_SOURCE)
+    (tmp_path / 'src' / 'B.java').write_text('class B {\n  String mapName() { return "Map"; }\n}\n')
+    (tmp_path / 'target').mkdir()
+    (tmp_path / 'target' / 'C.java').write_text(MODULE_SOURCE)
+
+    results = {result.file_path: result for result in _run(tmp_path)}
+
+    assert {path: result.status for path, result in results.items()} == {
+        'src/A.java': 'converted', 'src/B.java': 'skipped'
+    }
+    # 정답 코드가 없어도 Map 을 쓰는 단위는 모두 변환
+    assert results['src/A.java'].converted_units == 2
+    assert len(agent.prompts) == 2
+    output = tmp_path / '.aiconvertor' / 'converted' / 'src' / 'A.java'
+    assert results['src/A.java'].output_path == str(output)
+    assert 'CONVERTED' in output.read_text()
+
+
+def test_failed_file_does_not_stop_the_run(tmp_path, agent):
+    (tmp_path / 'A.java').write_text(MODULE_SOURCE)
+    (tmp_path / 'B.java').write_text(MODULE_SOURCE.replace('class A', 'class B').replace('"X"', '"FAIL"'))
+
+    agent.fail_on = '"FAIL"'
+    results = {result.file_path: result.status for result in _run(tmp_path)}
+    assert results == {'A.java': 'converted', 'B.java': 'failed'}
+
+
+@pytest.mark.parametrize('code, expected', [
+    ('Map<String, Object> param = new HashMap<>();', True),
+    ('void save(Map param) {', True),
+    ('String name = doc.get("NAME");', True),
+    ('String mapName = "roadMap";', False),
+    ('// Map usage is described elsewhere', False),
+    ('list.get(0);', False),
+])
+def test_map_usage_prefilter(code, expected):
+    assert has_map_usage(code) is expected
@@ -0,0 +1,60 @@
+"""API 문서 검색기 배치 조회/유사도 보정 테스트 (임베딩은 문자 빈도 기반 가짜 임베딩으로 대체)"""
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+import aiconvertor.rag.retriever as retriever_module
+from aiconvertor.rag.retriever import ApiRetriever
+
+DOCUMENTS = [f"public void {verb}{noun}(Map doc) throws Exception {{"
+             for verb in ('select', 'insert', 'update', 'delete', 'merge')
+             for noun in ('Emp', 'Dept', 'Fund', 'Acnt')]
+
+
+class FakeEmbeddings(Embeddings):
+    """소문자 알파벳 빈도 벡터"""
+
+    def embed_documents(self, texts):
+        return [[float(text.lower().count(chr(c))) for c in range(ord('a'), ord('z') + 1)] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def retriever(tmp_path, monkeypatch):
+    embeddings = FakeEmbeddings()
+    FAISS.from_texts(DOCUMENTS, embeddings).save_local(str(tmp_path))
+    monkeypatch.setattr(retriever_module, 'get_shared_embeddings', lambda model_name: embeddings)
+    return ApiRetriever(str(tmp_path), 'fake')
+
+
+def _contents(results):
+    return [(doc.page_content, score) for doc, score in results]
+
+
+def test_query_batch_matches_single_queries(retriever):
+    queries = [DOCUMENTS[0], 'public void deleteFund(Map doc) {', 'zzz']
+
+    batch = retriever.query_batch(queries, k=4, similarity_threshold=0.0)
+
+    assert [_contents(results) for results in batch] == [
+        _contents(retriever.query(query, k=4, similarity_threshold=0.0)) for query in queries
+    ]
+
+
+def test_similarity_is_a_percentile_of_document_pair_distances(retriever):
+    [results] = retriever.query_batch([DOCUMENTS[0]], k=len(DOCUMENTS), similarity_threshold=0.0)
+    scores = [score for _, score in results]
+
+    assert results[0][0].page_content == DOCUMENTS[0]
+    assert scores[0] == 1.0
+    assert all(0.0 <= score <= 1.0 for score in scores)
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_default_threshold_drops_unrelated_documents(retriever):
+    assert retriever.query('zzz qqq') == []
+    assert retriever.get_prompt('zzz qqq') is None
+    assert retriever.query(DOCUMENTS[5], k=1)[0][0].page_content == DOCUMENTS[5]
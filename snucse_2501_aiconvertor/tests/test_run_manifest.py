@@ -0,0 +1,165 @@
+"""실행 매니페스트 저널 재생 및 중단 후 재개 테스트 (LLM 은 가짜 에이전트로 대체)"""
+
+import json
+import os
+
+import pytest
+
+from aiconvertor.convertor import ConversionConfig
+from aiconvertor.pipeline import PipelineConfig, run_pipeline
+from aiconvertor.run_manifest import RunManifest, content_hash
+
+SOURCE = 'class A {\n  void f(Map m){ m.get("X"); }\n}\n'
+
+MODULE_SOURCE = (
+    'class A {\n'
+    '  void f(Map m){ m.get("X"); }\n\n'
+    '  void g(Map m){ m.get("Y"); }\n\n'
+    '  void h(Map m){ m.get("Z"); }\n'
+    '}\n'
+)
+
+
+def _kill(manifest: RunManifest):
+    """close() 없이 종료된 프로세스 흉내 (저널만 남음)"""
+    manifest._journal.close()
+
+
+def test_journal_replay_after_kill(tmp_path):
+    manifest = RunManifest(tmp_path, 'cfg')
+    checkpoint = manifest.file_checkpoint('A.java', SOURCE)
+    checkpoint.record('unit-1', 'converted-1')
+    checkpoint.record('unit-2', 'converted-2')
+    checkpoint.record('unit-3', None, error='ollama restarted')
+    _kill(manifest)
+
+    # 기록 도중 중단된 마지막 줄
+    with open(manifest.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"type": "unit", "path": "A.ja')
+
+    resumed = RunManifest(tmp_path, 'cfg', resume=True)
+    checkpoint = resumed.file_checkpoint('A.java', SOURCE)
+    assert checkpoint.lookup('unit-1') == 'converted-1'
+    assert checkpoint.lookup('unit-2') == 'converted-2'
+    assert checkpoint.lookup('unit-3') is None
+    assert resumed.completed_file('A.java', content_hash(SOURCE)) is None
+    resumed.close()
+
+
+def test_records_after_truncated_line_survive_next_resume(tmp_path):
+    manifest = RunManifest(tmp_path, 'cfg')
+    manifest.file_checkpoint('A.java', SOURCE).record('unit-1', 'converted-1')
+    _kill(manifest)
+    with open(manifest.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"type": "unit", "path": "A.ja')
+
+    # 재개 후 추가한 기록이 잘린 줄에 이어 붙으면 다음 재개에서 사라짐
+    resumed = RunManifest(tmp_path, 'cfg', resume=True)
+    resumed.file_checkpoint('B.java', SOURCE).record('unit-2', 'converted-2')
+    _kill(resumed)
+
+    again = RunManifest(tmp_path, 'cfg', resume=True)
+    assert again.file_checkpoint('A.java', SOURCE).lookup('unit-1') == 'converted-1'
+    assert again.file_checkpoint('B.java', SOURCE).lookup('unit-2') == 'converted-2'
+    again.close()
+
+
+def test_close_persists_manifest_and_clears_journal(tmp_path):
+    output_path = tmp_path / 'A.java'
+    output_path.write_text('converted')
+
+    with RunManifest(tmp_path, 'cfg') as manifest:
+        manifest.file_checkpoint('A.java', SOURCE).record('unit-1', 'converted-1')
+        manifest.record_file('A.java', 'converted', content_hash(SOURCE), str(output_path))
+
+    assert not manifest.journal_file.exists()
+    assert json.loads(manifest.manifest_file.read_text())['files']['A.java']['status'] == 'converted'
+
+    resumed = RunManifest(tmp_path, 'cfg', resume=True)
+    assert resumed.completed_file('A.java', content_hash(SOURCE)) is not None
+    assert resumed.completed_file('A.java', content_hash(SOURCE + '\n')) is None
+
+    # 출력 파일이 없어지면 다시 변환
+    os.remove(output_path)
+    assert resumed.completed_file('A.java', content_hash(SOURCE)) is None
+    resumed.close()
+
+
+def test_config_change_invalidates_records(tmp_path):
+    with RunManifest(tmp_path, 'cfg') as manifest:
+        manifest.file_checkpoint('A.java', SOURCE).record('unit-1', 'converted-1')
+        manifest.record_file('A.java', 'skipped', content_hash(SOURCE))
+
+    with RunManifest(tmp_path, 'other-cfg', resume=True) as resumed:
+        assert resumed.file_checkpoint('A.java', SOURCE).lookup('unit-1') is None
+        assert resumed.completed_file('A.java', content_hash(SOURCE)) is None
+
+
+def test_unchanged_units_survive_file_edit(tmp_path):
+    manifest = RunManifest(tmp_path, 'cfg')
+    manifest.file_checkpoint('A.java', SOURCE).record('unit-1', 'converted-1')
+    _kill(manifest)
+
+    # 파일의 다른 부분이 바뀌어도 입력 해시가 같은 단위는 재사용
+    with RunManifest(tmp_path, 'cfg', resume=True) as resumed:
+        checkpoint = resumed.file_checkpoint('A.java', SOURCE + '// edited\n')
+        assert checkpoint.lookup('unit-1') == 'converted-1'
+
+
+@pytest.mark.parametrize('resume', [False, True])
+def test_fresh_run_ignores_previous_journal(tmp_path, resume):
+    manifest = RunManifest(tmp_path, 'cfg')
+    manifest.file_checkpoint('A.java', SOURCE).record('unit-1', 'converted-1')
+    _kill(manifest)
+
+    with RunManifest(tmp_path, 'cfg', resume=resume) as rerun:
+        found = rerun.file_checkpoint('A.java', SOURCE).lookup('unit-1')
+        assert (found == 'converted-1') is resume
+
+
+def _run_pipeline(project, resume):
+    config = PipelineConfig(input_dir=str(project), resume=resume, max_workers=1)
+    return run_pipeline(config, ConversionConfig(mode='module'), on_progress=None)
+
+
+def test_resume_converts_only_failed_units(tmp_path, agent):
+    (tmp_path / 'A.java').write_text(MODULE_SOURCE)
+    (tmp_path / 'B.java').write_text('class B { }\n')
+
+    agent.fail_on = '"Z"'
+    results = {result.file_path: result.status for result in _run_pipeline(tmp_path, resume=False)}
+    assert results == {'A.java': 'failed', 'B.java': 'skipped'}
+    assert len(agent.prompts) == 3
+
+    # 완료된 두 단위는 매니페스트에서 재사용
+    agent.fail_on = None
+    agent.prompts.clear()
+    [a_result, b_result] = _run_pipeline(tmp_path, resume=True)
+    assert (a_result.status, a_result.converted_units) == ('converted', 3)
+    assert b_result.status == 'up_to_date'
+    assert len(agent.prompts) == 1
+
+    agent.prompts.clear()
+    assert [result.status for result in _run_pipeline(tmp_path, resume=True)] == ['up_to_date', 'up_to_date']
+    assert len(agent.prompts) == 0
+
+
+def test_resume_reconverts_edited_units_only(tmp_path, agent):
+    (tmp_path / 'A.java').write_text(MODULE_SOURCE)
+    _run_pipeline(tmp_path, resume=False)
+    assert len(agent.prompts) == 3
+
+    agent.prompts.clear()
+    (tmp_path / 'A.java').write_text(MODULE_SOURCE.replace('"Y"', '"W"'))
+    [result] = _run_pipeline(tmp_path, resume=True)
+    assert result.status == 'converted'
+    assert len(agent.prompts) == 1
+
+
+def test_without_resume_converts_everything_again(tmp_path, agent):
+    (tmp_path / 'A.java').write_text(MODULE_SOURCE)
+    _run_pipeline(tmp_path, resume=False)
+
+    agent.prompts.clear()
+    _run_pipeline(tmp_path, resume=False)
+    assert len(agent.prompts) == 3
@@ -0,0 +1,67 @@
+"""VO 키 캐시 증분 갱신 테스트"""
+
+import os
+
+import pytest
+
+from aiconvertor.dependency.vo_generator import VOGenerator
+
+VO_PACKAGE = 'kds.poc.com.inswave.cvt.vo'
+
+
+def _write(path, content):
+    """내용을 쓰고 mtime 을 바꿔 캐시가 변경을 감지하도록 함"""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _analyze(project) -> VOGenerator:
+    generator = VOGenerator(str(project), vo_package=VO_PACKAGE)
+    generator.analyze_all_maps()
+    return generator
+
+
+@pytest.fixture
+def project(tmp_path):
+    _write(tmp_path / 'A.java', 'class A {\n  void f(Map m){ m.get("X"); m.put("Y", 1); }\n}\n')
+    _write(tmp_path / 'B.java', 'class B {\n  void g(Map m){ m.get("Z"); }\n}\n')
+    return tmp_path
+
+
+def test_key_cache_tracks_add_edit_delete(project):
+    first = _analyze(project)
+    assert [field.original_key for field in first.vo_fields] == ['X', 'Y', 'Z']
+    assert first.cache_file.exists()
+
+    # 변경 없음 (touch 는 내용 해시로 걸러짐)
+    _write(project / 'B.java', (project / 'B.java').read_text())
+    assert _analyze(project).changed_keys == []
+
+    # 추가
+    _write(project / 'C.java', 'class C {\n  void h(Map m){ m.get("W"); }\n}\n')
+    added = _analyze(project)
+    assert added.changed_keys == ['W']
+    assert {field.original_key for field in added.vo_fields} == {'W', 'X', 'Y', 'Z'}
+
+    # 수정 - 라인 위치만 바뀐 키는 영향 없음
+    _write(project / 'A.java', 'class A {\n\n  void f(Map m){ m.get("X"); m.put("V", 1); }\n}\n')
+    edited = _analyze(project)
+    assert edited.changed_keys == ['V', 'Y']
+    assert {field.original_key for field in edited.vo_fields} == {'V', 'W', 'X', 'Z'}
+
+    # 삭제
+    (project / 'B.java').unlink()
+    deleted = _analyze(project)
+    assert deleted.changed_keys == ['Z']
+    assert {field.original_key for field in deleted.vo_fields} == {'V', 'W', 'X'}
+
+
+def test_key_cache_skips_generated_vo(project):
+    generator = _analyze(project)
+    generator.save_vo_class(project / 'UnifiedDataVO.java')
+    (project / 'B.java').unlink()
+
+    # 이전에 생성된 VO 는 삭제된 키(Z)를 다시 살리지 않음
+    rerun = _analyze(project)
+    assert {field.original_key for field in rerun.vo_fields} == {'X', 'Y'}
@@ -0,0 +1,113 @@
+"""VO 필드 타입 결정 및 선언 타입 해석 테스트"""
+
+import pytest
+
+from aiconvertor.dependency.analyzer import DeclaredType
+from aiconvertor.dependency.vo_generator import VOGenerator
+from aiconvertor.dependency.vo_types import DeclaredTypeIndex, resolve_expression_type, vo_field_type
+
+FUND_INFO = '''package com.fund;
+
+public class FundInfo {
+    private String name;
+
+    public String getName() { return name; }
+    public long getSize() { return 0L; }
+}
+'''
+
+FUND_SERVICE = '''package com.fund;
+
+import java.util.*;
+
+public class FundService {
+    private FundInfo info;
+
+    public void fill(Map map, float rate, short grade) {
+        FundInfo local = new FundInfo();
+        List<FundInfo> infos = new ArrayList<>();
+        map.put("INFO", local);
+        map.put("INFOS", infos);
+        map.put("RATE", rate);
+        map.put("GRADE", grade);
+        map.put("NAME", info.getName());
+        map.put("SIZE", local.getSize());
+    }
+}
+'''
+
+
+@pytest.mark.parametrize('java_type, expected', [
+    ('String', 'String'),
+    ('int', 'Integer'),
+    ('java.math.BigDecimal', 'BigDecimal'),
+    ('java.sql.Timestamp', 'Timestamp'),
+    ('List<String>', 'List<String>'),
+    ('Map<String, FundInfo>', 'Map<String, Object>'),
+    ('byte[]', 'byte[]'),
+    ('FundInfo', None),
+    ('FundInfo[]', None),
+    ('com.fund.FundInfo', None),
+])
+def test_vo_field_type(java_type, expected):
+    assert vo_field_type(java_type) == expected
+
+
+@pytest.mark.parametrize('value_types, expected', [
+    ({'Integer', 'Long'}, 'Long'),
+    ({'Double', 'BigDecimal'}, 'BigDecimal'),
+    ({'Object', 'Float'}, 'Float'),
+    ({'List<String>'}, 'List<String>'),
+    ({'ArrayList', 'LinkedList'}, 'List<Object>'),
+    ({'List', 'Set'}, 'Collection<Object>'),
+    ({'List', 'String'}, 'Object'),
+    ({'FundInfo'}, 'Object'),
+    ({'FundInfo', 'String'}, 'Object'),
+])
+def test_determine_type(tmp_path, value_types, expected):
+    assert VOGenerator(str(tmp_path))._determine_type(value_types, 'VALUE') == expected
+
+
+def test_resolve_expression_type():
+    index = DeclaredTypeIndex([
+        DeclaredType('count', 'int', 'field', 2, 1, 20, 'A'),
+        DeclaredType('count', 'String', 'local', 5, 4, 8, 'A'),
+        DeclaredType('info', 'FundInfo', 'parameter', 10, 10, 15, 'A'),
+        DeclaredType('total', 'long', 'method', 17, 1, 20, 'A'),
+    ])
+    member_types = {('FundInfo', 'getRate'): 'double'}
+
+    def member_type(class_name, method_name):
+        return member_types.get((class_name, method_name))
+
+    assert resolve_expression_type('count', 6, index) == 'String'
+    assert resolve_expression_type('count', 12, index) == 'Integer'
+    assert resolve_expression_type('this.count', 6, index) == 'Integer'
+    assert resolve_expression_type('total()', 12, index) == 'Long'
+    assert resolve_expression_type('info.getRate()', 12, index, member_type) == 'Double'
+    assert resolve_expression_type('info.getRate().toString()', 12, index, member_type) is None
+    assert resolve_expression_type('unknown', 12, index) is None
+
+
+def test_declared_types_without_project_scan(tmp_path):
+    (tmp_path / 'FundInfo.java').write_text(FUND_INFO)
+    (tmp_path / 'FundService.java').write_text(FUND_SERVICE)
+
+    generator = VOGenerator(str(tmp_path), use_cache=False)
+    generator.analyze_all_maps()
+
+    # 파일 단위 파싱만 하고 전체 분석기(프로젝트 스캔)는 만들지 않음
+    assert generator._analyzer is None
+    assert not (tmp_path / '.element_deps_cache.json').exists()
+
+    types = {field.original_key: field.java_type for field in generator.vo_fields}
+    assert types == {
+        'INFO': 'Object', 'INFOS': 'List<Object>', 'RATE': 'Float', 'GRADE': 'Short',
+        'NAME': 'String', 'SIZE': 'Long'
+    }
+
+    code = generator.generate_vo_class()
+    assert 'FundInfo' not in code
+    assert 'this.RATE = ((Number) RATEValue).floatValue();' in code
+    assert 'this.GRADE = ((Number) GRADEValue).shortValue();' in code
+    assert 'this.INFO = INFOValue;' in code